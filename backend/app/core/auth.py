@@ -0,0 +1,132 @@
+"""Shared bearer-token dependency with a verified-claims cache.
+
+Dashboards poll several endpoints with the same token, so re-verifying the
+HS256 signature and re-parsing the payload on every request is wasted work.
+Verified claims are cached by token digest until the token's ``exp`` (capped
+by a TTL so changed secrets or revocations take effect within bounds).
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Depends, Header, HTTPException
+
+from app.core.settings import settings
+from app.utils.security import decode_jwt_token
+
+
+Claims = Dict[str, Any]
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class ClaimsCache:
+    """Thread-safe LRU of verified claims keyed by token digest."""
+
+    def __init__(self, max_entries: int = 10000, max_ttl_seconds: float = 300.0) -> None:
+        self._max_entries = max_entries
+        self._max_ttl_seconds = max_ttl_seconds
+        self._lock = threading.Lock()
+        # digest -> (claims, wall-clock expiry)
+        self._entries: "OrderedDict[str, Tuple[Claims, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, token: str) -> Optional[Claims]:
+        key = token_digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                claims, expires_at = entry
+                if expires_at > now:
+                    self._hits += 1
+                    self._entries.move_to_end(key)
+                    return claims
+                del self._entries[key]
+            self._misses += 1
+        return None
+
+    def put(self, token: str, claims: Claims) -> None:
+        expires_at = time.time() + self._max_ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            self._entries[token_digest(token)] = (claims, expires_at)
+            self._entries.move_to_end(token_digest(token))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token_digest(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": (self._hits / total) if total else 0.0,
+            }
+
+
+# Singleton-like instance for app-wide use
+claims_cache = ClaimsCache(
+    max_entries=settings.auth_claims_cache_size,
+    max_ttl_seconds=settings.auth_claims_cache_ttl_seconds,
+)
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    return authorization.split(" ", 1)[1]
+
+
+def verify_token(token: str) -> Optional[Claims]:
+    """Verified claims for ``token``, from the cache when possible."""
+    claims = claims_cache.get(token)
+    if claims is None:
+        claims = decode_jwt_token(token, settings.jwt_secret)
+        if not claims:
+            return None
+        claims_cache.put(token, claims)
+    # Handlers get their own copy so they cannot alter the cached entry
+    return dict(claims)
+
+
+def auth_dependency(authorization: Optional[str] = Header(None)) -> dict:
+    token = bearer_token(authorization)
+    if token is None:
+        raise HTTPException(status_code=401, detail="Missing token")
+    payload = verify_token(token)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
+
+def require_role(*roles: str) -> Callable[..., dict]:
+    """Dependency: the caller's claims, or 403 unless their role is one of ``roles``."""
+    allowed = frozenset(roles)
+
+    def _check(claims: dict = Depends(auth_dependency)) -> dict:
+        if claims.get("role") not in allowed:
+            raise HTTPException(status_code=403, detail=f"{' or '.join(roles)} required")
+        return claims
+
+    return _check
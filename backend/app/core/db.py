@@ -1,14 +1,55 @@
+from contextlib import contextmanager
+from functools import partial
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+import anyio
+from fastapi import HTTPException, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from app.core.pool_metrics import PoolMetrics, instrumented_pool_class, pool_metrics
 from app.core.settings import settings
 
 
+logger = logging.getLogger(__name__)
+
+
 class Base(DeclarativeBase):
     pass
 
 
+def _pool_options(url: str, metrics: PoolMetrics) -> dict:
+    """QueuePool sizing from Settings; SQLite keeps SQLAlchemy's defaults."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    metrics.slow_checkout_ms = settings.db_pool_slow_checkout_ms
+    return {
+        "poolclass": instrumented_pool_class(metrics),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_use_lifo": settings.db_pool_use_lifo,
+    }
+
+
 engine = create_engine(
-    settings.database_url, echo=False, future=True
+    settings.database_url, echo=False, future=True,
+    **_pool_options(settings.database_url, pool_metrics),
+)
+# Read-only traffic goes here; same engine as the primary when no replica is set
+read_engine: Engine = (
+    create_engine(
+        settings.read_database_url, echo=False, future=True,
+        **_pool_options(settings.read_database_url, PoolMetrics()),
+    )
+    if settings.read_database_url
+    else engine
 )
 SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, future=True
@@ -20,4 +61,174 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Connection.info key holding callbacks deferred until the unit of work commits
+_AFTER_COMMIT = "after_commit"
+
+
+def after_commit(conn: Connection, fn: Callable[[], None]) -> None:
+    """Run ``fn`` once ``conn``'s unit of work has committed; dropped on rollback.
+
+    Use it for side effects that must not outlive a rolled-back transaction,
+    such as cache invalidation. On a connection that is not inside
+    ``unit_of_work`` there is no commit to wait for, so ``fn`` runs now.
+    """
+    hooks: Optional[List[Callable[[], None]]] = conn.info.get(_AFTER_COMMIT)
+    if hooks is None:
+        fn()
+    else:
+        hooks.append(fn)
+
+
+def _run_hooks(hooks: List[Callable[[], None]]) -> None:
+    for fn in hooks:
+        try:
+            fn()
+        except Exception:
+            logger.exception("after_commit callback failed")
+
+
+@contextmanager
+def unit_of_work(commit_on_http_error: bool = True) -> Iterator[Connection]:
+    """One pooled connection and transaction for a block of DB work.
+
+    Commits when the block ends or raises ``HTTPException`` (so audit rows
+    written before a 4xx survive; pass ``commit_on_http_error=False`` to roll
+    those back too); any other error rolls back. ``after_commit`` callbacks
+    run only after a successful commit.
+
+    Keep slow non-DB work such as password hashing outside the block: the
+    connection stays checked out for as long as the block runs.
+    """
+    hooks: List[Callable[[], None]] = []
+    committed = False
+    try:
+        with engine.connect() as conn:
+            conn.info[_AFTER_COMMIT] = hooks
+            try:
+                yield conn
+            except HTTPException:
+                if not commit_on_http_error:
+                    conn.rollback()
+                    raise
+                conn.commit()
+                committed = True
+                raise
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+                committed = True
+            finally:
+                # info lives with the pooled DBAPI connection; never leak hooks
+                conn.info.pop(_AFTER_COMMIT, None)
+    finally:
+        # Connection is back in the pool; 4xx responses still get their hooks
+        if committed:
+            _run_hooks(hooks)
+
+
+def get_uow() -> Iterator[Connection]:
+    """Request-scoped unit of work: one pooled connection lent to every helper.
+
+    The transaction begins on first use and commits when the handler returns
+    or raises ``HTTPException`` (so audit rows written before a 4xx survive);
+    any other error rolls it back. Handlers may call ``conn.commit()`` early
+    to release locks before slow external I/O such as sending email.
+
+    The connection is held for the whole handler, so handlers that hash
+    passwords or call out to other services use ``unit_of_work`` around just
+    their DB sections instead.
+    """
+    with unit_of_work() as conn:
+        yield conn
+
+
+class ReplicaRouter:
+    """Chooses primary or replica for reads, sticky to the primary after a write.
+
+    Clients are keyed by a digest of their bearer token (or their IP when
+    anonymous), so a user who just wrote keeps reading their own writes for
+    ``sticky_seconds`` while the replica catches up.
+    """
+
+    def __init__(self, sticky_seconds: float, max_clients: int = 10000) -> None:
+        self._sticky_seconds = sticky_seconds
+        self._max_clients = max_clients
+        self._lock = threading.Lock()
+        # client key -> monotonic time until which reads stay on the primary
+        self._sticky_until: Dict[str, float] = {}
+
+    @staticmethod
+    def client_key(request: Request) -> Optional[str]:
+        auth = request.headers.get("Authorization")
+        if auth:
+            return hashlib.sha256(auth.encode("utf-8")).hexdigest()[:32]
+        return request.client.host if request.client else None
+
+    def mark_write(self, request: Request) -> None:
+        key = self.client_key(request)
+        if key is None or read_engine is engine:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._sticky_until) >= self._max_clients:
+                self._sticky_until = {k: v for k, v in self._sticky_until.items() if v > now}
+            self._sticky_until[key] = now + self._sticky_seconds
+
+    def engine_for_read(self, request: Request) -> Engine:
+        if read_engine is engine:
+            return engine
+        key = self.client_key(request)
+        if key is not None:
+            with self._lock:
+                until = self._sticky_until.get(key)
+            if until is not None and until > time.monotonic():
+                return engine
+        return read_engine
+
+
+replica_router = ReplicaRouter(settings.read_replica_sticky_seconds)
+
+
+def get_read_conn(request: Request) -> Iterator[Connection]:
+    """Connection for read-only handlers, routed by ``replica_router``."""
+    with replica_router.engine_for_read(request).connect() as conn:
+        yield conn
+
+
+T = TypeVar("T")
+
+# Created on first use: anyio limiters must be built inside the event loop
+_db_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def _get_db_limiter() -> anyio.CapacityLimiter:
+    global _db_limiter
+    if _db_limiter is None:
+        _db_limiter = anyio.CapacityLimiter(settings.db_async_max_threads)
+    return _db_limiter
+
+
+async def run_db(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run blocking DB work from an ``async def`` handler without stalling the loop.
+
+    pyodbc has no native async driver, so work is offloaded to a bounded set of
+    worker threads separate from the threadpool that serves sync handlers.
+    """
+    return await anyio.to_thread.run_sync(
+        partial(fn, *args, **kwargs), limiter=_get_db_limiter()
+    )
+
+
+async def run_in_transaction(fn: Callable[[Connection], T]) -> T:
+    """Async counterpart of ``with engine.begin() as conn: return fn(conn)``."""
+
+    def _work() -> T:
+        with unit_of_work(commit_on_http_error=False) as conn:
+            return fn(conn)
+
+    return await run_db(_work)
@@ -0,0 +1,112 @@
+"""Per-user organization (tenant scope) resolution.
+
+Tokens minted before a user joined an organization carry no ``org_id``, so
+routers used to look it up on every request. The resolver does that lookup
+once per user and caches it; code that moves a user between organizations
+or changes their role calls ``org_context.invalidate(user_id)`` once the
+change has committed. There is no fallback: a caller whose token and
+user row carry no organization resolves to None and is refused.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.auth import auth_dependency
+from app.core.db import engine
+from app.core.schema_catalog import schema_catalog
+from app.core.settings import settings
+
+
+class OrgContextResolver:
+    """Thread-safe TTL/LRU cache of user id -> organization id."""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 10000) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # user id -> (organization id, monotonic expiry)
+        self._entries: "OrderedDict[int, Tuple[Optional[int], float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def resolve(self, claims: dict, conn: Optional[Connection] = None) -> Optional[int]:
+        org_id = claims.get("org_id")
+        if org_id:
+            return int(org_id)
+        user_id = claims.get("sub")
+        if not user_id:
+            return self._lookup(None, conn)[0]
+        user_id = int(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._hits += 1
+                self._entries.move_to_end(user_id)
+                return entry[0]
+            self._misses += 1
+        org_id, cacheable = self._lookup(user_id, conn)
+        if cacheable:
+            with self._lock:
+                self._entries[user_id] = (org_id, now + self._ttl_seconds)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return org_id
+
+    def invalidate(self, user_id) -> None:
+        if user_id is None:
+            return
+        with self._lock:
+            self._entries.pop(int(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": (self._hits / total) if total else 0.0,
+            }
+
+    def _lookup(self, user_id: Optional[int], conn: Optional[Connection]) -> Tuple[Optional[int], bool]:
+        """(organization id, whether it is the user's own and safe to cache)."""
+        # Read from the primary so a just-invalidated entry never refills from a lagging replica
+        if conn is None:
+            with engine.connect() as own:
+                return self._lookup(user_id, own)
+        # docs/shards: 04-auth-rbac.md — org scoping
+        if user_id and schema_catalog.snapshot(conn).has_column("User", "OrganizationID"):
+            row = conn.execute(
+                text("SELECT OrganizationID FROM [User] WHERE UserID = :uid"),
+                {"uid": user_id},
+            ).first()
+            if row and row[0] is not None:
+                return int(row[0]), True
+        return None, False
+
+
+# Singleton-like instance for app-wide use
+org_context = OrgContextResolver(ttl_seconds=settings.org_context_ttl_seconds)
+
+
+def get_org_id(claims: dict = Depends(auth_dependency)) -> Optional[int]:
+    """Caller's organization id, resolved from the token or the cache."""
+    org_id = org_context.resolve(claims)
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Missing org context")
+    return org_id
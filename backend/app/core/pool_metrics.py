@@ -0,0 +1,112 @@
+"""Connection pool instrumentation.
+
+``InstrumentedQueuePool`` times every checkout (including time spent waiting
+for a free connection or opening a new one) into a fixed-bucket histogram, so
+pool size and overflow can be tuned per deployment from real numbers.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in milliseconds; the last bucket catches everything above
+CHECKOUT_BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """Thread-safe counters and checkout-latency histogram."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = CHECKOUT_BUCKETS_MS) -> None:
+        self._buckets_ms = buckets_ms
+        self._lock = threading.Lock()
+        self.slow_checkout_ms: Optional[float] = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts: List[int] = [0] * (len(self._buckets_ms) + 1)
+            self._checkouts = 0
+            self._timeouts = 0
+            self._wait_total_ms = 0.0
+            self._wait_max_ms = 0.0
+
+    def observe_checkout(self, elapsed_ms: float) -> None:
+        idx = next(
+            (i for i, bound in enumerate(self._buckets_ms) if elapsed_ms <= bound),
+            len(self._buckets_ms),
+        )
+        with self._lock:
+            self._counts[idx] += 1
+            self._checkouts += 1
+            self._wait_total_ms += elapsed_ms
+            if elapsed_ms > self._wait_max_ms:
+                self._wait_max_ms = elapsed_ms
+        if self.slow_checkout_ms is not None and elapsed_ms >= self.slow_checkout_ms:
+            logger.warning("Slow DB pool checkout: %.1f ms", elapsed_ms)
+
+    def observe_timeout(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self._timeouts += 1
+        logger.error("DB pool checkout timed out after %.1f ms", elapsed_ms)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            labels = [f"le_{int(b)}ms" for b in self._buckets_ms] + ["gt_max"]
+            return {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "wait_total_ms": round(self._wait_total_ms, 3),
+                "wait_avg_ms": round(self._wait_total_ms / self._checkouts, 3) if self._checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max_ms, 3),
+                "checkout_latency_histogram": dict(zip(labels, self._counts)),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout takes."""
+
+    metrics: PoolMetrics = pool_metrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_timeout((time.perf_counter() - start) * 1000.0)
+            raise
+        self.metrics.observe_checkout((time.perf_counter() - start) * 1000.0)
+        return conn
+
+
+def instrumented_pool_class(metrics: PoolMetrics) -> type:
+    """Pool class bound to its own metrics (survives ``engine.dispose()``)."""
+    return type("InstrumentedQueuePool", (InstrumentedQueuePool,), {"metrics": metrics})
+
+
+def pool_status(pool) -> Dict[str, object]:
+    """Live pool occupancy plus the accumulated checkout metrics."""
+    status: Dict[str, object] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        )
+    status.update(getattr(pool, "metrics", pool_metrics).snapshot())
+    return status
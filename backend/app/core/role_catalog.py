@@ -0,0 +1,82 @@
+"""In-memory catalog of the Role table.
+
+Roles are a handful of seeded rows that change only through migrations or an
+admin action, yet signup, login, invitations and organization creation used
+to look them up on every call. The catalog loads ``RoleID``/``RoleName`` once
+and reloads after ``ttl_seconds``, on an unknown name (at most once per
+``miss_reload_seconds``) or when ``invalidate()`` is called.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from .db import engine
+
+
+class RoleCatalog:
+    """Thread-safe RoleName <-> RoleID maps."""
+
+    def __init__(self, ttl_seconds: float = 300.0, miss_reload_seconds: float = 30.0) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._miss_reload_seconds = miss_reload_seconds
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._loaded_at: Optional[float] = None
+
+    def _load(self, conn) -> None:
+        rows = conn.execute(text("SELECT RoleID, RoleName FROM Role")).all()
+        self._ids = {str(name): int(rid) for rid, name in rows}
+        self._names = {int(rid): str(name) for rid, name in rows}
+        self._loaded_at = time.monotonic()
+
+    def _ensure(self, conn, max_age: float) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < max_age:
+            return
+        with self._lock:
+            loaded_at = self._loaded_at
+            if loaded_at is not None and time.monotonic() - loaded_at < max_age:
+                return
+            if conn is None:
+                with engine.connect() as own:
+                    self._load(own)
+            else:
+                self._load(conn)
+
+    def role_id(self, conn, role_name: str) -> Optional[int]:
+        """RoleID for ``role_name``. Pass the caller's connection to avoid a second checkout."""
+        self._ensure(conn, self._ttl_seconds)
+        rid = self._ids.get(role_name)
+        if rid is None:
+            # A role added since the last load shows up after a short delay
+            self._ensure(conn, self._miss_reload_seconds)
+            rid = self._ids.get(role_name)
+        return rid
+
+    def role_name(self, conn, role_id) -> Optional[str]:
+        if role_id is None:
+            return None
+        self._ensure(conn, self._ttl_seconds)
+        return self._names.get(int(role_id))
+
+    def refresh(self, conn=None) -> Dict[str, int]:
+        """Reload now and return the RoleName -> RoleID map."""
+        self.invalidate()
+        self._ensure(conn, self._ttl_seconds)
+        return self.roles()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def roles(self) -> Dict[str, int]:
+        return dict(self._ids)
+
+
+# Singleton-like instance for app-wide use
+role_catalog = RoleCatalog()
@@ -0,0 +1,228 @@
+"""Process-wide catalog of table columns.
+
+Environments have drifted (Name vs EventName, Status vs EventStatus, optional
+audit columns), so routers need to know which columns exist before building
+SQL. Rather than probing ``sys.columns`` on every request, the catalog reads
+the column sets for the tables we care about once, lazily, and keeps them
+until the Alembic revision changes or a refresh is requested.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import text
+
+from .db import engine
+
+
+# Tables whose shape the routers adapt to at runtime
+CATALOG_TABLES: tuple[str, ...] = (
+    "Event",
+    "User",
+    "Organization",
+    "Form",
+    "CanvasLayout",
+    "CanvasObject",
+    "Invitation",
+    "AuthEvent",
+    "EmailOutbox",
+    "AuthSession",
+)
+
+# Event created-timestamp column varies by database; first match wins
+_EVENT_CREATED_CANDIDATES: tuple[str, ...] = (
+    "CreatedDate",
+    "CreatedOn",
+    "CreatedAt",
+    "CreateDate",
+    "DateCreated",
+)
+
+
+@dataclass(frozen=True)
+class EventColumns:
+    """Column capabilities of the [Event] table."""
+
+    name: bool = False
+    event_name: bool = False
+    status: bool = False
+    event_status: bool = False
+    timezone: bool = False
+    is_deleted: bool = False
+    event_type: bool = False
+    event_slug: bool = False
+    start_date: bool = False
+    end_date: bool = False
+    is_public: bool = False
+    registration_enabled: bool = False
+    created_by_user: bool = False
+    last_updated: bool = False
+    created_col: Optional[str] = None
+
+    @classmethod
+    def from_columns(cls, columns: FrozenSet[str]) -> "EventColumns":
+        created_col = next(
+            (c for c in _EVENT_CREATED_CANDIDATES if c.lower() in columns), None
+        )
+        return cls(
+            name="name" in columns,
+            event_name="eventname" in columns,
+            status="status" in columns,
+            event_status="eventstatus" in columns,
+            timezone="timezone" in columns,
+            is_deleted="isdeleted" in columns,
+            event_type="eventtype" in columns,
+            event_slug="eventslug" in columns,
+            start_date="startdate" in columns,
+            end_date="enddate" in columns,
+            is_public="ispublic" in columns,
+            registration_enabled="registrationenabled" in columns,
+            created_by_user="createdbyuserid" in columns,
+            last_updated="lastupdated" in columns,
+            created_col=created_col,
+        )
+
+
+@dataclass(frozen=True)
+class SchemaSnapshot:
+    """Immutable view of the catalogued columns at one Alembic revision."""
+
+    revision: Optional[str]
+    columns: Dict[str, FrozenSet[str]]
+    event: EventColumns = field(default_factory=EventColumns)
+    # Identity, computed and rowversion columns: the server fills these in
+    generated: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+
+    def has_table(self, table: str) -> bool:
+        return bool(self.columns.get(_normalize(table)))
+
+    def has_column(self, table: str, column: str) -> bool:
+        cols = self.columns.get(_normalize(table), frozenset())
+        return column.lower() in cols
+
+    def writable(self, table: str) -> FrozenSet[str]:
+        """Columns an INSERT may name explicitly."""
+        key = _normalize(table)
+        return self.columns.get(key, frozenset()) - self.generated.get(key, frozenset())
+
+    @property
+    def fingerprint(self) -> str:
+        """Short digest identifying this schema shape (revision + columns)."""
+        h = hashlib.sha1((self.revision or "").encode("utf-8"))
+        for table in sorted(self.columns):
+            h.update(b"|" + table.encode("utf-8") + b":")
+            h.update(",".join(sorted(self.columns[table])).encode("utf-8"))
+        for table in sorted(t for t, cols in self.generated.items() if cols):
+            h.update(b"|" + table.encode("utf-8") + b"!")
+            h.update(",".join(sorted(self.generated[table])).encode("utf-8"))
+        return h.hexdigest()[:16]
+
+
+def _normalize(table: str) -> str:
+    # SQL Server default collation is case-insensitive; so are we
+    return table.strip().strip("[]").lower()
+
+
+class SchemaCatalog:
+    """Lazily loaded, thread-safe column catalog.
+
+    The Alembic revision is re-checked at most every ``revision_check_seconds``
+    so a deploy that migrates the database is picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        tables: Iterable[str] = CATALOG_TABLES,
+        revision_check_seconds: int = 60,
+    ) -> None:
+        self._tables = tuple(tables)
+        self._revision_check_seconds = revision_check_seconds
+        self._lock = threading.Lock()
+        self._snapshot: Optional[SchemaSnapshot] = None
+        self._checked_at = 0.0
+
+    def _read_revision(self, conn) -> Optional[str]:
+        try:
+            return conn.execute(text("SELECT TOP 1 version_num FROM alembic_version")).scalar()
+        except Exception:
+            return None
+
+    def _load(self, conn) -> SchemaSnapshot:
+        revision = self._read_revision(conn)
+        object_ids = ", ".join(f"OBJECT_ID('[{t}]')" for t in self._tables)
+        rows = conn.execute(
+            text(
+                "SELECT OBJECT_NAME(object_id) AS tbl, name AS col, "
+                # 189 is timestamp/rowversion
+                "CASE WHEN is_identity = 1 OR is_computed = 1 OR system_type_id = 189 "
+                "THEN 1 ELSE 0 END AS generated FROM sys.columns "
+                f"WHERE object_id IN ({object_ids})"
+            )
+        ).all()
+        grouped: Dict[str, set] = {_normalize(t): set() for t in self._tables}
+        generated: Dict[str, set] = {}
+        for tbl, col, is_generated in rows:
+            grouped.setdefault(_normalize(tbl), set()).add(str(col).lower())
+            if is_generated:
+                generated.setdefault(_normalize(tbl), set()).add(str(col).lower())
+        columns = {t: frozenset(c) for t, c in grouped.items()}
+        return SchemaSnapshot(
+            revision=revision,
+            columns=columns,
+            event=EventColumns.from_columns(columns.get("event", frozenset())),
+            generated={t: frozenset(c) for t, c in generated.items()},
+        )
+
+    def _refresh_with(self, conn) -> SchemaSnapshot:
+        snapshot = self._load(conn)
+        self._snapshot = snapshot
+        self._checked_at = time.monotonic()
+        return snapshot
+
+    def snapshot(self, conn=None) -> SchemaSnapshot:
+        """Return the current snapshot, loading it on first use.
+
+        Pass the caller's connection to avoid checking out a second one.
+        """
+        current = self._snapshot
+        if current is not None and (
+            time.monotonic() - self._checked_at < self._revision_check_seconds
+        ):
+            return current
+        with self._lock:
+            current = self._snapshot
+            if current is not None and (
+                time.monotonic() - self._checked_at < self._revision_check_seconds
+            ):
+                return current
+            if conn is None:
+                with engine.connect() as own:
+                    return self._revalidate(own, current)
+            return self._revalidate(conn, current)
+
+    def _revalidate(self, conn, current: Optional[SchemaSnapshot]) -> SchemaSnapshot:
+        if current is not None and self._read_revision(conn) == current.revision:
+            self._checked_at = time.monotonic()
+            return current
+        return self._refresh_with(conn)
+
+    def refresh(self, conn=None) -> SchemaSnapshot:
+        """Force a reload, e.g. after a manual schema change."""
+        with self._lock:
+            if conn is None:
+                with engine.connect() as own:
+                    return self._refresh_with(own)
+            return self._refresh_with(conn)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = 0.0
+
+
+# Singleton-like instance for app-wide use
+schema_catalog = SchemaCatalog()
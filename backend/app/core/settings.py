@@ -16,6 +16,12 @@ class Settings:
         self.database_url: str = os.getenv(
             "DATABASE_URL", "mssql+pyodbc://localhost/master?driver=ODBC+Driver+17+for+SQL+Server&trusted_connection=yes"
         )
+        # Optional read replica (e.g. an Always On readable secondary); reads
+        # fall back to the primary when unset
+        self.read_database_url: str = os.getenv("READ_DATABASE_URL", "")
+        # After a write, that client's reads stay on the primary this long to
+        # hide replica lag
+        self.read_replica_sticky_seconds: float = float(os.getenv("READ_REPLICA_STICKY_SECONDS", "10"))
         self.jwt_secret: str = os.getenv("JWT_SECRET", "dev-secret")
         self.allowed_origins: list[str] = (
             os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
@@ -31,5 +37,85 @@ class Settings:
         self.smtp_password: str = os.getenv("SMTP_PASSWORD", "")
         self.email_from: str = os.getenv("EMAIL_FROM", "dev@example.com")
 
+        # Database connection pool (QueuePool; ignored for SQLite)
+        self.db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+        self.db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        # Recycle before SQL Server / load balancers drop idle ODBC connections
+        self.db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes", "on")
+        # LIFO keeps a small hot set of connections and lets the rest go idle
+        self.db_pool_use_lifo: bool = os.getenv("DB_POOL_USE_LIFO", "true").lower() in ("1", "true", "yes", "on")
+        # Worker threads for DB work issued from async handlers; defaults to the
+        # pool's connection ceiling so offloaded work never queues on the pool
+        self.db_async_max_threads: int = int(
+            os.getenv("DB_ASYNC_MAX_THREADS", str(self.db_pool_size + self.db_max_overflow))
+        )
+        # Checkouts slower than this are logged as warnings
+        self.db_pool_slow_checkout_ms: int = int(os.getenv("DB_POOL_SLOW_CHECKOUT_MS", "250"))
+
+        # Batched AuthEvent writer
+        self.audit_queue_max: int = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+        self.audit_batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+        self.audit_flush_interval_seconds: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+        # drop_newest | drop_oldest | inline
+        self.audit_queue_overflow: str = os.getenv("AUDIT_QUEUE_OVERFLOW", "drop_newest")
+        # Failed batches are retried with doubling backoff, then written row by row
+        self.audit_flush_retries: int = int(os.getenv("AUDIT_FLUSH_RETRIES", "3"))
+        self.audit_retry_backoff_seconds: float = float(os.getenv("AUDIT_RETRY_BACKOFF_SECONDS", "0.5"))
+
+        # bcrypt cost factor for new hashes; logins rehash anything below it
+        self.password_bcrypt_rounds: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+        # bcrypt worker pool; callers beyond workers + pending get a fast 503
+        self.password_hash_workers: int = int(
+            os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+        self.password_hash_max_pending: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+        # Access JWT lifetime; clients renew via /auth/refresh with the refresh token
+        self.access_token_ttl_minutes: int = int(os.getenv("ACCESS_TOKEN_TTL_MINUTES", "15"))
+        # Refresh tokens rotate on every use; this is the idle lifetime of each one
+        self.refresh_token_ttl_seconds: int = int(os.getenv("REFRESH_TOKEN_TTL_SECONDS", str(14 * 86400)))
+        self.session_cache_size: int = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+
+        # Verified JWT claims cache; entries also expire with the token's exp
+        self.auth_claims_cache_size: int = int(os.getenv("AUTH_CLAIMS_CACHE_SIZE", "10000"))
+        self.auth_claims_cache_ttl_seconds: float = float(os.getenv("AUTH_CLAIMS_CACHE_TTL_SECONDS", "300"))
+        # Cached user -> organization lookups for tokens without org_id
+        self.org_context_ttl_seconds: float = float(os.getenv("ORG_CONTEXT_TTL_SECONDS", "300"))
+
+        # Throttle storage: memory (single node) | redis (shared) | sql (RateLimitCounter table)
+        self.rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+        self.rate_limit_redis_url: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+        # Defaults for limits not overridden in GlobalSetting
+        self.auth_resend_cooldown_seconds: int = int(os.getenv("AUTH_RESEND_COOLDOWN_SECONDS", "60"))
+        self.auth_resend_max_per_day: int = int(os.getenv("AUTH_RESEND_MAX_PER_DAY", "5"))
+
+        # Email outbox dispatcher
+        self.email_outbox_batch_size: int = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+        self.email_outbox_poll_seconds: float = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "2.0"))
+        self.email_outbox_max_attempts: int = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+        # First retry delay; doubles per attempt up to an hour
+        self.email_outbox_backoff_seconds: float = float(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "30"))
+
+        # Pooled SMTP sessions (reused across sends; retired after N messages)
+        self.smtp_pool_max_idle: int = int(os.getenv("SMTP_POOL_MAX_IDLE", "4"))
+        self.smtp_max_messages_per_session: int = int(os.getenv("SMTP_MAX_MESSAGES_PER_SESSION", "100"))
+        self.smtp_idle_timeout_seconds: float = float(os.getenv("SMTP_IDLE_TIMEOUT_SECONDS", "60"))
+
+        # Expired/consumed auth token cleanup (interval 0 disables the background job)
+        self.token_cleanup_interval_seconds: float = float(os.getenv("TOKEN_CLEANUP_INTERVAL_SECONDS", "3600"))
+        self.token_cleanup_batch_size: int = int(os.getenv("TOKEN_CLEANUP_BATCH_SIZE", "500"))
+        # Dead tokens are kept this long after expiry (minimum 1 day, the rate-limit window)
+        self.token_retention_days: int = int(os.getenv("TOKEN_RETENTION_DAYS", "7"))
+
+        # AuthEvent retention (GlobalSetting auth_event_retention_months overrides the default)
+        self.auth_event_retention_months: int = int(os.getenv("AUTH_EVENT_RETENTION_MONTHS", "12"))
+        self.auth_event_archive_dir: str = os.getenv("AUTH_EVENT_ARCHIVE_DIR", "archive/auth_events")
+        # How often the archiver runs (0 disables the background job)
+        self.auth_event_archive_interval_seconds: float = float(
+            os.getenv("AUTH_EVENT_ARCHIVE_INTERVAL_SECONDS", "86400")
+        )
+
 
 settings = Settings()
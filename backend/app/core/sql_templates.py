@@ -0,0 +1,72 @@
+"""Registry of prebuilt SQL statements for schema-adaptive queries.
+
+Some routers assemble SELECT/INSERT/UPDATE text from the columns present in
+the database. The shape only changes when the schema does, so statements are
+built once per (schema fingerprint, operation, variant) and the same
+``TextClause`` object is reused; SQLAlchemy's compiled cache then hits too.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+from sqlalchemy import TextClause
+
+
+StatementKey = Tuple[str, str, Hashable]
+
+
+class StatementRegistry:
+    """Thread-safe, size-bounded cache of built statements with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._statements: "OrderedDict[StatementKey, TextClause]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(
+        self,
+        fingerprint: str,
+        operation: str,
+        build: Callable[[], TextClause],
+        variant: Hashable = None,
+    ) -> TextClause:
+        key = (fingerprint, operation, variant)
+        with self._lock:
+            stmt = self._statements.get(key)
+            if stmt is not None:
+                self._hits += 1
+                self._statements.move_to_end(key)
+                return stmt
+            self._misses += 1
+        # Build outside the lock; a racing duplicate build is harmless
+        stmt = build()
+        with self._lock:
+            self._statements[key] = stmt
+            self._statements.move_to_end(key)
+            while len(self._statements) > self._max_entries:
+                self._statements.popitem(last=False)
+        return stmt
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._statements),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": (self._hits / total) if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+# Singleton-like instance for app-wide use
+statement_registry = StatementRegistry()
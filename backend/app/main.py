@@ -1,8 +1,21 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from .core.db import engine, replica_router
+from .core.pool_metrics import pool_status
+from .core.schema_catalog import schema_catalog
 from .core.settings import settings
+from .services.audit_archive import auth_event_archiver
+from .services.audit_writer import auth_event_writer
+from .services.email_outbox import email_dispatcher
+from .services.emailer import smtp_pool
+from .services.password_hasher import PasswordHasherBusy, password_hasher
+from .services.templating import email_templates
+from .services.token_maintenance import token_compactor
 from .routers import (
     auth,
     events,
@@ -23,7 +36,26 @@ from .routers import (
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    # Warm the column catalog; if the DB is unreachable it loads lazily later
+    try:
+        schema_catalog.snapshot()
+    except Exception:
+        pass
+    # Compile email templates up front so a broken template fails at startup
+    email_templates.load()
+    auth_event_writer.start()
+    email_dispatcher.start()
+    token_compactor.start()
+    auth_event_archiver.start()
     yield
+    auth_event_archiver.stop()
+    token_compactor.stop()
+    email_dispatcher.stop()
+    smtp_pool.close_all()
+    # Drain queued audit rows before the process exits
+    auth_event_writer.stop()
+    password_hasher.shutdown()
+    logging.getLogger(__name__).info("DB pool at shutdown: %s", pool_status(engine.pool))
 
 
 app = FastAPI(
@@ -40,9 +72,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paging and revalidation headers the frontend reads
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 
+# Methods that may write; the caller's reads then stick to the primary briefly
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method in _WRITE_METHODS:
+        replica_router.mark_write(request)
+    return response
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(_: Request, __: PasswordHasherBusy):
+    # Shed load fast during login storms rather than queueing request threads
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 def read_root():
     return {"status": "ok"}
@@ -51,6 +51,7 @@ class EmailVerificationToken(Base):
         ForeignKey("User.UserID"), nullable=False
     )
     token: Mapped[str] = mapped_column(String(128), nullable=False)
+    token_hash: Mapped[str] = mapped_column("TokenHash", String(64), nullable=True)
     expires_at: Mapped[datetime.datetime] = mapped_column(
         DateTime, nullable=False
     )
@@ -74,6 +75,7 @@ class PasswordResetToken(Base):
         ForeignKey("User.UserID"), nullable=False
     )
     token: Mapped[str] = mapped_column(String(128), nullable=False)
+    token_hash: Mapped[str] = mapped_column("TokenHash", String(64), nullable=True)
     expires_at: Mapped[datetime.datetime] = mapped_column(
         DateTime, nullable=False
     )
@@ -84,4 +86,23 @@ class PasswordResetToken(Base):
         DateTime, nullable=False, default=datetime.datetime.utcnow
     )
 
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+
+class Invitation(Base):
+    __tablename__ = "Invitation"
+
+    id: Mapped[int] = mapped_column(
+        "InvitationID", BigInteger, primary_key=True, autoincrement=True
+    )
+    organization_id: Mapped[int] = mapped_column("OrganizationID", BigInteger, nullable=False)
+    email: Mapped[str] = mapped_column("Email", String(320), nullable=False)
+    role: Mapped[str] = mapped_column("Role", String(50), nullable=False)
+    token: Mapped[str] = mapped_column("Token", String(128), nullable=False, unique=True)
+    token_hash: Mapped[str] = mapped_column("TokenHash", String(64), nullable=True)
+    expires_at: Mapped[datetime.datetime] = mapped_column("ExpiresAt", DateTime, nullable=False)
+    consumed_at: Mapped[datetime.datetime] = mapped_column("ConsumedAt", DateTime, nullable=True)
+    created_by: Mapped[int] = mapped_column("CreatedBy", BigInteger, nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        "CreatedAt", DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Path, Header, HTTPException
+from fastapi import APIRouter, Depends, Path
 from pydantic import BaseModel
-from typing import Optional
 
-from ..utils.security import decode_jwt_token
-from ..core.settings import settings
+from ..core.auth import claims_cache, require_role
+from ..core.db import engine, read_engine
+from ..core.org_context import org_context
+from ..core.role_catalog import role_catalog
+from ..core.pool_metrics import pool_status
+from ..services.audit_archive import auth_event_archiver
+from ..services.audit_writer import auth_event_writer
+from ..services.email_outbox import email_dispatcher
+from ..services.emailer import smtp_pool
+from ..services.password_hasher import password_hasher
+from ..services.session_store import session_store
+from ..services.token_maintenance import token_compactor
+from ..core.schema_catalog import schema_catalog
+from ..core.sql_templates import statement_registry
 
-router = APIRouter(prefix="/admin", tags=["admin"]) 
+# Every admin route is SystemAdmin-only
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_role("SystemAdmin"))])
 
 
 class ModelAssignmentRequest(BaseModel):
@@ -15,21 +27,80 @@ class ModelAssignmentRequest(BaseModel):
     overrides: dict | None = None
 
 
-def _get_claims(authorization: Optional[str]) -> dict:
-    if not authorization or not authorization.lower().startswith("bearer "):
-        raise HTTPException(status_code=401, detail="Missing token")
-    token = authorization.split(" ", 1)[1]
-    payload = decode_jwt_token(token, settings.jwt_secret)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return payload
-
-
 @router.post("/orgs/{org_id}/model-assignment")
-async def assign_model_plan(org_id: str = Path(...), payload: ModelAssignmentRequest | None = None, authorization: Optional[str] = Header(None)):
-    claims = _get_claims(authorization)
-    role = claims.get("role")
-    if role != "SystemAdmin":
-        raise HTTPException(status_code=403, detail="SystemAdmin required")
+async def assign_model_plan(org_id: str = Path(...), payload: ModelAssignmentRequest | None = None):
     # Stub: would validate roles and persist org_business_model + entitlements overrides
     return {"org_id": org_id, "model_id": payload.model_id, "plan_id": payload.plan_id, "effective_at": payload.effective_at}
+
+
+@router.post("/schema-catalog/refresh")
+def refresh_schema_catalog():
+    snapshot = schema_catalog.refresh()
+    return {
+        "revision": snapshot.revision,
+        "fingerprint": snapshot.fingerprint,
+        "tables": {name: len(cols) for name, cols in snapshot.columns.items()},
+    }
+
+
+@router.get("/sql-templates/stats")
+async def sql_template_stats():
+    return statement_registry.stats()
+
+
+@router.get("/db/pool")
+async def db_pool_stats():
+    stats = {"primary": pool_status(engine.pool)}
+    if read_engine is not engine:
+        stats["replica"] = pool_status(read_engine.pool)
+    return stats
+
+
+@router.get("/audit/writer")
+async def audit_writer_stats():
+    return auth_event_writer.stats()
+
+
+@router.get("/auth/hasher")
+async def password_hasher_stats():
+    return password_hasher.stats()
+
+
+@router.get("/auth/claims-cache")
+async def claims_cache_stats():
+    return claims_cache.stats()
+
+
+@router.get("/auth/org-context")
+async def org_context_stats():
+    return org_context.stats()
+
+
+@router.post("/roles/refresh")
+def refresh_role_catalog():
+    return {"roles": role_catalog.refresh()}
+
+
+@router.get("/email/outbox")
+async def email_outbox_stats():
+    return email_dispatcher.stats()
+
+
+@router.get("/email/smtp")
+async def smtp_pool_stats():
+    return smtp_pool.stats()
+
+
+@router.get("/auth/token-cleanup")
+async def token_cleanup_stats():
+    return token_compactor.stats()
+
+
+@router.get("/audit/archive")
+async def auth_event_archive_stats():
+    return auth_event_archiver.stats()
+
+
+@router.get("/auth/sessions")
+async def session_store_stats():
+    return session_store.stats()
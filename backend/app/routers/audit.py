@@ -1,24 +1,48 @@
+import csv
+import io
+import json
+import zlib
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
-from ..core.db import engine
-from ..utils.security import decode_jwt_token
-from ..core.settings import settings
+from ..core.auth import auth_dependency
+from ..core.db import get_read_conn, replica_router
+from ..core.org_context import org_context
+from ..services.audit_query import (
+    AUTH_EVENT_COLUMNS,
+    AuthEventFilter,
+    InvalidCursor,
+    auth_event_counter,
+    decode_cursor,
+    encode_cursor,
+    export_query,
+    page_query,
+)
 
 router = APIRouter(prefix="/audit", tags=["audit"]) 
 
 
-def get_claims(authorization: Optional[str] = Header(None)) -> dict:
-    if not authorization or not authorization.lower().startswith("bearer "):
-        raise HTTPException(status_code=401, detail="Missing token")
-    token = authorization.split(" ", 1)[1]
-    payload = decode_jwt_token(token, settings.jwt_secret)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return payload
+def _effective_org(claims: dict, org_id: Optional[int]) -> Optional[int]:
+    # Org scoping: Admin limited to their org_id; SystemAdmin can override via query
+    role = claims.get("role")
+    if role not in ("Admin", "SystemAdmin"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    if role == "SystemAdmin":
+        return org_id or claims.get("org_id")
+    return _own_org(claims)
+
+
+def _own_org(claims: dict) -> int:
+    # An unresolved org would drop the filter and show every tenant's rows
+    effective = org_context.resolve(claims)
+    if not effective:
+        raise HTTPException(status_code=400, detail="Missing org context")
+    return effective
 
 
 @router.get("/auth")
@@ -31,55 +55,131 @@ def list_auth_events(
     org_id: Optional[int] = Query(None),
     from_: Optional[datetime] = Query(None, alias="from"),
     to: Optional[datetime] = Query(None),
-    page: int = 1,
-    page_size: int = 50,
-    claims: dict = Depends(get_claims),
+    cursor: Optional[str] = Query(None),
+    page_size: int = Query(50, ge=1, le=500),
+    total: Literal["none", "estimate", "exact"] = Query("estimate"),
+    claims: dict = Depends(auth_dependency),
+    conn: Connection = Depends(get_read_conn),
 ):
-    role = claims.get("role")
-    if role not in ("Admin", "SystemAdmin"):
-        raise HTTPException(status_code=403, detail="Admin access required")
+    """Newest first; pass ``next_cursor`` back as ``cursor`` for the next page.
 
-    offset = max(page - 1, 0) * page_size
-    filters = ["1=1"]
-    params = {}
-    if email:
-        filters.append("Email = :email")
-        params["email"] = email
-    if event:
-        filters.append("EventType = :event")
-        params["event"] = event
-    if status:
-        filters.append("Status = :status")
-        params["status"] = status
-    if reason:
-        filters.append("ReasonCode = :reason")
-        params["reason"] = reason
-    if user_id:
-        filters.append("UserID = :user_id")
-        params["user_id"] = user_id
-    # Org scoping: Admin limited to their org_id; SystemAdmin can override via query
-    effective_org = org_id if (role == "SystemAdmin" and org_id) else claims.get("org_id")
-    if effective_org:
-        filters.append("OrganizationID = :org")
-        params["org"] = effective_org
-    if from_:
-        filters.append("CreatedDate >= :from")
-        params["from"] = from_
-    if to:
-        filters.append("CreatedDate <= :to")
-        params["to"] = to
+    With ``total=estimate`` the total is null until a background count for the
+    same filters has finished; ask again or use ``total=exact`` to wait for it.
+    """
+    f = AuthEventFilter.build(
+        email=email,
+        event=event,
+        status=status,
+        reason=reason,
+        user_id=user_id,
+        org_id=_effective_org(claims, org_id),
+        from_=from_,
+        to=to,
+    )
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    where = " AND ".join(filters)
-    with engine.begin() as conn:
-        total = conn.execute(text(f"SELECT COUNT(1) FROM AuthEvent WHERE {where}"), params).scalar() or 0
-        rows = conn.execute(
-            text(
-                f"SELECT TOP (:page_size) * FROM (SELECT ROW_NUMBER() OVER (ORDER BY CreatedDate DESC) AS rn, * FROM AuthEvent WHERE {where}) q WHERE rn > :offset ORDER BY rn"
-            ),
-            {**params, "page_size": page_size, "offset": offset},
-        ).mappings().all()
-    items = [dict(r) for r in rows]
-    return {"items": items, "page": page, "page_size": page_size, "total": int(total)}
+    # One extra row tells us whether another page exists
+    sql, params = page_query(f, after, page_size + 1)
+    rows = conn.execute(sql, params).mappings().all()
+    items = [dict(r) for r in rows[:page_size]]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor(last["CreatedDate"], last["AuthEventID"])
+
+    count = None
+    if total == "exact":
+        count = auth_event_counter.exact(conn, f)
+    elif total == "estimate":
+        count = auth_event_counter.estimate(conn, f)
+    return {
+        "items": items,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "total": count,
+        "total_is_estimate": total == "estimate",
+    }
+
+
+EXPORT_FETCH_ROWS = 1000
+# Rows are written out in chunks of roughly this size
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _export_chunks(bind, f: AuthEventFilter, fmt: str) -> Iterator[bytes]:
+    """Encode rows as they are fetched; memory stays at one fetch batch."""
+    sql, params = export_query(f)
+    buf = io.StringIO()
+    writer = csv.writer(buf) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(AUTH_EVENT_COLUMNS)
+    # Owns its connection: the response body outlives the request's dependencies
+    with bind.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=EXPORT_FETCH_ROWS).execute(sql, params)
+        for row in result:
+            if writer is not None:
+                writer.writerow(["" if v is None else v.isoformat() if isinstance(v, datetime) else v for v in row])
+            else:
+                buf.write(json.dumps(dict(row._mapping), default=str))
+                buf.write("\n")
+            if buf.tell() >= EXPORT_CHUNK_BYTES:
+                yield buf.getvalue().encode("utf-8")
+                buf.seek(0)
+                buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+@router.get("/auth/export")
+def export_auth_events(
+    request: Request,
+    email: Optional[str] = Query(None),
+    event: Optional[str] = Query(None, alias="event_type"),
+    status: Optional[str] = Query(None),
+    reason: Optional[str] = Query(None, alias="reason_code"),
+    user_id: Optional[int] = Query(None),
+    org_id: Optional[int] = Query(None),
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = Query(None),
+    fmt: Literal["csv", "ndjson"] = Query("ndjson", alias="format"),
+    gzip: bool = Query(False),
+    claims: dict = Depends(auth_dependency),
+):
+    """Stream every matching AuthEvent row, oldest first, as CSV or NDJSON."""
+    f = AuthEventFilter.build(
+        email=email,
+        event=event,
+        status=status,
+        reason=reason,
+        user_id=user_id,
+        org_id=_effective_org(claims, org_id),
+        from_=from_,
+        to=to,
+    )
+    body = _export_chunks(replica_router.engine_for_read(request), f, fmt)
+    filename = f"auth-events-{datetime.utcnow():%Y%m%dT%H%M%S}.{fmt}"
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    if gzip:
+        body = _gzip_chunks(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/provider-errors")
@@ -91,7 +191,7 @@ def list_provider_errors(
     to: Optional[datetime] = Query(None),
     page: int = 1,
     page_size: int = 50,
-    claims: dict = Depends(get_claims),
+    claims: dict = Depends(auth_dependency),
 ):
     role = claims.get("role")
     if role not in ("Admin", "SystemAdmin"):
@@ -108,10 +208,43 @@ def list_dead_letter_queue(
     to: Optional[datetime] = Query(None),
     page: int = 1,
     page_size: int = 50,
-    claims: dict = Depends(get_claims),
+    claims: dict = Depends(auth_dependency),
+    conn: Connection = Depends(get_read_conn),
 ):
     role = claims.get("role")
     if role not in ("Admin", "SystemAdmin"):
         raise HTTPException(status_code=403, detail="Admin access required")
-    # Stub: replace with real DLQ table
-    return {"items": [], "page": page, "page_size": page_size, "total": 0}
+    # Only the email outbox dead-letters today
+    if queue not in (None, "email"):
+        return {"items": [], "page": page, "page_size": page_size, "total": 0}
+
+    offset = max(page - 1, 0) * page_size
+    filters = ["Status = 'dead'"]
+    params = {}
+    if role == "SystemAdmin":
+        effective_org = org_id or claims.get("org_id")
+    else:
+        effective_org = _own_org(claims)
+    if effective_org:
+        filters.append("OrganizationID = :org")
+        params["org"] = effective_org
+    if from_:
+        filters.append("CreatedAt >= :from")
+        params["from"] = from_
+    if to:
+        filters.append("CreatedAt <= :to")
+        params["to"] = to
+
+    where = " AND ".join(filters)
+    total = conn.execute(text(f"SELECT COUNT(1) FROM EmailOutbox WHERE {where}"), params).scalar() or 0
+    rows = conn.execute(
+        text(
+            "SELECT OutboxID AS id, 'email' AS queue, ToAddress AS [to], Subject AS subject, "
+            "OrganizationID AS org_id, Attempts AS attempts, LastError AS last_error, "
+            f"CreatedAt AS created_at FROM EmailOutbox WHERE {where} "
+            "ORDER BY OutboxID DESC OFFSET :offset ROWS FETCH NEXT :page_size ROWS ONLY"
+        ),
+        {**params, "page_size": page_size, "offset": offset},
+    ).mappings().all()
+    items = [dict(r) for r in rows]
+    return {"items": items, "page": page, "page_size": page_size, "total": int(total)}
@@ -3,26 +3,37 @@
 # (e.g., `TableName`, `ColumnName`). However, the SQLAlchemy models and Python code
 # often use snake_case. When writing raw SQL queries, you MUST use the correct
 # PascalCase names for columns to avoid errors.
+import logging
 from datetime import datetime, timedelta, timezone
-import secrets
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from fastapi.responses import RedirectResponse
-from sqlalchemy import text
-
-from ..core.db import engine
+from sqlalchemy import TextClause, text
+from sqlalchemy.engine import Connection
+
+from ..core.auth import auth_dependency, bearer_token, claims_cache, verify_token
+from ..core.db import after_commit, engine, get_read_conn, get_uow, run_db, unit_of_work
+from ..core.org_context import org_context
+from ..core.role_catalog import role_catalog
+from ..core.schema_catalog import schema_catalog
 from ..core.settings import settings
+from ..core.sql_templates import statement_registry
 from ..utils.security import (
     create_jwt_token,
-    hash_password,
-    verify_password,
-    decode_jwt_token,
 )
-from ..services.emailer import send_email
+from ..services.audit_writer import INSERT_AUTH_EVENT, auth_event_writer
+from ..services.password_hasher import password_hasher
+from ..services.rate_limiter import rate_limiter, reset_rule, resend_rule
+from ..services import token_store
+from ..services.email_outbox import enqueue_email
+from ..services.session_store import SessionInvalid, session_store
+from ..services.templating import email_templates
 from ..schemas.auth import (
     LoginRequest,
     LoginResponse,
+    LogoutRequest,
+    RefreshRequest,
     SignupRequest,
     ResendRequest,
     ResetRequest,
@@ -32,6 +43,7 @@ from ..schemas.auth import (
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
+logger = logging.getLogger(__name__)
 
 
 def _now() -> datetime:
@@ -39,7 +51,7 @@ def _now() -> datetime:
 
 
 def write_auth_event(
-    engine,
+    bind,
     *,
     event_type: str,
     status: str,
@@ -49,123 +61,169 @@ def write_auth_event(
     reason: Optional[str] = None,
     request: Optional[Request] = None,
 ):
+    """Record an AuthEvent row; never raises.
+
+    Rows go to the batched background writer. On a unit-of-work connection
+    they are handed over only after the transaction commits, so a rolled-back
+    request leaves no audit trail it did not earn. When the writer is not
+    running (scripts, tests without lifespan) the row is inserted directly
+    through ``bind``, which may be the engine or the request's connection.
+    """
+    row = {
+        "org_id": org_id,
+        "user_id": user_id,
+        "email": email,
+        "event_type": event_type,
+        "status": status,
+        "reason": reason,
+        "req_id": request.headers.get("X-Request-ID") if request else None,
+        "ip": request.client.host if request and request.client else None,
+        "ua": request.headers.get("User-Agent") if request else None,
+        "created": _now().replace(tzinfo=None),
+    }
     try:
-        with engine.begin() as conn:
-            req_id = request.headers.get("X-Request-ID") if request else None
-            ip = request.client.host if request and request.client else None
-            ua = request.headers.get("User-Agent") if request else None
-            conn.execute(
-                text(
-                    "INSERT INTO AuthEvent (OrganizationID, UserID, Email, "
-                    "EventType, Status, ReasonCode, RequestID, IP, UserAgent) "
-                    "VALUES (:org_id, :user_id, :email, :event_type, :status, "
-                    ":reason, :req_id, :ip, :ua)"
-                ),
-                {
-                    "org_id": org_id,
-                    "user_id": user_id,
-                    "email": email,
-                    "event_type": event_type,
-                    "status": status,
-                    "reason": reason,
-                    "req_id": req_id,
-                    "ip": ip,
-                    "ua": ua,
-                },
-            )
+        if auth_event_writer.running:
+            if isinstance(bind, Connection):
+                after_commit(bind, lambda: auth_event_writer.submit(row))
+            else:
+                auth_event_writer.submit(row)
+        elif isinstance(bind, Connection):
+            bind.execute(INSERT_AUTH_EVENT, row)
+        else:
+            with bind.begin() as conn:
+                conn.execute(INSERT_AUTH_EVENT, row)
     except Exception:
         pass
 
 
-def get_user_by_email(email: str):
-    with engine.begin() as conn:
-        row = conn.execute(
-            text(
-                "SELECT TOP 1 * FROM [User] WHERE Email = :email "
-                "ORDER BY UserID DESC"
-            ),
-            {"email": email},
-        ).mappings().first()
-        return row
+def get_user_by_email(conn, email: str):
+    return conn.execute(
+        text(
+            "SELECT TOP 1 * FROM [User] WHERE Email = :email "
+            "ORDER BY UserID DESC"
+        ),
+        {"email": email},
+    ).mappings().first()
+
+
+def _build_login_sql(with_org: bool) -> TextClause:
+    org_col = "u.OrganizationID" if with_org else "NULL AS OrganizationID"
+    return text(
+        "SELECT TOP 1 u.UserID, u.EmailVerified, u.PasswordHash, u.PasswordSalt, "
+        f"u.RoleID, r.RoleName, {org_col} "
+        "FROM [User] u LEFT JOIN Role r ON r.RoleID = u.RoleID "
+        "WHERE u.Email = :email ORDER BY u.UserID DESC"
+    )
 
 
-def get_role_id(role_name: str) -> Optional[int]:
-    with engine.begin() as conn:
-        row = conn.execute(
-            text("SELECT TOP 1 RoleID FROM Role WHERE RoleName = :n"),
-            {"n": role_name},
-        ).first()
-        return int(row[0]) if row else None
+def get_login_user(conn, email: str):
+    """Credentials, role name and org link for ``email`` in one round-trip."""
+    schema = schema_catalog.snapshot(conn)
+    with_org = schema.has_column("User", "OrganizationID")
+    stmt = statement_registry.get(
+        schema.fingerprint, "user.login", lambda: _build_login_sql(with_org), variant=with_org
+    )
+    return conn.execute(stmt, {"email": email}).mappings().first()
 
 
-def get_default_org_id() -> Optional[int]:
-    with engine.begin() as conn:
-        row = conn.execute(
-            text(
-                "SELECT TOP 1 OrganizationID FROM Organization "
-                "ORDER BY OrganizationID"
-            )
-        ).first()
-        return int(row[0]) if row else None
+def _build_claims_sql(with_org: bool) -> TextClause:
+    org_col = "OrganizationID" if with_org else "NULL AS OrganizationID"
+    return text(f"SELECT RoleID, {org_col} FROM [User] WHERE UserID = :uid")
+
+
+def get_user_claims(conn, user_id: int) -> Optional[dict]:
+    """Current role name and org link for a token refresh (one PK lookup)."""
+    schema = schema_catalog.snapshot(conn)
+    with_org = schema.has_column("User", "OrganizationID")
+    stmt = statement_registry.get(
+        schema.fingerprint, "user.claims", lambda: _build_claims_sql(with_org), variant=with_org
+    )
+    row = conn.execute(stmt, {"uid": user_id}).mappings().first()
+    if row is None:
+        return None
+    return {
+        "org_id": row["OrganizationID"],
+        "role": role_catalog.role_name(conn, row["RoleID"]) or "User",
+    }
+
+
+def _client_meta(request: Request) -> dict:
+    return {
+        "ip": request.client.host if request.client else None,
+        "user_agent": request.headers.get("User-Agent"),
+    }
+
+
+def _token_response(
+    user_id: int, org_id, role: str, refresh_token: Optional[str], family_id: Optional[str]
+) -> LoginResponse:
+    """Short-lived access JWT; ``sid`` ties it to its session family for logout."""
+    ttl = timedelta(minutes=settings.access_token_ttl_minutes)
+    claims = {
+        "sub": str(user_id),
+        "org_id": org_id,
+        "role": role,
+        "exp": int((_now() + ttl).timestamp()),
+    }
+    if family_id:
+        claims["sid"] = family_id
+    return LoginResponse(
+        access_token=create_jwt_token(claims, settings.jwt_secret),
+        expires_in=int(ttl.total_seconds()),
+        refresh_token=refresh_token,
+    )
+
+
+def get_role_id(conn, role_name: str) -> Optional[int]:
+    return role_catalog.role_id(conn, role_name)
 
 
-def _user_has_org_column(conn) -> bool:
-    exists = conn.execute(
+def get_default_org_id(conn) -> Optional[int]:
+    row = conn.execute(
         text(
-            "SELECT COUNT(1) FROM sys.columns "
-            "WHERE Name = 'OrganizationID' AND Object_ID = Object_ID('[User]')"
+            "SELECT TOP 1 OrganizationID FROM Organization "
+            "ORDER BY OrganizationID"
         )
-    ).scalar()
-    try:
-        return bool(int(exists or 0))
-    except Exception:
-        return False
+    ).first()
+    return int(row[0]) if row else None
 
 
-def ensure_user_organization(user_id: int, email: str) -> Optional[int]:
+def ensure_user_organization(conn, user_id: int, email: str) -> Optional[int]:
     """Ensure the user has an OrganizationID. Create a default org if missing.
     Returns the org id if linked, otherwise None when column is not present.
     """
     local_name = email.split("@")[0] if email and "@" in email else "Org"
-    with engine.begin() as conn:
-        if not _user_has_org_column(conn):
-            return None
-        row = conn.execute(
-            text("SELECT OrganizationID FROM [User] WHERE UserID = :uid"),
-            {"uid": user_id},
-        ).first()
-        current = int(row[0]) if row and row[0] is not None else None
-        if current:
-            return current
-        conn.execute(
-            text(
-                "INSERT INTO Organization (Name, CreatedDate) "
-                "VALUES (:name, GETDATE())"
-            ),
-            {"name": f"{local_name}'s Organization"},
-        )
-        org_row = conn.execute(text("SELECT SCOPE_IDENTITY()"))
-        new_org_id = int(list(org_row.fetchone() or [0])[0])
-        conn.execute(
-            text("UPDATE [User] SET OrganizationID = :org WHERE UserID = :uid"),
-            {"org": new_org_id, "uid": user_id},
-        )
-        return new_org_id
+    if not schema_catalog.snapshot(conn).has_column("User", "OrganizationID"):
+        return None
+    row = conn.execute(
+        text("SELECT OrganizationID FROM [User] WHERE UserID = :uid"),
+        {"uid": user_id},
+    ).first()
+    current = int(row[0]) if row and row[0] is not None else None
+    if current:
+        return current
+    conn.execute(
+        text(
+            "INSERT INTO Organization (Name, CreatedDate) "
+            "VALUES (:name, GETDATE())"
+        ),
+        {"name": f"{local_name}'s Organization"},
+    )
+    org_row = conn.execute(text("SELECT SCOPE_IDENTITY()"))
+    new_org_id = int(list(org_row.fetchone() or [0])[0])
+    conn.execute(
+        text("UPDATE [User] SET OrganizationID = :org WHERE UserID = :uid"),
+        {"org": new_org_id, "uid": user_id},
+    )
+    # Only once the link is committed, or a racing read could re-cache the old scope
+    after_commit(conn, lambda: org_context.invalidate(user_id))
+    return new_org_id
 
 
-@router.post("/signup", response_model=dict)
-def signup(payload: SignupRequest, request: Request):
-    write_auth_event(
-        engine,
-        event_type="signup_attempt",
-        status="attempt",
-        email=payload.email,
-        request=request,
-    )
-    existing = get_user_by_email(payload.email)
+def _reject_verified_signup(conn, existing, payload: SignupRequest, request: Request) -> None:
     if existing and (existing.get("EmailVerified") and existing.get("EmailVerified") != 0):
         write_auth_event(
-            engine,
+            conn,
             event_type="signup_failure",
             status="failure",
             email=payload.email,
@@ -173,28 +231,47 @@ def signup(payload: SignupRequest, request: Request):
             request=request,
         )
         raise HTTPException(status_code=400, detail="Account already exists")
-    role_id = get_role_id("User")
-    # using bcrypt for new passwords; salt kept for legacy compatibility
-    salt = ""
-    pwd_hash = hash_password(salt, payload.password)
-    # Derive username if needed (not used yet; kept for future)
-    # username = payload.email.split("@")[0]
-    with engine.begin() as conn:
+
+
+def _signup_precheck(payload: SignupRequest, request: Request) -> None:
+    with unit_of_work() as conn:
+        write_auth_event(
+            conn,
+            event_type="signup_attempt",
+            status="attempt",
+            email=payload.email,
+            request=request,
+        )
+        _reject_verified_signup(conn, get_user_by_email(conn, payload.email), payload, request)
+
+
+def _signup_write(payload: SignupRequest, pwd_hash: str, salt: str, request: Request) -> None:
+    with unit_of_work() as conn:
+        # Re-read: the account may have changed while the password was hashing
+        existing = get_user_by_email(conn, payload.email)
+        _reject_verified_signup(conn, existing, payload, request)
+        role_id = get_role_id(conn, "User")
+        # Derive username if needed (not used yet; kept for future)
+        # username = payload.email.split("@")[0]
+
         # Get the "Default Organization" ID
         default_org = conn.execute(
             text("SELECT TOP 1 OrganizationID FROM Organization WHERE OrganizationCode = 'DEFAULT'")
         ).first()
-        
+
         if not default_org:
             raise HTTPException(status_code=500, detail="Default organization not found")
-        
+
         org_id = default_org[0]
 
         if existing is None:
-            conn.execute(
+            user_id = conn.execute(
                 text(
-                    "INSERT INTO [User] (RoleID, OrganizationID, Email, Username, FirstName, LastName, CreatedBy, PasswordHash, PasswordSalt, EmailVerified, CreatedDate) "
-                    "VALUES (:RoleID, :OrganizationID, :Email, :Username, 'New', 'User', :CreatedBy, :PasswordHash, :PasswordSalt, 0, GETUTCDATE())"
+                    "INSERT INTO [User] (RoleID, OrganizationID, Email, Username, FirstName, LastName, "
+                    "CreatedBy, PasswordHash, PasswordSalt, EmailVerified, CreatedDate) "
+                    "OUTPUT INSERTED.UserID "
+                    "VALUES (:RoleID, :OrganizationID, :Email, :Username, 'New', 'User', :CreatedBy, "
+                    ":PasswordHash, :PasswordSalt, 0, GETUTCDATE())"
                 ),
                 {
                     "RoleID": role_id,
@@ -205,12 +282,14 @@ def signup(payload: SignupRequest, request: Request):
                     "PasswordHash": pwd_hash,
                     "PasswordSalt": salt,
                 },
-            )
+            ).scalar()
         else:
+            user_id = existing["UserID"]
             # Existing unverified user, update password and link to org
             conn.execute(
                 text(
-                    "UPDATE [User] SET OrganizationID = :org_id, PasswordHash = :pwd_hash, PasswordSalt = :salt WHERE Email = :email"
+                    "UPDATE [User] SET OrganizationID = :org_id, PasswordHash = :pwd_hash, "
+                    "PasswordSalt = :salt WHERE Email = :email"
                 ),
                 {
                     "org_id": org_id,
@@ -219,96 +298,92 @@ def signup(payload: SignupRequest, request: Request):
                     "email": payload.email
                 }
             )
-    token = secrets.token_urlsafe(32)
-    expires = _now() + timedelta(minutes=60)
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                "INSERT INTO emailverificationtoken (UserID, Token, "
-                "ExpiresAt, ConsumedAt, CreatedAt) SELECT TOP 1 UserID, "
-                ":token, :exp, NULL, GETDATE() FROM [User] WHERE "
-                "Email = :email ORDER BY UserID DESC"
-            ),
-            {"token": token, "exp": expires, "email": payload.email},
+        expires = _now() + timedelta(minutes=60)
+        token, _ = token_store.issue(
+            conn, token_store.EMAIL_VERIFICATION, {"UserID": user_id}, expires
         )
-    verify_url = f"http://localhost:3000/verify?token={token}"
-    send_email(
-        to=payload.email,
-        subject="Verify your account",
-        body=f"Click to verify your account: {verify_url}",
-    )
-    write_auth_event(
-        engine,
-        event_type="signup_success",
-        status="success",
-        email=payload.email,
-        request=request,
-    )
+        # Queued in this transaction; the outbox dispatcher sends it after commit
+        verify_url = f"http://localhost:3000/verify?token={token}"
+        mail = email_templates.render("verify_email", verify_url=verify_url)
+        enqueue_email(
+            conn,
+            to=payload.email,
+            subject=mail.subject,
+            body=mail.body,
+            html_body=mail.html_body,
+            org_id=org_id,
+        )
+        write_auth_event(
+            conn,
+            event_type="signup_success",
+            status="success",
+            email=payload.email,
+            request=request,
+        )
+
+
+@router.post("/signup", response_model=dict)
+async def signup(payload: SignupRequest, request: Request):
+    # Two short units of work; bcrypt runs with no connection checked out
+    await run_db(_signup_precheck, payload, request)
+    # using bcrypt for new passwords; salt kept for legacy compatibility
+    salt = ""
+    pwd_hash = await password_hasher.hash(salt, payload.password)
+    await run_db(_signup_write, payload, pwd_hash, salt, request)
     return {"status": "verification_required"}
 
 
 @router.get("/verify", response_class=RedirectResponse)
-def verify(token: str, request: Request):
+def verify(token: str, request: Request, conn: Connection = Depends(get_uow)):
     write_auth_event(
-        engine,
+        conn,
         event_type="verification_attempt",
         status="attempt",
         request=request,
     )
-    with engine.begin() as conn:
-        row = conn.execute(
-            text(
-                "SELECT TOP 1 evt.UserID, evt.ExpiresAt, evt.ConsumedAt, "
-                "u.Email FROM emailverificationtoken evt JOIN [User] u ON "
-                "u.UserID = evt.UserID WHERE evt.Token = :token "
-                "ORDER BY evt.ID DESC"
-            ),
-            {"token": token},
-        ).mappings().first()
-        if not row:
-            write_auth_event(
-                engine,
-                event_type="verification_failure",
-                status="failure",
-                reason="invalid",
-                request=request,
-            )
-            return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?error=Invalid verification link.")
-
-        if row["ConsumedAt"] is not None:
-            time_since_consumed = datetime.now(timezone.utc).replace(tzinfo=None) - row["ConsumedAt"]
-            if time_since_consumed < timedelta(seconds=2):
-                # Harmless double-click, redirect to login as if successful
-                return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?verified=true")
-            else:
-                # Attempt to reuse a token
-                return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?error=This verification link has already been used. Please try logging in.")
+    row = token_store.find(
+        conn, token_store.EMAIL_VERIFICATION, token, ("UserID",), with_user_email=True
+    )
+    if not row:
+        write_auth_event(
+            conn,
+            event_type="verification_failure",
+            status="failure",
+            reason="invalid",
+            request=request,
+        )
+        return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?error=Invalid verification link.")
 
-        if row["ExpiresAt"] and row["ExpiresAt"] < _now().replace(tzinfo=None):
-            write_auth_event(
-                engine,
-                event_type="verification_failure",
-                status="failure",
-                reason="expired",
-                email=row["Email"],
-                user_id=row["UserID"],
-                request=request,
-            )
-            return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?error=This verification link has expired. Please request a new one.")
+    if row["ConsumedAt"] is not None:
+        time_since_consumed = datetime.now(timezone.utc).replace(tzinfo=None) - row["ConsumedAt"]
+        if time_since_consumed < timedelta(seconds=2):
+            # Harmless double-click, redirect to login as if successful
+            return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?verified=true")
+        else:
+            # Attempt to reuse a token
+            return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?error=This verification link has already been used. Please try logging in.")
 
-        conn.execute(
-            text("UPDATE [User] SET EmailVerified = 1 WHERE UserID = :uid"),
-            {"uid": row["UserID"]},
-        )
-        conn.execute(
-            text(
-                "UPDATE emailverificationtoken SET ConsumedAt = GETDATE() "
-                "WHERE Token = :tkn"
-            ),
-            {"tkn": token},
+    if row["ExpiresAt"] and row["ExpiresAt"] < _now().replace(tzinfo=None):
+        write_auth_event(
+            conn,
+            event_type="verification_failure",
+            status="failure",
+            reason="expired",
+            email=row["Email"],
+            user_id=row["UserID"],
+            request=request,
         )
+        return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?error=This verification link has expired. Please request a new one.")
+
+    if not token_store.consume(conn, token_store.EMAIL_VERIFICATION, row["TokenID"]):
+        # A concurrent click consumed it first
+        return RedirectResponse(url=f"{settings.FRONTEND_URL}/login?verified=true")
+    conn.execute(
+        text("UPDATE [User] SET EmailVerified = 1 WHERE UserID = :uid"),
+        {"uid": row["UserID"]},
+    )
     write_auth_event(
-        engine,
+        conn,
         event_type="verification_success",
         status="success",
         user_id=row["UserID"],
@@ -319,38 +394,40 @@ def verify(token: str, request: Request):
 
 
 @router.post("/resend", response_model=dict)
-def resend(payload: ResendRequest, request: Request):
+def resend(payload: ResendRequest, request: Request, conn: Connection = Depends(get_uow)):
     write_auth_event(
-        engine,
+        conn,
         event_type="resend_attempt",
         status="attempt",
         email=payload.email,
         request=request,
     )
-    with engine.begin() as conn:
-        user = conn.execute(
-            text("SELECT TOP 1 * FROM [User] WHERE Email = :email"),
-            {"email": payload.email},
-        ).mappings().first()
-        if not user or (user.get("EmailVerified") and user.get("EmailVerified") != 0):
-            write_auth_event(
-                engine,
-                event_type="resend_success",
-                status="success",
-                email=payload.email,
-                request=request,
-            )
-            return {"status": "sent"}
-        recent = conn.execute(
-            text(
-                "SELECT TOP 1 CreatedAt FROM EmailVerificationToken "
-                "WHERE UserID = :uid ORDER BY CreatedAt DESC"
-            ),
-            {"uid": user["UserID"]},
-        ).first()
-    if recent and recent[0] and (_now() - recent[0]).total_seconds() < 60:
+    user = conn.execute(
+        text("SELECT TOP 1 * FROM [User] WHERE Email = :email"),
+        {"email": payload.email},
+    ).mappings().first()
+    if not user or (user.get("EmailVerified") and user.get("EmailVerified") != 0):
         write_auth_event(
-            engine,
+            conn,
+            event_type="resend_success",
+            status="success",
+            email=payload.email,
+            request=request,
+        )
+        return {"status": "sent"}
+    expires = _now() + timedelta(minutes=60)
+    rule = resend_rule()
+    # The hit is counted only once the token row is in; a denied hit undoes it
+    with conn.begin_nested() as issued:
+        token, _ = token_store.issue(
+            conn, token_store.EMAIL_VERIFICATION, {"UserID": user["UserID"]}, expires
+        )
+        decision = rate_limiter.hit(rule, user["UserID"], conn)
+        if not decision.allowed:
+            issued.rollback()
+    if decision.reason == "cooldown":
+        write_auth_event(
+            conn,
             event_type="resend_limited",
             status="failure",
             reason="cooldown",
@@ -359,49 +436,34 @@ def resend(payload: ResendRequest, request: Request):
             request=request,
         )
         raise HTTPException(
-            status_code=429, detail="Please wait before resending"
+            status_code=429,
+            detail="Please wait before resending",
+            headers={"Retry-After": str(decision.retry_after)},
         )
-    # Enforce daily max (5)
-    with engine.begin() as conn:
-        count_today = conn.execute(
-            text(
-                "SELECT COUNT(1) FROM EmailVerificationToken WHERE "
-                "UserID = :uid AND CreatedAt > DATEADD(day, -1, GETUTCDATE())"
-            ),
-            {"uid": user["UserID"]},
-        ).scalar()
-        if count_today and int(count_today) >= 5:
-            write_auth_event(
-                engine,
-                event_type="resend_limited",
-                status="failure",
-                reason="daily_limit",
-                email=payload.email,
-                user_id=user["UserID"],
-                request=request,
-            )
-            raise HTTPException(
-                status_code=429, detail="Daily resend limit reached"
-            )
-    token = secrets.token_urlsafe(32)
-    expires = _now() + timedelta(minutes=60)
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                "INSERT INTO EmailVerificationToken (UserID, Token, "
-                "ExpiresAt, ConsumedAt, CreatedAt) VALUES "
-                "(:uid, :token, :exp, NULL, GETUTCDATE())"
-            ),
-            {"uid": user["UserID"], "token": token, "exp": expires},
+    if not decision.allowed:
+        write_auth_event(
+            conn,
+            event_type="resend_limited",
+            status="failure",
+            reason="daily_limit",
+            email=payload.email,
+            user_id=user["UserID"],
+            request=request,
+        )
+        raise HTTPException(
+            status_code=429, detail="Daily resend limit reached"
         )
     verify_url = f"/verify?token={token}"
-    send_email(
+    mail = email_templates.render("verify_email", verify_url=verify_url)
+    enqueue_email(
+        conn,
         to=payload.email,
-        subject="Verify your account",
-        body=f"Click to verify: {verify_url}",
+        subject=mail.subject,
+        body=mail.body,
+        html_body=mail.html_body,
     )
     write_auth_event(
-        engine,
+        conn,
         event_type="resend_success",
         status="success",
         email=payload.email,
@@ -411,124 +473,163 @@ def resend(payload: ResendRequest, request: Request):
     return {"status": "sent"}
 
 
-@router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, request: Request):
+def _login_candidate(payload: LoginRequest, request: Request) -> dict:
+    """Credentials row for ``payload.email``; unknown or unverified users get a 4xx."""
+    with unit_of_work() as conn:
+        write_auth_event(
+            conn,
+            event_type="login_attempt",
+            status="attempt",
+            email=payload.email,
+            request=request,
+        )
+        user = get_login_user(conn, payload.email)
+        if not user:
+            write_auth_event(
+                conn,
+                event_type="login_failure",
+                status="failure",
+                email=payload.email,
+                reason="invalid_credentials",
+                request=request,
+            )
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+        if not user.get("EmailVerified") or user.get("EmailVerified") == 0:
+            write_auth_event(
+                conn,
+                event_type="login_failure",
+                status="failure",
+                email=payload.email,
+                user_id=user["UserID"],
+                reason="unverified",
+                request=request,
+            )
+            raise HTTPException(status_code=403, detail="Email not verified")
+        return dict(user)
+
+
+def _reject_login(payload: LoginRequest, user: dict, request: Request) -> None:
     write_auth_event(
         engine,
-        event_type="login_attempt",
-        status="attempt",
+        event_type="login_failure",
+        status="failure",
         email=payload.email,
+        user_id=user["UserID"],
+        reason="invalid_credentials",
         request=request,
     )
-    user = get_user_by_email(payload.email)
-    if not user:
-        write_auth_event(
-            engine,
-            event_type="login_failure",
-            status="failure",
-            email=payload.email,
-            reason="invalid_credentials",
-            request=request,
-        )
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    if not user.get("EmailVerified") or user.get("EmailVerified") == 0:
+    raise HTTPException(status_code=401, detail="Invalid credentials")
+
+
+def _complete_login(
+    payload: LoginRequest, user: dict, upgraded_hash: Optional[str], request: Request
+) -> LoginResponse:
+    with unit_of_work() as conn:
+        if upgraded_hash:
+            # Legacy or under-cost hash: replace it now that we have the plaintext.
+            # Conditional on the old hash so a concurrent password change wins.
+            try:
+                with conn.begin_nested():
+                    conn.execute(
+                        text(
+                            "UPDATE [User] SET PasswordHash = :new WHERE UserID = :uid AND PasswordHash = :old"
+                        ),
+                        {"new": upgraded_hash, "uid": user["UserID"], "old": user.get("PasswordHash")},
+                    )
+            except Exception:
+                logger.warning("Password rehash failed for user %s", user["UserID"], exc_info=True)
+        # Ensure org exists and is linked when the column exists
+        org_id = user.get("OrganizationID")
+        if not org_id:
+            try:
+                # Savepoint keeps a failed link from poisoning the request transaction
+                with conn.begin_nested():
+                    org_id = ensure_user_organization(conn, int(user["UserID"]), payload.email)
+            except Exception:
+                org_id = None
+        # docs/shards: 04-auth-rbac.md — org scoping; 02-data-schema.md — Organization
+        # Fallback: if user column missing or linking failed, ensure a default org exists
+        if not org_id:
+            try:
+                with conn.begin_nested():
+                    oid = get_default_org_id(conn)
+                    if not oid:
+                        conn.execute(
+                            text(
+                                "INSERT INTO Organization (Name, CreatedDate) VALUES (:n, GETDATE())"
+                            ),
+                            {"n": "Default Organization"},
+                        )
+                        oid = get_default_org_id(conn)
+                org_id = oid
+            except Exception:
+                org_id = None
+        role_name = user.get("RoleName") or "User"
+
+        refresh_token, family_id = None, None
+        # Databases without the sessions migration keep access-token-only logins
+        if schema_catalog.snapshot(conn).has_table("AuthSession"):
+            refresh_token, session = session_store.create(conn, int(user["UserID"]), **_client_meta(request))
+            family_id = session.family_id
+        response = _token_response(int(user["UserID"]), org_id, role_name, refresh_token, family_id)
         write_auth_event(
-            engine,
-            event_type="login_failure",
-            status="failure",
+            conn,
+            event_type="login_success",
+            status="success",
             email=payload.email,
             user_id=user["UserID"],
-            reason="unverified",
             request=request,
         )
-        raise HTTPException(status_code=403, detail="Email not verified")
-    if not verify_password(
+        return response
+
+
+@router.post("/login", response_model=LoginResponse)
+async def login(payload: LoginRequest, request: Request):
+    # Read, verify, write: bcrypt runs with no connection checked out
+    user = await run_db(_login_candidate, payload, request)
+    verified, upgraded_hash = await password_hasher.verify_and_upgrade(
         user.get("PasswordSalt"), user.get("PasswordHash"), payload.password
-    ):
+    )
+    if not verified:
+        await run_db(_reject_login, payload, user, request)
+    return await run_db(_complete_login, payload, user, upgraded_hash, request)
+
+
+@router.post("/refresh", response_model=LoginResponse)
+def refresh(payload: RefreshRequest, request: Request, conn: Connection = Depends(get_uow)):
+    """Swap a refresh token for a new access token and the next refresh token."""
+    try:
+        new_refresh, session = session_store.rotate(conn, payload.refresh_token, **_client_meta(request))
+    except SessionInvalid as e:
         write_auth_event(
-            engine,
-            event_type="login_failure",
+            conn,
+            event_type="refresh_failure",
             status="failure",
-            email=payload.email,
-            user_id=user["UserID"],
-            reason="invalid_credentials",
+            reason=str(e),
             request=request,
         )
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    # Ensure org exists and is linked when the column exists
-    org_id = user.get("OrganizationID")
-    if not org_id:
-        try:
-            org_id = ensure_user_organization(int(user["UserID"]), payload.email)
-        except Exception:
-            org_id = None
-    # docs/shards: 04-auth-rbac.md — org scoping; 02-data-schema.md — Organization
-    # Fallback: if user column missing or linking failed, ensure a default org exists
-    if not org_id:
-        try:
-            oid = get_default_org_id()
-            if not oid:
-                with engine.begin() as conn:
-                    conn.execute(
-                        text(
-                            "INSERT INTO Organization (Name, CreatedDate) VALUES (:n, GETDATE())"
-                        ),
-                        {"n": "Default Organization"},
-                    )
-                oid = get_default_org_id()
-            org_id = oid
-        except Exception:
-            org_id = None
-    # Get role name from database
-    role_name = "User"
-    with engine.begin() as conn:
-        role_row = conn.execute(
-            text("SELECT RoleName FROM Role WHERE RoleID = :role_id"),
-            {"role_id": user.get("RoleID")}
-        ).first()
-        if role_row:
-            role_name = role_row[0]
-
-    claims = {
-        "sub": str(user["UserID"]),
-        "org_id": org_id,
-        "role": role_name,
-        "exp": int((_now() + timedelta(hours=8)).timestamp()),
-    }
-    token = create_jwt_token(claims, settings.jwt_secret)
-    write_auth_event(
-        engine,
-        event_type="login_success",
-        status="success",
-        email=payload.email,
-        user_id=user["UserID"],
-        request=request,
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    # Role and org are re-read so changes apply at the next refresh
+    current = get_user_claims(conn, session.user_id)
+    if current is None:
+        session_store.revoke_family(conn, session.family_id)
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    return _token_response(
+        session.user_id, current["org_id"], current["role"], new_refresh, session.family_id
     )
-    return LoginResponse(access_token=token)
-
-
-def auth_dependency(authorization: Optional[str] = Header(None)) -> dict:
-    if not authorization or not authorization.lower().startswith("bearer "):
-        raise HTTPException(status_code=401, detail="Missing token")
-    token = authorization.split(" ", 1)[1]
-    payload = decode_jwt_token(token, settings.jwt_secret)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return payload
 
 
 @router.get("/me", response_model=MeResponse)
-def me(claims: dict = Depends(auth_dependency)):
+def me(claims: dict = Depends(auth_dependency), conn: Connection = Depends(get_read_conn)):
     needs_onboarding = False
     org_id = claims.get("org_id")
     if org_id:
-        with engine.begin() as conn:
-            org_code = conn.execute(
-                text("SELECT OrganizationCode FROM Organization WHERE OrganizationID = :org_id"),
-                {"org_id": org_id}
-            ).scalar()
-            if org_code == 'DEFAULT':
-                needs_onboarding = True
+        org_code = conn.execute(
+            text("SELECT OrganizationCode FROM Organization WHERE OrganizationID = :org_id"),
+            {"org_id": org_id}
+        ).scalar()
+        if org_code == 'DEFAULT':
+            needs_onboarding = True
 
     return MeResponse(
         user_id=int(claims.get("sub")),
@@ -540,28 +641,30 @@ def me(claims: dict = Depends(auth_dependency)):
 
 
 @router.post("/reset/request", response_model=dict)
-def reset_request(payload: ResetRequest, request: Request):
+def reset_request(payload: ResetRequest, request: Request, conn: Connection = Depends(get_uow)):
     write_auth_event(
-        engine,
+        conn,
         event_type="reset_request_attempt",
         status="attempt",
         email=payload.email,
         request=request,
     )
-    user = get_user_by_email(payload.email)
+    user = get_user_by_email(conn, payload.email)
     if user:
-        # Check for recent reset requests (5 minute cooldown)
-        with engine.begin() as conn:
-            recent = conn.execute(
-                text(
-                    "SELECT TOP 1 CreatedAt FROM passwordresettoken "
-                    "WHERE UserID = :uid ORDER BY CreatedAt DESC"
-                ),
-                {"uid": user["UserID"]},
-            ).first()
-        if recent and recent[0] and (_now().replace(tzinfo=None) - recent[0]).total_seconds() < 300:  # 5 minutes
+        # Cooldown between requests and a daily cap (GlobalSetting-driven)
+        rule = reset_rule()
+        expires = _now().replace(tzinfo=None) + timedelta(minutes=60)
+        # The hit is counted only once the token row is in; a denied hit undoes it
+        with conn.begin_nested() as issued:
+            token, _ = token_store.issue(
+                conn, token_store.PASSWORD_RESET, {"UserID": user["UserID"]}, expires
+            )
+            decision = rate_limiter.hit(rule, user["UserID"], conn)
+            if not decision.allowed:
+                issued.rollback()
+        if decision.reason == "cooldown":
             write_auth_event(
-                engine,
+                conn,
                 event_type="reset_request_limited",
                 status="failure",
                 reason="cooldown",
@@ -570,21 +673,14 @@ def reset_request(payload: ResetRequest, request: Request):
                 request=request,
             )
             raise HTTPException(
-                status_code=429, detail="Please wait 5 minutes before requesting another reset"
+                status_code=429,
+                detail=f"Please wait {max(rule.cooldown_seconds // 60, 1)} minutes before requesting another reset",
+                headers={"Retry-After": str(decision.retry_after)},
             )
 
-        # Check daily limit (3 resets per day)
-        with engine.begin() as conn:
-            count_today = conn.execute(
-                text(
-                    "SELECT COUNT(1) FROM passwordresettoken WHERE "
-                    "UserID = :uid AND CreatedAt > DATEADD(day, -1, GETDATE())"
-                ),
-                {"uid": user["UserID"]},
-            ).scalar()
-        if count_today and int(count_today) >= 3:
+        if not decision.allowed:
             write_auth_event(
-                engine,
+                conn,
                 event_type="reset_request_limited",
                 status="failure",
                 reason="daily_limit",
@@ -593,27 +689,19 @@ def reset_request(payload: ResetRequest, request: Request):
                 request=request,
             )
             raise HTTPException(
-                status_code=429, detail="We have already sent 3 password reset emails. If you are not receiving the emails, you are not registered on the platform with this email address."
-            )
-        token = secrets.token_urlsafe(32)
-        expires = _now().replace(tzinfo=None) + timedelta(minutes=60)
-        with engine.begin() as conn:
-            conn.execute(
-                text(
-                    "INSERT INTO passwordresettoken (UserID, Token, "
-                    "ExpiresAt, ConsumedAt, CreatedAt) VALUES "
-                    "(:uid, :token, :exp, NULL, GETDATE())"
-                ),
-                {"uid": user["UserID"], "token": token, "exp": expires},
+                status_code=429, detail=f"We have already sent {rule.limit} password reset emails. If you are not receiving the emails, you are not registered on the platform with this email address."
             )
         reset_url = f"http://localhost:3000/reset/confirm?token={token}"
-        send_email(
+        mail = email_templates.render("password_reset", reset_url=reset_url)
+        enqueue_email(
+            conn,
             to=payload.email,
-            subject="Reset your password",
-            body=f"Click to reset your password: {reset_url}",
+            subject=mail.subject,
+            body=mail.body,
+            html_body=mail.html_body,
         )
     write_auth_event(
-        engine,
+        conn,
         event_type="reset_request_success",
         status="success",
         email=payload.email,
@@ -623,48 +711,50 @@ def reset_request(payload: ResetRequest, request: Request):
     return {"status": "sent"}
 
 
-@router.post("/reset/confirm", response_model=dict)
-def reset_confirm(payload: ResetConfirmRequest, request: Request):
+def _reset_expired(conn, row, request: Request) -> None:
     write_auth_event(
-        engine,
-        event_type="reset_confirm_attempt",
-        status="attempt",
+        conn,
+        event_type="reset_confirm_failure",
+        status="failure",
+        reason="expired",
+        email=row["Email"],
+        user_id=row["UserID"],
         request=request,
     )
-    with engine.begin() as conn:
-        row = conn.execute(
-            text(
-                "SELECT TOP 1 prt.UserID, prt.ExpiresAt, prt.ConsumedAt, "
-                "u.Email FROM passwordresettoken prt JOIN [User] u ON "
-                "u.UserID = prt.UserID WHERE prt.Token = :token "
-                "ORDER BY prt.ID DESC"
-            ),
-            {"token": payload.token},
-        ).mappings().first()
+    raise HTTPException(status_code=400, detail="Token expired")
+
+
+def _reset_token(payload: ResetConfirmRequest, request: Request) -> dict:
+    """The unused, unexpired reset token row; anything else is a recorded 400."""
+    with unit_of_work() as conn:
+        write_auth_event(
+            conn,
+            event_type="reset_confirm_attempt",
+            status="attempt",
+            request=request,
+        )
+        row = token_store.find(
+            conn, token_store.PASSWORD_RESET, payload.token, ("UserID",), with_user_email=True
+        )
         if not row:
             write_auth_event(
-                engine,
+                conn,
                 event_type="reset_confirm_failure",
                 status="failure",
                 reason="invalid",
                 request=request,
             )
             raise HTTPException(status_code=400, detail="Invalid token")
-        if row["ConsumedAt"] is not None or (
-            row["ExpiresAt"] and row["ExpiresAt"] < _now().replace(tzinfo=None)
-        ):
-            write_auth_event(
-                engine,
-                event_type="reset_confirm_failure",
-                status="failure",
-                reason="expired",
-                email=row["Email"],
-                user_id=row["UserID"],
-                request=request,
-            )
-            raise HTTPException(status_code=400, detail="Token expired")
-        salt = ""
-        pwd_hash = hash_password(salt, payload.new_password)
+        if row["ConsumedAt"] is not None or (row["ExpiresAt"] and row["ExpiresAt"] < _now().replace(tzinfo=None)):
+            _reset_expired(conn, row, request)
+        return dict(row)
+
+
+def _apply_reset(row: dict, pwd_hash: str, salt: str, request: Request) -> None:
+    with unit_of_work() as conn:
+        # Another request may have used the token while we were hashing
+        if not token_store.consume(conn, token_store.PASSWORD_RESET, row["TokenID"]):
+            _reset_expired(conn, row, request)
         conn.execute(
             text(
                 "UPDATE [User] SET PasswordHash = :h, PasswordSalt = :s "
@@ -672,28 +762,54 @@ def reset_confirm(payload: ResetConfirmRequest, request: Request):
             ),
             {"h": pwd_hash, "s": salt, "uid": row["UserID"]},
         )
-        conn.execute(
-            text(
-                "UPDATE passwordresettoken SET ConsumedAt = GETDATE() "
-                "WHERE Token = :tkn"
-            ),
-            {"tkn": payload.token},
+        # Any other reset links for this account stop working once one is used
+        token_store.expire_outstanding(conn, token_store.PASSWORD_RESET, row["UserID"])
+        # Signed-in devices must log in again with the new password
+        if schema_catalog.snapshot(conn).has_table("AuthSession"):
+            session_store.revoke_user(conn, row["UserID"])
+        write_auth_event(
+            conn,
+            event_type="reset_confirm_success",
+            status="success",
+            email=row["Email"],
+            user_id=row["UserID"],
+            request=request,
         )
-    write_auth_event(
-        engine,
-        event_type="reset_confirm_success",
-        status="success",
-        email=row["Email"],
-        user_id=row["UserID"],
-        request=request,
-    )
+
+
+@router.post("/reset/confirm", response_model=dict)
+async def reset_confirm(payload: ResetConfirmRequest, request: Request):
+    row = await run_db(_reset_token, payload, request)
+    salt = ""
+    pwd_hash = await password_hasher.hash(salt, payload.new_password)
+    await run_db(_apply_reset, row, pwd_hash, salt, request)
     return {"status": "updated"}
 
 
 @router.post("/logout", response_model=dict)
-def logout(request: Request):
-    # Stateless JWT; client should discard token. Record audit only.
+def logout(
+    request: Request,
+    payload: Optional[LogoutRequest] = None,
+    authorization: Optional[str] = Header(None),
+    conn: Connection = Depends(get_uow),
+):
+    # Revoke the session family (by refresh token, else the access token's
+    # sid) and drop the access token's cached claims. The access JWT itself
+    # stays valid until its short exp.
+    token = bearer_token(authorization)
+    claims = verify_token(token) if token else None
+    if token:
+        claims_cache.evict(token)
+    if schema_catalog.snapshot(conn).has_table("AuthSession"):
+        if payload is not None and payload.refresh_token:
+            session_store.revoke_token(conn, payload.refresh_token)
+        elif claims and claims.get("sid"):
+            session_store.revoke_family(conn, str(claims["sid"]))
     write_auth_event(
-        engine, event_type="logout", status="success", request=request
+        conn,
+        event_type="logout",
+        status="success",
+        user_id=int(claims["sub"]) if claims and claims.get("sub") else None,
+        request=request,
     )
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
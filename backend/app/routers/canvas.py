@@ -1,30 +1,20 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Header
+
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
 
 from ..core.db import engine
-from ..core.settings import settings
-from ..utils.security import decode_jwt_token
+from ..core.org_context import get_org_id
 
 
 router = APIRouter(prefix="/canvas", tags=["canvas"])
 
 
-def _auth_dependency(authorization: Optional[str] = Header(None)) -> dict:
-    if not authorization or not authorization.lower().startswith("bearer "):
-        raise HTTPException(status_code=401, detail="Missing token")
-    token = authorization.split(" ", 1)[1]
-    payload = decode_jwt_token(token, settings.jwt_secret)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return payload
-
-
 @router.post("/forms/{form_id}/layouts")
 def create_layout(
     form_id: int,
     payload: dict,
-    claims: dict = Depends(_auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
 ):
     # Ensure form belongs to user's org via event
     with engine.begin() as conn:
@@ -35,7 +25,7 @@ def create_layout(
                 "WHERE f.FormID = :fid AND e.OrganizationID = :org AND "
                 "(f.IsDeleted = 0 OR f.IsDeleted IS NULL)"
             ),
-            {"fid": form_id, "org": claims.get("org_id")},
+            {"fid": form_id, "org": org_id},
         ).first()
         if not row:
             raise HTTPException(status_code=404, detail="Form not found")
@@ -1,41 +1,31 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy import text
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from sqlalchemy import TextClause, text
+from sqlalchemy.engine import Connection
 import re
 
-from ..core.db import engine
-from ..core.settings import settings
-from ..utils.security import decode_jwt_token
+from ..core.auth import auth_dependency
+from ..core.db import engine, get_read_conn
+from ..core.org_context import get_org_id
+from ..core.schema_catalog import EventColumns, schema_catalog
+from ..core.sql_templates import statement_registry
+from ..services.audit_query import InvalidCursor, decode_cursor, encode_cursor
+from ..services.event_clone import build_clone_sql
+from ..services.event_query import (
+    EventFilter,
+    InvalidFields,
+    build_page_sql,
+    build_version_sql,
+    etag_matches,
+    parse_fields,
+    weak_etag,
+)
 
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-def _auth_dependency(authorization: Optional[str] = Header(None)) -> dict:
-    if not authorization or not authorization.lower().startswith("bearer "):
-        raise HTTPException(status_code=401, detail="Missing token")
-    token = authorization.split(" ", 1)[1]
-    payload = decode_jwt_token(token, settings.jwt_secret)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return payload
-
-
-def _table_has_column(conn, table_name: str, column_name: str) -> bool:
-    exists = conn.execute(
-        text(
-            "SELECT COUNT(1) FROM sys.columns "
-            "WHERE Name = :col AND Object_ID = Object_ID(:tbl)"
-        ),
-        {"col": column_name, "tbl": table_name},
-    ).scalar()
-    try:
-        return bool(int(exists or 0))
-    except Exception:
-        return False
-
-
 def _slugify(value: str) -> str:
     value = (value or "event").lower().strip()
     value = re.sub(r"[^a-z0-9\-\s]", "", value)
@@ -44,73 +34,183 @@ def _slugify(value: str) -> str:
     return value or "event"
 
 
-def _derive_org_id(conn, claims: dict) -> Optional[int]:
-    # docs/shards: 04-auth-rbac.md — org scoping; 02-data-schema.md — Event schema
-    org_id = claims.get("org_id")
-    if org_id:
-        return int(org_id)
-    # Fallback: if [User].OrganizationID exists, read it
-    user_id = claims.get("sub")
-    if user_id and _table_has_column(conn, "[User]", "OrganizationID"):
-        row = conn.execute(
-            text("SELECT OrganizationID FROM [User] WHERE UserID = :uid"),
-            {"uid": int(user_id)},
-        ).first()
-        if row and row[0] is not None:
-            return int(row[0])
-    # As a last resort, if a single Organization exists, use it
-    try:
-        row = conn.execute(text("SELECT TOP 1 OrganizationID FROM Organization ORDER BY OrganizationID"))
-        first = row.first()
-        if first and first[0] is not None:
-            return int(first[0])
-    except Exception:
-        pass
-    return None
-
-
-@router.get("")
-def list_events(claims: dict = Depends(_auth_dependency)):
-    with engine.begin() as conn:
-        org_id = _derive_org_id(conn, claims)
-        if not org_id:
-            raise HTTPException(status_code=400, detail="Organization context missing")
-        has_name = _table_has_column(conn, "[Event]", "Name")
-        has_event_name = _table_has_column(conn, "[Event]", "EventName")
-        has_status = _table_has_column(conn, "[Event]", "Status")
-        has_event_status = _table_has_column(conn, "[Event]", "EventStatus")
-        has_timezone = _table_has_column(conn, "[Event]", "Timezone")
-        has_deleted = _table_has_column(conn, "[Event]", "IsDeleted")
-
-        select_fields = ["EventID as id", "CreatedDate as created_date"]
-        if has_name:
-            select_fields.append("Name as name")
-        if has_event_name:
-            select_fields.append("EventName as name")
-        if has_status:
-            select_fields.append("Status as status")
-        if has_event_status:
-            select_fields.append("EventStatus as status")
-        if has_timezone:
-            select_fields.append("Timezone as timezone")
-
-        where_clause = "OrganizationID = :org"
-        if has_deleted:
-            where_clause += " AND (IsDeleted = 0 OR IsDeleted IS NULL)"
-
-        sql = f"SELECT {', '.join(select_fields)} FROM [Event] WHERE {where_clause} ORDER BY CreatedDate DESC"
-        rows = conn.execute(text(sql), {"org": org_id}).mappings().all()
-    return rows
-
-
-@router.post("")
-def create_event(payload: dict, claims: dict = Depends(_auth_dependency)):
-    # docs/shards: 02-data-schema.md — Event required fields; 04-auth-rbac.md — org scoping
-    now = datetime.utcnow()
+def _event_select_fields(cols: EventColumns) -> list[str]:
+    select_fields = ["EventID as id", "CreatedDate as created_date"]
+    if cols.name:
+        select_fields.append("Name as name")
+    if cols.event_name:
+        select_fields.append("EventName as name")
+    if cols.status:
+        select_fields.append("Status as status")
+    if cols.event_status:
+        select_fields.append("EventStatus as status")
+    if cols.timezone:
+        select_fields.append("Timezone as timezone")
+    return select_fields
+
+
+def _build_get_sql(cols: EventColumns) -> TextClause:
+    return text(
+        f"SELECT TOP 1 {', '.join(_event_select_fields(cols))} FROM [Event] "
+        "WHERE EventID = :id AND OrganizationID = :org"
+    )
+
+
+# Optional [Event] columns written on insert: (capability, column, value expression)
+_INSERT_COLUMNS = (
+    ("name", "Name", ":name"),
+    ("event_name", "EventName", ":event_name"),
+    ("status", "Status", ":status"),
+    ("event_status", "EventStatus", ":event_status"),
+    ("timezone", "Timezone", ":tz"),
+    ("event_type", "EventType", ":event_type"),
+    ("event_slug", "EventSlug", ":slug"),
+    ("start_date", "StartDate", ":start_dt"),
+    ("end_date", "EndDate", ":end_dt"),
+    ("is_public", "IsPublic", ":is_public"),
+    ("registration_enabled", "RegistrationEnabled", ":reg_enabled"),
+    ("is_deleted", "IsDeleted", "0"),
+)
+
+
+def _insert_columns(cols: EventColumns, with_created_by: bool) -> list[tuple[str, str]]:
+    """(column, value expression) pairs written by an insert on this schema."""
+    columns = [("OrganizationID", ":org")]
+    # Created timestamp column can vary by database; include only if present
+    if cols.created_col:
+        columns.append((cols.created_col, "GETUTCDATE()"))
+    for capability, column, value in _INSERT_COLUMNS:
+        if getattr(cols, capability):
+            columns.append((column, value))
+    if cols.created_by_user and with_created_by:
+        columns.append(("CreatedByUserID", ":created_by"))
+    return columns
+
+
+def _build_insert_sql(cols: EventColumns, with_created_by: bool) -> TextClause:
+    columns = _insert_columns(cols, with_created_by)
+    return text(
+        f"INSERT INTO [Event] ({', '.join(c for c, _ in columns)}) OUTPUT INSERTED.EventID "
+        f"VALUES ({', '.join(v for _, v in columns)})"
+    )
+
+
+# Binds shared by every row of a batch insert
+_BATCH_SHARED_BINDS = (":org", ":created_by")
+
+
+def _build_batch_insert_sql(cols: EventColumns, with_created_by: bool, rows: int) -> TextClause:
+    """Insert up to ``rows`` events in one statement, returning (rn, EventID) pairs.
+
+    A multi-row INSERT ... OUTPUT does not promise output order, so this is a
+    never-matching MERGE whose OUTPUT can name the source row number. Source
+    rows at or past ``:rows`` are padding and are filtered out before the MERGE.
+    """
+    columns = _insert_columns(cols, with_created_by)
+    per_row = [v[1:] for _, v in columns if v.startswith(":") and v not in _BATCH_SHARED_BINDS]
+    values = ", ".join(
+        "(" + ", ".join([str(i)] + [f":{b}_{i}" for b in per_row]) + ")" for i in range(rows)
+    )
+    insert_values = [
+        f"src.{v[1:]}" if v.startswith(":") and v not in _BATCH_SHARED_BINDS else v
+        for _, v in columns
+    ]
+    return text(
+        f"MERGE INTO [Event] USING (SELECT * FROM (VALUES {values}) AS v (rn, {', '.join(per_row)}) "
+        "WHERE v.rn < :rows) AS src ON 1 = 0 "
+        f"WHEN NOT MATCHED THEN INSERT ({', '.join(c for c, _ in columns)}) "
+        f"VALUES ({', '.join(insert_values)}) "
+        "OUTPUT src.rn, INSERTED.EventID;"
+    )
+
+
+def _build_update_sql(
+    cols: EventColumns, set_name: bool, set_status: bool, set_timezone: bool
+) -> Optional[TextClause]:
+    sets = []
+    if cols.name and set_name:
+        sets.append("Name = :name")
+    if cols.event_name and set_name:
+        sets.append("EventName = :event_name")
+    if cols.status and set_status:
+        sets.append("Status = :status")
+    if cols.event_status and set_status:
+        sets.append("EventStatus = :event_status")
+    if cols.timezone and set_timezone:
+        sets.append("Timezone = :tz")
+    if cols.last_updated:
+        sets.append("LastUpdated = GETUTCDATE()")
+    if not sets:
+        return None
+    return text(
+        f"UPDATE [Event] SET {', '.join(sets)} "
+        "WHERE EventID = :id AND OrganizationID = :org"
+    )
+
+
+def _build_batch_update_sql(
+    cols: EventColumns, set_name: bool, set_status: bool, set_timezone: bool, rows: int
+) -> Optional[TextClause]:
+    """One UPDATE ... FROM (VALUES ...) for ``rows`` events sharing a field set.
+
+    Padding rows carry a NULL id, which the join never matches.
+    """
+    source = ["id"]
+    sets = []
+    for enabled, values, targets in (
+        (set_name, "name", (("name", "Name"), ("event_name", "EventName"))),
+        (set_status, "status", (("status", "Status"), ("event_status", "EventStatus"))),
+        (set_timezone, "tz", (("timezone", "Timezone"),)),
+    ):
+        columns = [c for cap, c in targets if enabled and getattr(cols, cap)]
+        if columns:
+            source.append(values)
+            sets.extend(f"e.{c} = v.{values}" for c in columns)
+    if not sets:
+        return None
+    if cols.last_updated:
+        sets.append("e.LastUpdated = GETUTCDATE()")
+    values = ", ".join(
+        "(" + ", ".join(f":{b}_{i}" for b in source) + ")" for i in range(rows)
+    )
+    return text(
+        f"UPDATE e SET {', '.join(sets)} OUTPUT INSERTED.EventID "
+        f"FROM [Event] e JOIN (VALUES {values}) AS v ({', '.join(source)}) ON e.EventID = v.id "
+        "WHERE e.OrganizationID = :org"
+    )
+
+
+# Rows per batch statement: about 11 binds per created row keeps each chunk
+# well under SQL Server's 2100-parameter limit
+BATCH_CHUNK_ROWS = 100
+MAX_BATCH_ITEMS = 500
+# Chunks are padded up to one of these row counts, so each batch operation
+# keeps at most four statement shapes per variant in the registry
+BATCH_BUCKETS = (1, 10, 50, BATCH_CHUNK_ROWS)
+
+
+def _batch_items(payload: dict) -> list:
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="items must be a non-empty list")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ITEMS} items per batch")
+    return items
+
+
+def _chunks(seq: list, size: int = BATCH_CHUNK_ROWS):
+    for start in range(0, len(seq), size):
+        yield seq[start:start + size]
+
+
+def _bucket(n: int) -> int:
+    return next(b for b in BATCH_BUCKETS if b >= n)
+
+
+def _create_params(payload: dict, now: datetime) -> dict:
+    """Insert binds for one create payload, with the defaults the UI relies on."""
     name = payload.get("name") or payload.get("event_name") or "Untitled Event"
     status = payload.get("status") or payload.get("event_status") or "Draft"
-    ev_type = payload.get("type") or payload.get("event_type") or "General"
-    tz = payload.get("timezone") or "UTC"
     start_iso = payload.get("start_date")
     end_iso = payload.get("end_date")
     try:
@@ -121,119 +221,136 @@ def create_event(payload: dict, claims: dict = Depends(_auth_dependency)):
         end_dt = datetime.fromisoformat(end_iso) if end_iso else (now + timedelta(hours=1))
     except Exception:
         end_dt = now + timedelta(hours=1)
-    is_public = 1 if bool(payload.get("is_public", False)) else 0
-    registration_enabled = 1 if bool(payload.get("registration_enabled", False)) else 0
+    return {
+        "name": name,
+        "event_name": name,
+        "status": status,
+        "event_status": status,
+        "tz": payload.get("timezone") or "UTC",
+        "event_type": payload.get("type") or payload.get("event_type") or "General",
+        "slug": payload.get("slug") or _slugify(name),
+        "start_dt": start_dt,
+        "end_dt": end_dt,
+        "is_public": 1 if bool(payload.get("is_public", False)) else 0,
+        "reg_enabled": 1 if bool(payload.get("registration_enabled", False)) else 0,
+    }
+
+
+def _validate_create(cols: EventColumns, params: dict) -> Optional[str]:
+    if cols.start_date and cols.end_date and params["end_dt"] < params["start_dt"]:
+        return "EndDate must be after StartDate."
+    return None
+
+
+@router.get("")
+def list_events(
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None),
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = Query(None),
+    name_prefix: Optional[str] = Query(None, max_length=100),
+    fields: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    page_size: Optional[int] = Query(None, ge=1, le=500),
+    if_none_match: Optional[str] = Header(None),
+    org_id: Optional[int] = Depends(get_org_id),
+    conn: Connection = Depends(get_read_conn),
+):
+    """Newest first; the ``X-Next-Cursor`` header is passed back as ``cursor``.
+
+    Without ``cursor`` or ``page_size`` every event comes back in one
+    response, as before paging existed; either one turns paging on, with
+    ``page_size`` defaulting to 100.
+
+    ``fields`` is a comma-separated subset of name, status, timezone, type,
+    slug, start_date and end_date (``id`` and ``created_date`` always come
+    back). A matching ``If-None-Match`` gets ``304`` before any row is read.
+    """
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Organization context missing")
+    try:
+        selected = parse_fields(fields)
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {e}")
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    schema = schema_catalog.snapshot(conn)
+    cols = schema.event
+    version_stmt = statement_registry.get(
+        schema.fingerprint, "event.list.version", lambda: build_version_sql(cols)
+    )
+    version = conn.execute(version_stmt, {"org": org_id}).first()
+    etag = weak_etag(tuple(version), f"{org_id}?{request.url.query}")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    f = EventFilter.build(cols, org_id, status=status, from_=from_, to=to, name_prefix=name_prefix)
+    paged = cursor is not None or page_size is not None
+    stmt = statement_registry.get(
+        schema.fingerprint,
+        "event.list",
+        lambda: build_page_sql(cols, f, selected, after is not None, limited=paged),
+        variant=(selected, f.variant, after is not None, paged),
+    )
+    params = dict(f.params)
+    if paged:
+        page_size = page_size or 100
+        # One extra row tells us whether another page exists
+        params["limit"] = page_size + 1
+    if after is not None:
+        params["c_date"], params["c_id"] = after
+    rows = conn.execute(stmt, params).mappings().all()
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if not paged:
+        return rows
+    items = rows[:page_size]
+    if len(rows) > page_size:
+        last = items[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_date"], last["id"])
+    return items
+
+
+@router.post("")
+def create_event(
+    payload: dict,
+    claims: dict = Depends(auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
+):
+    # docs/shards: 02-data-schema.md — Event required fields; 04-auth-rbac.md — org scoping
     created_by = int(claims.get("sub")) if claims.get("sub") else None
-    slug = payload.get("slug") or _slugify(name)
+    params = _create_params(payload, datetime.utcnow())
+
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Organization context missing. Please ensure your user is linked to an organization or add one.")
 
     with engine.begin() as conn:
-        org_id = _derive_org_id(conn, claims)
-        if not org_id:
-            raise HTTPException(status_code=400, detail="Organization context missing. Please ensure your user is linked to an organization or add one.")
-
-        # Detect column names present in this DB
-        has_name = _table_has_column(conn, "[Event]", "Name")
-        has_status = _table_has_column(conn, "[Event]", "Status")
-        has_timezone = _table_has_column(conn, "[Event]", "Timezone")
-        has_deleted = _table_has_column(conn, "[Event]", "IsDeleted")
-        has_event_name = _table_has_column(conn, "[Event]", "EventName")
-        has_event_status = _table_has_column(conn, "[Event]", "EventStatus")
-        has_event_type = _table_has_column(conn, "[Event]", "EventType")
-        has_event_slug = _table_has_column(conn, "[Event]", "EventSlug")
-        has_start = _table_has_column(conn, "[Event]", "StartDate")
-        has_end = _table_has_column(conn, "[Event]", "EndDate")
-        has_is_public = _table_has_column(conn, "[Event]", "IsPublic")
-        has_reg_enabled = _table_has_column(conn, "[Event]", "RegistrationEnabled")
-        has_created_by = _table_has_column(conn, "[Event]", "CreatedByUserID")
-
-        columns = ["OrganizationID"]
-        values = [":org"]
-        params = {"org": org_id}
-
-        # Created timestamp column can vary by database; include only if present
-        created_columns_candidates = [
-            "CreatedDate",
-            "CreatedOn",
-            "CreatedAt",
-            "CreateDate",
-            "DateCreated",
-        ]
-        created_col = None
-        for col_name in created_columns_candidates:
-            if _table_has_column(conn, "[Event]", col_name):
-                created_col = col_name
-                break
-        if created_col:
-            columns.append(created_col)
-            values.append("GETUTCDATE()")
-
-        if has_name:
-            columns.append("Name")
-            values.append(":name")
-            params["name"] = name
-        if has_event_name:
-            columns.append("EventName")
-            values.append(":event_name")
-            params["event_name"] = name
-
-        if has_status:
-            columns.append("Status")
-            values.append(":status")
-            params["status"] = status
-        if has_event_status:
-            columns.append("EventStatus")
-            values.append(":event_status")
-            params["event_status"] = status
-
-        if has_timezone:
-            columns.append("Timezone")
-            values.append(":tz")
-            params["tz"] = tz
-
-        if has_event_type:
-            columns.append("EventType")
-            values.append(":event_type")
-            params["event_type"] = ev_type
-
-        if has_event_slug:
-            columns.append("EventSlug")
-            values.append(":slug")
-            params["slug"] = slug
-
-        if has_start:
-            columns.append("StartDate")
-            values.append(":start_dt")
-            params["start_dt"] = start_dt
-        if has_end:
-            columns.append("EndDate")
-            values.append(":end_dt")
-            params["end_dt"] = end_dt
-
-        if has_is_public:
-            columns.append("IsPublic")
-            values.append(":is_public")
-            params["is_public"] = is_public
-        if has_reg_enabled:
-            columns.append("RegistrationEnabled")
-            values.append(":reg_enabled")
-            params["reg_enabled"] = registration_enabled
-        if has_deleted:
-            columns.append("IsDeleted")
-            values.append("0")
-        if has_created_by and created_by:
-            columns.append("CreatedByUserID")
-            values.append(":created_by")
-            params["created_by"] = created_by
+        # Column names present in this DB (cached by the schema catalog)
+        schema = schema_catalog.snapshot(conn)
+        cols = schema.event
 
         # Validate minimum set
-        if ("Name" not in columns) and ("EventName" not in columns):
+        if not (cols.name or cols.event_name):
             raise HTTPException(status_code=500, detail="Event name column not found in schema.")
-        if has_start and has_end and end_dt < start_dt:
-            raise HTTPException(status_code=400, detail="EndDate must be after StartDate.")
-
-        sql = f"INSERT INTO [Event] ({', '.join(columns)}) OUTPUT INSERTED.EventID VALUES ({', '.join(values)})"
+        error = _validate_create(cols, params)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+
+        with_created_by = bool(created_by)
+        stmt = statement_registry.get(
+            schema.fingerprint,
+            "event.insert",
+            lambda: _build_insert_sql(cols, with_created_by),
+            variant=with_created_by,
+        )
+        # Binds not referenced by the statement are ignored
+        params.update(org=org_id, created_by=created_by)
         try:
-            row = conn.execute(text(sql), params).first()
+            row = conn.execute(stmt, params).first()
         except Exception as e:
             # Surface DB error for easier debugging in dev/UAT
             raise HTTPException(status_code=500, detail=f"Create failed: {str(e)}")
@@ -244,32 +361,150 @@ def create_event(payload: dict, claims: dict = Depends(_auth_dependency)):
     return {"id": new_id}
 
 
-@router.get("/{event_id}")
-def get_event(event_id: int, claims: dict = Depends(_auth_dependency)):
+@router.post(":batch")
+def create_events_batch(
+    payload: dict,
+    claims: dict = Depends(auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
+):
+    """Create up to 500 events: ``{"items": [<create payload>, ...]}``.
+
+    All items are validated before anything is written; any error rejects the
+    batch with per-item details. Otherwise the batch is inserted in chunks of
+    ``BATCH_CHUNK_ROWS`` inside one transaction and results keep input order.
+    """
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Organization context missing")
+    items = _batch_items(payload)
+    created_by = int(claims.get("sub")) if claims.get("sub") else None
+    with_created_by = bool(created_by)
+    now = datetime.utcnow()
+
     with engine.begin() as conn:
-        org_id = _derive_org_id(conn, claims)
-        if not org_id:
-            raise HTTPException(status_code=400, detail="Organization context missing")
-        has_name = _table_has_column(conn, "[Event]", "Name")
-        has_event_name = _table_has_column(conn, "[Event]", "EventName")
-        has_status = _table_has_column(conn, "[Event]", "Status")
-        has_event_status = _table_has_column(conn, "[Event]", "EventStatus")
-        has_timezone = _table_has_column(conn, "[Event]", "Timezone")
-
-        select_fields = ["EventID as id", "CreatedDate as created_date"]
-        if has_name:
-            select_fields.append("Name as name")
-        if has_event_name:
-            select_fields.append("EventName as name")
-        if has_status:
-            select_fields.append("Status as status")
-        if has_event_status:
-            select_fields.append("EventStatus as status")
-        if has_timezone:
-            select_fields.append("Timezone as timezone")
-
-        sql = f"SELECT TOP 1 {', '.join(select_fields)} FROM [Event] WHERE EventID = :id AND OrganizationID = :org"
-        row = conn.execute(text(sql), {"id": event_id, "org": org_id}).mappings().first()
+        schema = schema_catalog.snapshot(conn)
+        cols = schema.event
+        if not (cols.name or cols.event_name):
+            raise HTTPException(status_code=500, detail="Event name column not found in schema.")
+
+        rows, errors = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({"index": index, "error": "Item must be an object"})
+                continue
+            params = _create_params(item, now)
+            error = _validate_create(cols, params)
+            if error:
+                errors.append({"index": index, "error": error})
+            rows.append(params)
+        if errors:
+            raise HTTPException(status_code=422, detail=errors)
+
+        ids: dict[int, int] = {}
+        offset = 0
+        for chunk in _chunks(rows):
+            n, size = len(chunk), _bucket(len(chunk))
+            stmt = statement_registry.get(
+                schema.fingerprint,
+                "event.insert.batch",
+                lambda: _build_batch_insert_sql(cols, with_created_by, size),
+                variant=(with_created_by, size),
+            )
+            # Binds not referenced by the statement are ignored
+            params = {"org": org_id, "created_by": created_by, "rows": n}
+            for i, row in enumerate(chunk):
+                params.update({f"{k}_{i}": v for k, v in row.items()})
+            for i in range(n, size):
+                params.update({f"{k}_{i}": None for k in chunk[0]})
+            try:
+                for rn, event_id in conn.execute(stmt, params).all():
+                    ids[offset + int(rn)] = int(event_id)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Create failed: {str(e)}")
+            offset += n
+
+    if len(ids) != len(rows):
+        raise HTTPException(status_code=500, detail="Failed to create events")
+    return {"created": len(ids), "results": [{"index": i, "id": ids[i]} for i in range(len(rows))]}
+
+
+@router.patch(":batch")
+def update_events_batch(
+    payload: dict,
+    claims: dict = Depends(auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
+):
+    """Update up to 500 events: ``{"items": [{"id", "name"?, "status"?, "timezone"?}]}``.
+
+    Items are grouped by the fields they set, so each group is one UPDATE
+    joined to a VALUES list per chunk. Each result is ``updated`` or
+    ``not_found`` (missing, or in another organization).
+    """
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Organization context missing")
+    items = _batch_items(payload)
+
+    groups: dict[tuple, list] = {}
+    errors, seen = [], set()
+    for index, item in enumerate(items):
+        event_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(event_id, int) or isinstance(event_id, bool):
+            errors.append({"index": index, "error": "id must be an integer"})
+            continue
+        if event_id in seen:
+            errors.append({"index": index, "error": "Duplicate id"})
+            continue
+        seen.add(event_id)
+        variant = tuple(item.get(k) is not None for k in ("name", "status", "timezone"))
+        if not any(variant):
+            errors.append({"index": index, "error": "No updatable fields provided"})
+            continue
+        groups.setdefault(variant, []).append((index, item))
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    updated: set[int] = set()
+    with engine.begin() as conn:
+        schema = schema_catalog.snapshot(conn)
+        for variant, group in groups.items():
+            for chunk in _chunks(group):
+                size = _bucket(len(chunk))
+                stmt = statement_registry.get(
+                    schema.fingerprint,
+                    "event.update.batch",
+                    lambda: _build_batch_update_sql(schema.event, *variant, size),
+                    variant=(variant, size),
+                )
+                if stmt is None:
+                    raise HTTPException(status_code=400, detail="No updatable fields provided")
+                params = {"org": org_id}
+                padded = [item for _, item in chunk] + [{"id": None}] * (size - len(chunk))
+                for i, item in enumerate(padded):
+                    params.update(
+                        {f"id_{i}": item["id"], f"name_{i}": item.get("name"),
+                         f"status_{i}": item.get("status"), f"tz_{i}": item.get("timezone")}
+                    )
+                updated.update(int(r[0]) for r in conn.execute(stmt, params).all())
+
+    results = [
+        {"index": index, "id": item["id"], "status": "updated" if item["id"] in updated else "not_found"}
+        for index, item in enumerate(items)
+    ]
+    return {"updated": len(updated), "results": results}
+
+
+@router.get("/{event_id}")
+def get_event(
+    event_id: int,
+    org_id: Optional[int] = Depends(get_org_id),
+    conn: Connection = Depends(get_read_conn),
+):
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Organization context missing")
+    schema = schema_catalog.snapshot(conn)
+    stmt = statement_registry.get(
+        schema.fingerprint, "event.get", lambda: _build_get_sql(schema.event)
+    )
+    row = conn.execute(stmt, {"id": event_id, "org": org_id}).mappings().first()
     if not row:
         raise HTTPException(status_code=404, detail="Not found")
     return row
@@ -277,54 +512,48 @@ def get_event(event_id: int, claims: dict = Depends(_auth_dependency)):
 
 @router.put("/{event_id}")
 def update_event(
-    event_id: int, payload: dict, claims: dict = Depends(_auth_dependency)
+    event_id: int, payload: dict, org_id: Optional[int] = Depends(get_org_id)
 ):
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Organization context missing")
     with engine.begin() as conn:
-        org_id = _derive_org_id(conn, claims)
-        if not org_id:
-            raise HTTPException(status_code=400, detail="Organization context missing")
-        has_name = _table_has_column(conn, "[Event]", "Name")
-        has_event_name = _table_has_column(conn, "[Event]", "EventName")
-        has_status = _table_has_column(conn, "[Event]", "Status")
-        has_event_status = _table_has_column(conn, "[Event]", "EventStatus")
-        has_timezone = _table_has_column(conn, "[Event]", "Timezone")
-
-        sets = []
-        params = {"id": event_id, "org": org_id}
-        if has_name and payload.get("name") is not None:
-            sets.append("Name = :name")
-            params["name"] = payload.get("name")
-        if has_event_name and payload.get("name") is not None:
-            sets.append("EventName = :event_name")
-            params["event_name"] = payload.get("name")
-        if has_status and payload.get("status") is not None:
-            sets.append("Status = :status")
-            params["status"] = payload.get("status")
-        if has_event_status and payload.get("status") is not None:
-            sets.append("EventStatus = :event_status")
-            params["event_status"] = payload.get("status")
-        if has_timezone and payload.get("timezone") is not None:
-            sets.append("Timezone = :tz")
-            params["tz"] = payload.get("timezone")
-        if _table_has_column(conn, "[Event]", "LastUpdated"):
-            sets.append("LastUpdated = GETUTCDATE()")
-
-        if not sets:
+        schema = schema_catalog.snapshot(conn)
+
+        name = payload.get("name")
+        status = payload.get("status")
+        tz = payload.get("timezone")
+        variant = (name is not None, status is not None, tz is not None)
+        stmt = statement_registry.get(
+            schema.fingerprint,
+            "event.update",
+            lambda: _build_update_sql(schema.event, *variant),
+            variant=variant,
+        )
+        if stmt is None:
             raise HTTPException(status_code=400, detail="No updatable fields provided")
 
-        sql = f"UPDATE [Event] SET {', '.join(sets)} WHERE EventID = :id AND OrganizationID = :org"
-        result = conn.execute(text(sql), params)
+        params = {
+            "id": event_id,
+            "org": org_id,
+            "name": name,
+            "event_name": name,
+            "status": status,
+            "event_status": status,
+            "tz": tz,
+        }
+        result = conn.execute(stmt, params)
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Not found")
     return {"status": "ok"}
 
 @router.delete("/{event_id}")
 def soft_delete_event(
-    event_id: int, claims: dict = Depends(_auth_dependency)
+    event_id: int,
+    claims: dict = Depends(auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
 ):
     if claims.get("role") != "Admin":
         raise HTTPException(status_code=403, detail="Admin required")
-    org_id = claims.get("org_id")
     with engine.begin() as conn:
         result = conn.execute(
             text(
@@ -340,11 +569,12 @@ def soft_delete_event(
 
 @router.post("/{event_id}/restore")
 def restore_event(
-    event_id: int, claims: dict = Depends(_auth_dependency)
+    event_id: int,
+    claims: dict = Depends(auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
 ):
     if claims.get("role") != "Admin":
         raise HTTPException(status_code=403, detail="Admin required")
-    org_id = claims.get("org_id")
     with engine.begin() as conn:
         result = conn.execute(
             text(
@@ -357,3 +587,63 @@ def restore_event(
         raise HTTPException(status_code=404, detail="Not found")
     return {"status": "restored"}
 
+
+@router.post("/{event_id}/clone")
+def clone_event(
+    event_id: int,
+    payload: Optional[dict] = None,
+    claims: dict = Depends(auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
+):
+    """Deep-copy an event with its forms, canvas layouts and canvas objects.
+
+    Optional body: ``name`` (default "<name> (copy)") and ``shift_days`` to
+    move StartDate/EndDate, e.g. 364 for next year's show. The copy starts as
+    Draft and its forms get fresh public slugs; all of it is one transaction.
+    """
+    if not org_id:
+        raise HTTPException(status_code=400, detail="Organization context missing")
+    payload = payload or {}
+    try:
+        shift_days = int(payload.get("shift_days") or 0)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="shift_days must be an integer")
+    created_by = int(claims.get("sub")) if claims.get("sub") else None
+
+    with engine.begin() as conn:
+        schema = schema_catalog.snapshot(conn)
+        get_stmt = statement_registry.get(
+            schema.fingerprint, "event.get", lambda: _build_get_sql(schema.event)
+        )
+        source = conn.execute(get_stmt, {"id": event_id, "org": org_id}).mappings().first()
+        if not source:
+            raise HTTPException(status_code=404, detail="Not found")
+        stmt = statement_registry.get(
+            schema.fingerprint, "event.clone", lambda: build_clone_sql(schema)
+        )
+        if stmt is None:
+            raise HTTPException(status_code=500, detail="Event table not found in schema.")
+        name = payload.get("name") or f"{source.get('name') or 'Untitled Event'} (copy)"
+        params = {
+            "src": event_id,
+            "org": org_id,
+            "name": name,
+            "slug": _slugify(name),
+            "status": "Draft",
+            "shift_days": shift_days,
+            "by": f"user:{claims.get('sub')}",
+            "created_by": created_by,
+        }
+        try:
+            row = conn.execute(stmt, params).mappings().first()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Clone failed: {str(e)}")
+
+    if not row or row["event_id"] is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return {
+        "id": int(row["event_id"]),
+        "forms": int(row["forms"]),
+        "layouts": int(row["layouts"]),
+        "objects": int(row["objects"]),
+    }
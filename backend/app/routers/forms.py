@@ -1,40 +1,34 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Header
+
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
-from ..core.db import engine
-from ..core.settings import settings
-from ..utils.security import decode_jwt_token
+from ..core.auth import auth_dependency
+from ..core.db import engine, get_read_conn
+from ..core.org_context import get_org_id
 
 
 router = APIRouter(prefix="/events/{event_id}/forms", tags=["forms"])
 
 
-def _auth_dependency(authorization: Optional[str] = Header(None)) -> dict:
-    if not authorization or not authorization.lower().startswith("bearer "):
-        raise HTTPException(status_code=401, detail="Missing token")
-    token = authorization.split(" ", 1)[1]
-    payload = decode_jwt_token(token, settings.jwt_secret)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return payload
-
-
 @router.get("")
-def list_forms(event_id: int, claims: dict = Depends(_auth_dependency)):
-    org_id = claims.get("org_id")
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                "SELECT f.FormID as id, f.Name as name, f.Status as status, "
-                "f.PublicSlug as public_slug, f.CreatedDate as created_date "
-                "FROM Form f JOIN Event e ON e.EventID = f.EventID "
-                "WHERE f.EventID = :eid AND e.OrganizationID = :org AND "
-                "(f.IsDeleted = 0 OR f.IsDeleted IS NULL) "
-                "ORDER BY f.CreatedDate DESC"
-            ),
-            {"eid": event_id, "org": org_id},
-        ).mappings().all()
+def list_forms(
+    event_id: int,
+    org_id: Optional[int] = Depends(get_org_id),
+    conn: Connection = Depends(get_read_conn),
+):
+    rows = conn.execute(
+        text(
+            "SELECT f.FormID as id, f.Name as name, f.Status as status, "
+            "f.PublicSlug as public_slug, f.CreatedDate as created_date "
+            "FROM Form f JOIN Event e ON e.EventID = f.EventID "
+            "WHERE f.EventID = :eid AND e.OrganizationID = :org AND "
+            "(f.IsDeleted = 0 OR f.IsDeleted IS NULL) "
+            "ORDER BY f.CreatedDate DESC"
+        ),
+        {"eid": event_id, "org": org_id},
+    ).mappings().all()
     return rows
 
 
@@ -45,9 +39,8 @@ def _slugify(name: str) -> str:
 
 @router.post("")
 def create_form(
-    event_id: int, payload: dict, claims: dict = Depends(_auth_dependency)
+    event_id: int, payload: dict, org_id: Optional[int] = Depends(get_org_id)
 ):
-    org_id = claims.get("org_id")
     with engine.begin() as conn:
         # Validate event ownership
         evt = conn.execute(
@@ -92,18 +85,21 @@ def create_form(
 
 
 @router.get("/{form_id}")
-def get_form(event_id: int, form_id: int, claims: dict = Depends(_auth_dependency)):
-    org_id = claims.get("org_id")
-    with engine.begin() as conn:
-        row = conn.execute(
-            text(
-                "SELECT TOP 1 f.FormID as id, f.Name as name, f.Status as status, "
-                "f.PublicSlug as public_slug, f.CreatedDate as created_date "
-                "FROM Form f JOIN Event e ON e.EventID = f.EventID "
-                "WHERE f.FormID = :fid AND f.EventID = :eid AND e.OrganizationID = :org"
-            ),
-            {"fid": form_id, "eid": event_id, "org": org_id},
-        ).mappings().first()
+def get_form(
+    event_id: int,
+    form_id: int,
+    org_id: Optional[int] = Depends(get_org_id),
+    conn: Connection = Depends(get_read_conn),
+):
+    row = conn.execute(
+        text(
+            "SELECT TOP 1 f.FormID as id, f.Name as name, f.Status as status, "
+            "f.PublicSlug as public_slug, f.CreatedDate as created_date "
+            "FROM Form f JOIN Event e ON e.EventID = f.EventID "
+            "WHERE f.FormID = :fid AND f.EventID = :eid AND e.OrganizationID = :org"
+        ),
+        {"fid": form_id, "eid": event_id, "org": org_id},
+    ).mappings().first()
     if not row:
         raise HTTPException(status_code=404, detail="Not found")
     return row
@@ -111,9 +107,8 @@ def get_form(event_id: int, form_id: int, claims: dict = Depends(_auth_dependenc
 
 @router.put("/{form_id}")
 def update_form(
-    event_id: int, form_id: int, payload: dict, claims: dict = Depends(_auth_dependency)
+    event_id: int, form_id: int, payload: dict, org_id: Optional[int] = Depends(get_org_id)
 ):
-    org_id = claims.get("org_id")
     with engine.begin() as conn:
         result = conn.execute(
             text(
@@ -136,11 +131,13 @@ def update_form(
 
 @router.delete("/{form_id}")
 def soft_delete_form(
-    event_id: int, form_id: int, claims: dict = Depends(_auth_dependency)
+    event_id: int,
+    form_id: int,
+    claims: dict = Depends(auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
 ):
     if claims.get("role") != "Admin":
         raise HTTPException(status_code=403, detail="Admin required")
-    org_id = claims.get("org_id")
     with engine.begin() as conn:
         result = conn.execute(
             text(
@@ -162,11 +159,13 @@ def soft_delete_form(
 
 @router.post("/{form_id}/restore")
 def restore_form(
-    event_id: int, form_id: int, claims: dict = Depends(_auth_dependency)
+    event_id: int,
+    form_id: int,
+    claims: dict = Depends(auth_dependency),
+    org_id: Optional[int] = Depends(get_org_id),
 ):
     if claims.get("role") != "Admin":
         raise HTTPException(status_code=403, detail="Admin required")
-    org_id = claims.get("org_id")
     with engine.begin() as conn:
         result = conn.execute(
             text(
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-import secrets
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from pydantic import BaseModel, EmailStr, Field, constr
 from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
-from ..core.db import engine
+from ..core.auth import auth_dependency
+from ..core.db import after_commit, get_read_conn, get_uow, run_db, unit_of_work
+from ..core.org_context import org_context
 from ..core.settings import settings
-from ..services.emailer import send_email
+from ..services.email_outbox import enqueue_email
+from ..services.templating import email_templates
+from ..services.password_hasher import password_hasher
+from ..services.rate_limiter import invite_rule, rate_limiter
+from ..services import token_store
 from ..services.settings_service import settings_service
-from .auth import auth_dependency, get_role_id, write_auth_event
+from .auth import get_role_id, write_auth_event
 
 
 router = APIRouter(prefix="/invitations", tags=["invitations"])
@@ -45,21 +51,6 @@ def _now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _get_rate_limit_remaining_for_org(org_id: int) -> tuple[int, int]:
-    """Return (count_last_day, limit_per_day)."""
-    limit_per_day = settings_service.get_invite_daily_limit()
-    with engine.begin() as conn:
-        count_today = conn.execute(
-            text(
-                "SELECT COUNT(1) FROM Invitation WHERE OrganizationID = :oid "
-                "AND CreatedAt > DATEADD(day, -1, GETUTCDATE())"
-            ),
-            {"oid": org_id},
-        ).scalar()
-    count = int(count_today or 0)
-    return count, limit_per_day
-
-
 def _require_admin(claims: dict) -> None:
     role = (claims or {}).get("role")
     if role not in {"Admin", "SystemAdmin"}:
@@ -71,130 +62,105 @@ def create_invitation(
     payload: CreateInvitationRequest,
     request: Request,
     claims: dict = Depends(auth_dependency),
+    conn: Connection = Depends(get_uow),
 ):
     _require_admin(claims)
     org_id = claims.get("org_id")
     if not org_id:
         raise HTTPException(status_code=400, detail="Missing org context")
 
-    # Rate limit per org per day
-    used, limit = _get_rate_limit_remaining_for_org(int(org_id))
-    if used >= limit:
-        headers = {"Retry-After": "3600"}
-        raise HTTPException(status_code=429, detail="Invite rate limit reached", headers=headers)
-
     # TTL
     ttl_hours = settings_service.get_invite_token_ttl_hours()
     expires = _now().replace(tzinfo=None) + timedelta(hours=ttl_hours)
-    token = secrets.token_urlsafe(32)
 
-    role_id = get_role_id(payload.role) or get_role_id("User")
+    role_id = get_role_id(conn, payload.role) or get_role_id(conn, "User")
     if role_id is None:
         raise HTTPException(status_code=400, detail="Invalid role")
 
-    with engine.begin() as conn:
-        # Pre-create or update the user record so invited users belong to the organisation immediately
-        existing = conn.execute(
-            text("SELECT TOP 1 UserID, OrganizationID FROM [User] WHERE Email = :email ORDER BY UserID DESC"),
-            {"email": str(payload.email)},
-        ).first()
-        username = str(payload.email).split("@")[0]
-        first_name = payload.first_name.strip()
-        last_name = payload.last_name.strip()
-        if not existing:
-            conn.execute(
-                text(
-                    "INSERT INTO [User] (RoleID, OrganizationID, Username, FirstName, LastName, Email, PasswordHash, PasswordSalt, IsActive, EmailVerified, TwoFactorEnabled, CreatedDate, CreatedBy) "
-                    "VALUES (:rid, :oid, :uname, :fn, :ln, :email, '', '', 1, 0, 0, GETUTCDATE(), :created_by)"
-                ),
-                {
-                    "rid": role_id,
-                    "oid": int(org_id),
-                    "uname": username,
-                    "fn": first_name,
-                    "ln": last_name,
-                    "email": str(payload.email),
-                    "created_by": str(int(claims.get("sub"))),
-                },
-            )
-        else:
-            # Ensure org and role are set (do not overwrite names for existing accounts)
-            conn.execute(
-                text(
-                    "UPDATE [User] SET OrganizationID = COALESCE(OrganizationID, :oid), RoleID = :rid WHERE Email = :email"
-                ),
-                {"oid": int(org_id), "rid": role_id, "email": str(payload.email)},
-            )
-
+    # Pre-create or update the user record so invited users belong to the organisation immediately
+    existing = conn.execute(
+        text("SELECT TOP 1 UserID, OrganizationID FROM [User] WHERE Email = :email ORDER BY UserID DESC"),
+        {"email": str(payload.email)},
+    ).first()
+    username = str(payload.email).split("@")[0]
+    first_name = payload.first_name.strip()
+    last_name = payload.last_name.strip()
+    if not existing:
         conn.execute(
             text(
-                "INSERT INTO Invitation (OrganizationID, Email, Role, Token, ExpiresAt, ConsumedAt, CreatedBy, CreatedAt) "
-                "VALUES (:oid, :email, :role, :token, :exp, NULL, :uid, GETUTCDATE())"
+                "INSERT INTO [User] (RoleID, OrganizationID, Username, FirstName, LastName, Email, PasswordHash, PasswordSalt, IsActive, EmailVerified, TwoFactorEnabled, CreatedDate, CreatedBy) "
+                "VALUES (:rid, :oid, :uname, :fn, :ln, :email, '', '', 1, 0, 0, GETUTCDATE(), :created_by)"
             ),
             {
+                "rid": role_id,
                 "oid": int(org_id),
+                "uname": username,
+                "fn": first_name,
+                "ln": last_name,
                 "email": str(payload.email),
-                "role": payload.role,
-                "token": token,
-                "exp": expires,
-                "uid": int(claims.get("sub")),
+                "created_by": str(int(claims.get("sub"))),
             },
         )
-        row = conn.execute(
+    else:
+        # Ensure org and role are set (do not overwrite names for existing accounts)
+        conn.execute(
             text(
-                "SELECT TOP 1 InvitationID FROM Invitation WHERE OrganizationID=:oid AND Email=:email ORDER BY InvitationID DESC"
+                "UPDATE [User] SET OrganizationID = COALESCE(OrganizationID, :oid), RoleID = :rid WHERE Email = :email"
             ),
-            {"oid": int(org_id), "email": str(payload.email)},
-        ).first()
-        inv_id = int(row[0]) if row and row[0] else 0
+            {"oid": int(org_id), "rid": role_id, "email": str(payload.email)},
+        )
+        after_commit(conn, lambda: org_context.invalidate(existing[0]))
+
+    # Rate limit per org per day, counted once the invitation row is in; a
+    # denied hit rolls back the invitation and the user changes with it
+    rule = invite_rule()
+    token, inv_id = token_store.issue(
+        conn,
+        token_store.INVITATION,
+        {
+            "OrganizationID": int(org_id),
+            "Email": str(payload.email),
+            "Role": payload.role,
+            "CreatedBy": int(claims.get("sub")),
+        },
+        expires,
+    )
+    decision = rate_limiter.hit(rule, int(org_id), conn)
+    if not decision.allowed:
+        conn.rollback()
+        headers = {"Retry-After": str(decision.retry_after)}
+        raise HTTPException(status_code=429, detail="Invite rate limit reached", headers=headers)
+    inv_id = inv_id or 0
 
     # Send invitation email (plain + HTML)
     accept_url = f"http://localhost:3000/invite/accept?token={token}"
     inviter_name = ""  # best-effort fetch of inviter's display name
     try:
-        with engine.begin() as conn:
-            row_un = conn.execute(
-                text("SELECT TOP 1 COALESCE(FirstName+' '+LastName, Username, Email) FROM [User] WHERE UserID = :uid"),
-                {"uid": int(claims.get("sub"))},
-            ).first()
-            inviter_name = (row_un or [""])[0] or ""
+        row_un = conn.execute(
+            text("SELECT TOP 1 COALESCE(FirstName+' '+LastName, Username, Email) FROM [User] WHERE UserID = :uid"),
+            {"uid": int(claims.get("sub"))},
+        ).first()
+        inviter_name = (row_un or [""])[0] or ""
     except Exception:
         inviter_name = ""
-    ttl_hours = ttl_hours  # already computed
-    plain = (
-        f"{inviter_name or 'An Admin'} invited you to join Event Leads.\n\n"
-        f"Click the invitation link below to set your password and join: \n{accept_url}\n\n"
-        f"This invitation is valid for {ttl_hours} hours. If it expires, please ask {inviter_name or 'your admin'} to resend it."
+    mail = email_templates.render(
+        "invitation",
+        inviter_name=inviter_name or "An Admin",
+        inviter_contact=inviter_name or "your admin",
+        accept_url=accept_url,
+        ttl_hours=ttl_hours,
+    )
+    enqueue_email(
+        conn,
+        to=str(payload.email),
+        subject=mail.subject,
+        body=mail.body,
+        html_body=mail.html_body,
+        org_id=int(org_id),
     )
-    html = f"""
-    <html>
-      <body style=\"font-family:Segoe UI, Arial, sans-serif; color:#1f2937;\">
-        <h2 style=\"color:#111827;\">You're invited to Event Leads</h2>
-        <p>
-          <strong>{inviter_name or 'An Admin'}</strong> has invited you to join
-          <strong>Event Leads</strong> for their organisation.
-        </p>
-        <p>
-          When you click the button below, you'll be prompted to set your password before entering the site.
-        </p>
-        <p>
-          <a href=\"{accept_url}\" style=\"background:#2563eb;color:#fff;padding:10px 16px;text-decoration:none;border-radius:6px;display:inline-block;\">Accept Invitation</a>
-        </p>
-        <p style=\"margin-top:16px;\">
-          This invitation is valid for <strong>{ttl_hours} hours</strong>. If the link has expired, please reach out to {inviter_name or 'your admin'} to send a new invitation.
-        </p>
-        <hr style=\"margin:20px 0;border:none;border-top:1px solid #e5e7eb;\" />
-        <p style=\"font-size:12px;color:#6b7280;\">
-          If the button doesn't work, paste this link in your browser:<br/>
-          <span style=\"word-break:break-all;\">{accept_url}</span>
-        </p>
-      </body>
-    </html>
-    """
-    send_email(to=str(payload.email), subject="You're invited to Event Leads", body=plain, html_body=html)
 
     write_auth_event(
-        engine,
+        conn,
         event_type="invite_create",
         status="success",
         email=str(payload.email),
@@ -209,70 +175,70 @@ def create_invitation(
 
 
 @router.get("/{token}/preview", response_model=InvitationPreviewResponse)
-def preview_invitation(token: str):
-    with engine.begin() as conn:
-        inv = conn.execute(
-            text(
-                "SELECT TOP 1 OrganizationID, Email, CreatedBy FROM Invitation WHERE Token = :t ORDER BY InvitationID DESC"
-            ),
-            {"t": token},
-        ).mappings().first()
-        if not inv:
-            raise HTTPException(status_code=404, detail="Invalid token")
+def preview_invitation(token: str, conn: Connection = Depends(get_read_conn)):
+    inv = token_store.find(
+        conn, token_store.INVITATION, token, ("OrganizationID", "Email", "CreatedBy")
+    )
+    if not inv:
+        raise HTTPException(status_code=404, detail="Invalid token")
+    inviter_name = ""
+    try:
+        # CreatedBy may be user id or string; handle both
+        created_by = inv.get("CreatedBy")
+        if created_by is not None and str(created_by).isdigit():
+            row = conn.execute(
+                text(
+                    "SELECT TOP 1 COALESCE(FirstName+' '+LastName, Username, Email) FROM [User] WHERE UserID = :uid"
+                ),
+                {"uid": int(created_by)},
+            ).first()
+            inviter_name = (row or [""])[0] or ""
+    except Exception:
         inviter_name = ""
-        try:
-            # CreatedBy may be user id or string; handle both
-            created_by = inv.get("CreatedBy")
-            if created_by is not None and str(created_by).isdigit():
-                row = conn.execute(
-                    text(
-                        "SELECT TOP 1 COALESCE(FirstName+' '+LastName, Username, Email) FROM [User] WHERE UserID = :uid"
-                    ),
-                    {"uid": int(created_by)},
-                ).first()
-                inviter_name = (row or [""])[0] or ""
-        except Exception:
-            inviter_name = ""
     return InvitationPreviewResponse(email=inv["Email"], inviter_name=inviter_name or "Admin")
 
 
-@router.post("/{token}/accept", response_model=dict)
-def accept_invitation(token: str, payload: AcceptInvitationRequest, request: Request):
-    # Look up invitation
-    with engine.begin() as conn:
-        inv = conn.execute(
-            text(
-                "SELECT TOP 1 InvitationID, OrganizationID, Email, Role, ExpiresAt, ConsumedAt, CreatedBy "
-                "FROM Invitation WHERE Token = :t ORDER BY InvitationID DESC"
-            ),
-            {"t": token},
-        ).mappings().first()
+def _pending_invitation(token: str) -> dict:
+    """The unused, unexpired invitation for ``token``; 404/410 otherwise."""
+    with unit_of_work() as conn:
+        inv = token_store.find(
+            conn,
+            token_store.INVITATION,
+            token,
+            ("InvitationID", "OrganizationID", "Email", "Role", "CreatedBy"),
+        )
     if not inv:
         raise HTTPException(status_code=404, detail="Invalid token")
     if inv["ConsumedAt"] is not None or (
         inv["ExpiresAt"] and inv["ExpiresAt"] < _now().replace(tzinfo=None)
     ):
         raise HTTPException(status_code=410, detail="Token expired")
+    return dict(inv)
 
+
+def _accept(inv: dict, pwd_hash: str, salt: str, request: Request) -> None:
     # Create user if not exists, assign role, attach to org
-    from .auth import get_user_by_email, hash_password  # lazy import
+    from .auth import get_user_by_email  # lazy import
 
-    user = get_user_by_email(inv["Email"]) or {}
-    role_id = get_role_id(inv["Role"]) or get_role_id("User")
-    if role_id is None:
-        raise HTTPException(status_code=400, detail="Invalid invite role")
+    with unit_of_work() as conn:
+        user = get_user_by_email(conn, inv["Email"]) or {}
+        role_id = get_role_id(conn, inv["Role"]) or get_role_id(conn, "User")
+        if role_id is None:
+            raise HTTPException(status_code=400, detail="Invalid invite role")
+        # Claim the invitation before writing so concurrent accepts cannot both succeed
+        if not token_store.consume(conn, token_store.INVITATION, inv["TokenID"]):
+            raise HTTPException(status_code=410, detail="Token expired")
 
-    salt = ""
-    pwd_hash = hash_password(salt, payload.password)
-    username = inv["Email"].split("@")[0]
-    created_by = str(inv.get("CreatedBy") or "system")
+        username = inv["Email"].split("@")[0]
+        created_by = str(inv.get("CreatedBy") or "system")
 
-    with engine.begin() as conn:
         if not user:
             conn.execute(
                 text(
-                    "INSERT INTO [User] (RoleID, OrganizationID, Username, FirstName, LastName, Email, PasswordHash, PasswordSalt, IsActive, EmailVerified, TwoFactorEnabled, CreatedDate, CreatedBy) "
-                    "VALUES (:role_id, :oid, :username, :fn, :ln, :email, :pwd, :salt, 1, 1, 0, GETUTCDATE(), :created_by)"
+                    "INSERT INTO [User] (RoleID, OrganizationID, Username, FirstName, LastName, Email, "
+                    "PasswordHash, PasswordSalt, IsActive, EmailVerified, TwoFactorEnabled, CreatedDate, CreatedBy) "
+                    "VALUES (:role_id, :oid, :username, :fn, :ln, :email, :pwd, :salt, 1, 1, 0, "
+                    "GETUTCDATE(), :created_by)"
                 ),
                 {
                     "role_id": role_id,
@@ -290,7 +256,8 @@ def accept_invitation(token: str, payload: AcceptInvitationRequest, request: Req
             # Update existing user: set org and role; set password; mark verified & active
             conn.execute(
                 text(
-                    "UPDATE [User] SET OrganizationID=:oid, RoleID=:rid, PasswordHash=:pwd, PasswordSalt=:salt, EmailVerified=1, IsActive=1 WHERE Email=:email"
+                    "UPDATE [User] SET OrganizationID=:oid, RoleID=:rid, PasswordHash=:pwd, PasswordSalt=:salt, "
+                    "EmailVerified=1, IsActive=1 WHERE Email=:email"
                 ),
                 {
                     "oid": int(inv["OrganizationID"]),
@@ -300,19 +267,24 @@ def accept_invitation(token: str, payload: AcceptInvitationRequest, request: Req
                     "email": inv["Email"],
                 },
             )
-        # Consume invitation
-        conn.execute(
-            text("UPDATE Invitation SET ConsumedAt = GETUTCDATE() WHERE InvitationID = :id"),
-            {"id": int(inv["InvitationID"])},
+            # Invalidate once committed so a racing read cannot re-cache the old scope
+            after_commit(conn, lambda: org_context.invalidate(user.get("UserID")))
+        write_auth_event(
+            conn,
+            event_type="invite_accept",
+            status="success",
+            email=inv["Email"],
+            org_id=int(inv["OrganizationID"]),
+            request=request,
         )
 
-    write_auth_event(
-        engine,
-        event_type="invite_accept",
-        status="success",
-        email=inv["Email"],
-        org_id=int(inv["OrganizationID"]),
-        request=request,
-    )
+
+@router.post("/{token}/accept", response_model=dict)
+async def accept_invitation(token: str, payload: AcceptInvitationRequest, request: Request):
+    # Look up, hash, then write: bcrypt runs with no connection checked out
+    inv = await run_db(_pending_invitation, token)
+    salt = ""
+    pwd_hash = await password_hasher.hash(salt, payload.password)
+    await run_db(_accept, inv, pwd_hash, salt, request)
 
     return {"status": "accepted"}
@@ -9,9 +9,11 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, EmailStr, Field, constr
 from sqlalchemy import text
 
-from ..core.db import engine
+from ..core.auth import auth_dependency
+from ..core.db import run_in_transaction
+from ..core.org_context import org_context
 from ..schemas.organization import CreateOrganizationRequest, OrganizationResponse, OrganizationSummary
-from .auth import auth_dependency, get_role_id, write_auth_event
+from .auth import get_role_id, write_auth_event
 
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
@@ -64,25 +66,23 @@ async def create_organization(
     if not user_id or not user_email:
         raise HTTPException(status_code=401, detail="Invalid user session")
     
-    # Check if user already has an organization
-    with engine.begin() as conn:
+    # Generate unique organization code and slug
+    org_code = _generate_organization_code(request.name)
+    org_slug = _generate_organization_slug(request.name)
+
+    def _create(conn) -> int:
+        # Check if user already has an organization
         existing_org = conn.execute(
             text("SELECT OrganizationID FROM [User] WHERE UserID = :uid"),
             {"uid": user_id}
         ).fetchone()
-        
+
         if existing_org and existing_org[0]:
             raise HTTPException(
-                status_code=400, 
+                status_code=400,
                 detail="User already belongs to an organization. Only one organization per user is allowed."
             )
-    
-    # Generate unique organization code and slug
-    org_code = _generate_organization_code(request.name)
-    org_slug = _generate_organization_slug(request.name)
-    
-    # Create the organization
-    with engine.begin() as conn:
+
         # Insert organization
         result = conn.execute(
             text("""
@@ -109,12 +109,12 @@ async def create_organization(
                 "created_by": user_email
             }
         )
-        
+
         org_id = result.fetchone()[0]
-        
+
         # Get Admin role ID
         admin_role_id = get_role_id(conn, "Admin")
-        
+
         # Update user to be part of this organization with Admin role
         conn.execute(
             text("""
@@ -128,10 +128,10 @@ async def create_organization(
                 "user_id": user_id
             }
         )
-        
+
         # Log the organization creation event
         write_auth_event(
-            engine,
+            conn,
             event_type="organization_created",
             status="success",
             org_id=org_id,
@@ -140,7 +140,13 @@ async def create_organization(
             reason="Organization created via onboarding wizard",
             request=http_request
         )
-    
+        return org_id
+
+    # Runs on the DB worker threads so the event loop is never blocked
+    org_id = await run_in_transaction(_create)
+    # The creator moved organization and role; drop their cached tenant scope
+    org_context.invalidate(user_id)
+
     # Return organization summary (excluding sensitive billing info)
     return OrganizationSummary(
         id=org_id,
@@ -161,8 +167,8 @@ async def get_my_organization(
     if not user_id or not org_id:
         raise HTTPException(status_code=404, detail="No organization found for user")
     
-    with engine.begin() as conn:
-        org = conn.execute(
+    def _load(conn):
+        return conn.execute(
             text("""
                 SELECT OrganizationID, OrganizationName, OrganizationCode, IsActive,
                        CreatedDate, CreatedBy, OrganizationSlug, OrganizationEmail,
@@ -173,29 +179,27 @@ async def get_my_organization(
             """),
             {"org_id": org_id}
         ).fetchone()
-        
-        if not org:
-            raise HTTPException(status_code=404, detail="Organization not found")
-        
-        return OrganizationResponse(
-            id=org[0],
-            name=org[1],
-            code=org[2],
-            is_active=org[3] != 0,  # Convert BIT to boolean
-            created_at=org[4],
-            created_by=org[5],
-            slug=org[6],
-            email=org[7],
-            phone=org[8],
-            billing_address=org[9],
-            billing_email=org[10],
-            timezone=org[11],
-            subscription_tier=org[12],
-            subscription_status=org[13],
-            max_users=org[14],
-            max_events=org[15]
-        )
-
-
-
 
+    org = await run_in_transaction(_load)
+
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    return OrganizationResponse(
+        id=org[0],
+        name=org[1],
+        code=org[2],
+        is_active=org[3] != 0,  # Convert BIT to boolean
+        created_at=org[4],
+        created_by=org[5],
+        slug=org[6],
+        email=org[7],
+        phone=org[8],
+        billing_address=org[9],
+        billing_email=org[10],
+        timezone=org[11],
+        subscription_tier=org[12],
+        subscription_status=org[13],
+        max_users=org[14],
+        max_events=org[15]
+    )
@@ -0,0 +1,240 @@
+"""Monthly retention and archiving for AuthEvent.
+
+On SQL Server, AuthEvent is partitioned by calendar month on CreatedDate
+(migration a022), so ``from``/``to`` filters in the audit endpoints only read
+the partitions they cover. Months older than the retention configured in
+GlobalSetting (``auth_event_retention_months``) are exported to gzipped
+NDJSON files and then removed: the partition is truncated and its boundary
+merged away when the table is partitioned, or rows are deleted by range in
+small batches otherwise. The archiver also keeps empty partitions a few
+months ahead of the clock.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from app.core.db import engine
+from app.core.settings import settings
+from app.services.periodic import PeriodicWorker
+from app.services.settings_service import settings_service
+
+
+logger = logging.getLogger(__name__)
+
+PARTITION_FUNCTION = "PF_AuthEvent_Month"
+PARTITION_SCHEME = "PS_AuthEvent_Month"
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def cold_months(oldest: Optional[datetime], now: datetime, retention_months: int) -> List[datetime]:
+    """Month starts, oldest first, of every month entirely outside retention.
+
+    The current month always counts as the first retained month.
+    """
+    if oldest is None:
+        return []
+    cutoff = add_months(month_start(now), -max(retention_months - 1, 0))
+    months = []
+    month = month_start(oldest)
+    while month < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def _literal(value: datetime) -> str:
+    # Only ever called with month starts computed here, never request input
+    return f"'{value:%Y-%m-%dT%H:%M:%S}'"
+
+
+class AuthEventArchiver(PeriodicWorker):
+    """Background thread that applies AuthEvent retention once per interval."""
+
+    thread_name = "auth-event-archiver"
+
+    def __init__(
+        self,
+        bind=engine,
+        archive_dir: str = "archive/auth_events",
+        interval_seconds: float = 86400.0,
+        months_ahead: int = 3,
+        batch_size: int = 5000,
+    ) -> None:
+        super().__init__(interval_seconds)
+        self._bind = bind
+        self._archive_dir = Path(archive_dir)
+        self._months_ahead = months_ahead
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._counters = {"runs": 0, "months_archived": 0, "rows_archived": 0, "bytes_written": 0, "errors": 0}
+        self._last_run: Dict[str, object] = {}
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._counters,
+                "last_run": dict(self._last_run),
+                "archive_dir": str(self._archive_dir),
+                "running": self.running,
+            }
+
+    # -- partitions -------------------------------------------------------
+
+    def partitioned(self, conn) -> bool:
+        if conn.dialect.name != "mssql":
+            return False
+        return conn.execute(
+            text("SELECT 1 FROM sys.partition_functions WHERE name = :n"), {"n": PARTITION_FUNCTION}
+        ).first() is not None
+
+    def _boundaries(self, conn) -> List[datetime]:
+        rows = conn.execute(
+            text(
+                "SELECT CAST(prv.value AS datetime) FROM sys.partition_range_values prv "
+                "JOIN sys.partition_functions pf ON pf.function_id = prv.function_id "
+                "WHERE pf.name = :n ORDER BY prv.boundary_id"
+            ),
+            {"n": PARTITION_FUNCTION},
+        ).scalars().all()
+        return list(rows)
+
+    def ensure_future_partitions(self, conn, now: datetime) -> int:
+        """Split empty months ahead of ``now``; returns how many were added."""
+        boundaries = self._boundaries(conn)
+        last = boundaries[-1] if boundaries else add_months(month_start(now), -1)
+        target = add_months(month_start(now), self._months_ahead)
+        added = 0
+        while last < target:
+            last = add_months(last, 1)
+            conn.execute(text(f"ALTER PARTITION SCHEME {PARTITION_SCHEME} NEXT USED [PRIMARY]"))
+            conn.execute(text(f"ALTER PARTITION FUNCTION {PARTITION_FUNCTION}() SPLIT RANGE ({_literal(last)})"))
+            added += 1
+        return added
+
+    # -- archive ----------------------------------------------------------
+
+    def export_month(self, start: datetime, end: datetime) -> tuple[Path, int, int]:
+        """Write [start, end) to a new gzipped NDJSON file; returns (path, rows, bytes)."""
+        self._archive_dir.mkdir(parents=True, exist_ok=True)
+        # Stamped per run so a retry after a partial purge never overwrites
+        # an earlier, more complete export of the same month
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        path = self._archive_dir / f"AuthEvent-{start:%Y-%m}-{stamp}.ndjson.gz"
+        tmp = path.with_suffix(".tmp")
+        count = 0
+        with self._bind.connect() as conn, gzip.open(tmp, "wt", encoding="utf-8") as fh:
+            result = conn.execution_options(stream_results=True).execute(
+                text(
+                    "SELECT * FROM AuthEvent WHERE CreatedDate >= :start AND CreatedDate < :end "
+                    "ORDER BY CreatedDate, AuthEventID"
+                ),
+                {"start": start, "end": end},
+            ).mappings()
+            for row in result:
+                fh.write(json.dumps(dict(row), default=str))
+                fh.write("\n")
+                count += 1
+        if count == 0:
+            tmp.unlink()
+            return path, 0, 0
+        os.replace(tmp, path)
+        return path, count, path.stat().st_size
+
+    def _truncate_partition(self, start: datetime, exported: int) -> bool:
+        """Drop the month's partition if it holds exactly the exported rows."""
+        count_sql = text(
+            f"SELECT COUNT_BIG(*) FROM AuthEvent WHERE $PARTITION.{PARTITION_FUNCTION}(CreatedDate) = :p"
+        )
+        with self._bind.begin() as conn:
+            number = int(conn.execute(text(f"SELECT $PARTITION.{PARTITION_FUNCTION}(:d)"), {"d": start}).scalar())
+            if int(conn.execute(count_sql, {"p": number}).scalar()) != exported:
+                # Partition spans more than this month (e.g. pre-migration rows)
+                return False
+            conn.execute(text(f"TRUNCATE TABLE AuthEvent WITH (PARTITIONS ({number}))"))
+            older_empty = number > 1 and int(conn.execute(count_sql, {"p": number - 1}).scalar()) == 0
+            if older_empty and start in self._boundaries(conn):
+                # Both sides are empty, so removing the boundary is metadata-only
+                conn.execute(text(f"ALTER PARTITION FUNCTION {PARTITION_FUNCTION}() MERGE RANGE ({_literal(start)})"))
+        return True
+
+    def _delete_range(self, start: datetime, end: datetime) -> None:
+        while not self._stopping.is_set():
+            with self._bind.begin() as conn:
+                deleted = conn.execute(
+                    text(
+                        "DELETE TOP (:n) FROM AuthEvent WHERE CreatedDate >= :start AND CreatedDate < :end"
+                    ),
+                    {"n": self._batch_size, "start": start, "end": end},
+                ).rowcount
+            if (deleted or 0) < self._batch_size:
+                break
+
+    def archive_month(self, start: datetime, partitioned: bool) -> int:
+        end = add_months(start, 1)
+        path, count, size = self.export_month(start, end)
+        if count and not (partitioned and self._truncate_partition(start, count)):
+            self._delete_range(start, end)
+        if count:
+            logger.info("Archived %s AuthEvent rows for %s to %s", count, f"{start:%Y-%m}", path)
+        with self._lock:
+            self._counters["months_archived"] += 1
+            self._counters["rows_archived"] += count
+            self._counters["bytes_written"] += size
+        return count
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Archive every month past retention; returns rows archived per month."""
+        now = now or datetime.utcnow()
+        start = time.perf_counter()
+        result: Dict[str, int] = {}
+        try:
+            retention = settings_service.get_auth_event_retention_months()
+            with self._bind.begin() as conn:
+                partitioned = self.partitioned(conn)
+                if partitioned:
+                    self.ensure_future_partitions(conn, now)
+                oldest = conn.execute(text("SELECT MIN(CreatedDate) FROM AuthEvent")).scalar()
+            for month in cold_months(oldest, now, retention):
+                if self._stopping.is_set():
+                    break
+                result[f"{month:%Y-%m}"] = self.archive_month(month, partitioned)
+        except Exception:
+            logger.exception("AuthEvent archive run failed")
+            with self._lock:
+                self._counters["errors"] += 1
+        with self._lock:
+            self._counters["runs"] += 1
+            self._last_run = {
+                "at": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "months": result,
+                "seconds": round(time.perf_counter() - start, 3),
+            }
+        return result
+
+    def tick(self) -> bool:
+        self.run_once()
+        return False
+
+
+# Singleton-like instance for app-wide use
+auth_event_archiver = AuthEventArchiver(
+    archive_dir=settings.auth_event_archive_dir,
+    interval_seconds=settings.auth_event_archive_interval_seconds,
+)
@@ -0,0 +1,223 @@
+"""Filters, keyset cursors and totals for AuthEvent queries.
+
+Pages are read newest first on ``(CreatedDate, AuthEventID)``, the table's
+clustered key. A cursor carries the last row's key, so every page is a TOP (n)
+seek and a deep page costs the same as the first one.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.services.audit_archive import PARTITION_FUNCTION
+
+
+logger = logging.getLogger(__name__)
+
+AUTH_EVENT_COLUMNS = (
+    "AuthEventID",
+    "OrganizationID",
+    "UserID",
+    "Email",
+    "EventType",
+    "Status",
+    "ReasonCode",
+    "RequestID",
+    "IP",
+    "UserAgent",
+    "CreatedDate",
+)
+
+# Params that narrow rows by something other than the partition column
+_ROW_FILTERS = ("email", "event", "status", "reason", "user_id", "org")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class AuthEventFilter:
+    """WHERE clause and binds shared by the list and export endpoints."""
+
+    clauses: list = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        email: Optional[str] = None,
+        event: Optional[str] = None,
+        status: Optional[str] = None,
+        reason: Optional[str] = None,
+        user_id: Optional[int] = None,
+        org_id: Optional[int] = None,
+        from_: Optional[datetime] = None,
+        to: Optional[datetime] = None,
+    ) -> "AuthEventFilter":
+        f = cls()
+        for column, key, value in (
+            ("Email", "email", email),
+            ("EventType", "event", event),
+            ("Status", "status", status),
+            ("ReasonCode", "reason", reason),
+            ("UserID", "user_id", user_id),
+            ("OrganizationID", "org", org_id),
+        ):
+            if value:
+                f.clauses.append(f"{column} = :{key}")
+                f.params[key] = value
+        if from_:
+            f.clauses.append("CreatedDate >= :from")
+            f.params["from"] = from_
+        if to:
+            f.clauses.append("CreatedDate <= :to")
+            f.params["to"] = to
+        return f
+
+    @property
+    def where(self) -> str:
+        return " AND ".join(self.clauses) or "1=1"
+
+    @property
+    def date_only(self) -> bool:
+        return not any(k in self.params for k in _ROW_FILTERS)
+
+    def cache_key(self) -> Tuple:
+        return (self.where, tuple(sorted((k, str(v)) for k, v in self.params.items())))
+
+
+def encode_cursor(created: datetime, event_id: int) -> str:
+    raw = json.dumps([created.isoformat(), int(event_id)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created, event_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created), int(event_id)
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise InvalidCursor(str(e)) from None
+
+
+def page_query(f: AuthEventFilter, after: Optional[Tuple[datetime, int]], limit: int):
+    """TOP (limit) rows of ``f`` strictly older than the ``after`` key."""
+    clauses = [f.where]
+    params = dict(f.params, limit=limit)
+    if after is not None:
+        # CAST keeps the comparison in datetime; datetime2 binds round
+        # differently and would skip or repeat rows at the boundary
+        clauses.append(
+            "(CreatedDate < CAST(:c_date AS datetime) "
+            "OR (CreatedDate = CAST(:c_date AS datetime) AND AuthEventID < :c_id))"
+        )
+        params["c_date"], params["c_id"] = after
+    sql = text(
+        f"SELECT TOP (:limit) {', '.join(AUTH_EVENT_COLUMNS)} FROM AuthEvent "
+        f"WHERE {' AND '.join(clauses)} ORDER BY CreatedDate DESC, AuthEventID DESC"
+    )
+    return sql, params
+
+
+def export_query(f: AuthEventFilter):
+    """All rows of ``f`` in chronological order (clustered key order)."""
+    return text(
+        f"SELECT {', '.join(AUTH_EVENT_COLUMNS)} FROM AuthEvent WHERE {f.where} "
+        "ORDER BY CreatedDate, AuthEventID"
+    ), dict(f.params)
+
+
+class AuthEventCounter:
+    """Totals for audit listings without a COUNT on every page.
+
+    ``exact`` counts now; ``estimate`` serves a cached count for the same
+    filters (up to ``ttl_seconds`` old) or, for date-only filters on a
+    partitioned table, sums partition row counts from metadata. On a cache
+    miss ``estimate`` returns None and counts on a background thread, so a
+    listing never waits on a full COUNT it did not ask for.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 256) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple, Tuple[int, float]]" = OrderedDict()
+        # Filters with a background count in flight, so a miss starts one at most
+        self._refreshing: set = set()
+
+    def exact(self, conn, f: AuthEventFilter) -> int:
+        total = int(conn.execute(text(f"SELECT COUNT(1) FROM AuthEvent WHERE {f.where}"), f.params).scalar() or 0)
+        with self._lock:
+            self._cache[f.cache_key()] = (total, time.monotonic() + self._ttl_seconds)
+            self._cache.move_to_end(f.cache_key())
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+        return total
+
+    def estimate(self, conn, f: AuthEventFilter) -> Optional[int]:
+        if f.date_only:
+            from_partitions = self._from_partitions(conn, f)
+            if from_partitions is not None:
+                return from_partitions
+        key = f.cache_key()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                return entry[0]
+            if key in self._refreshing:
+                return None
+            self._refreshing.add(key)
+        threading.Thread(
+            target=self._refresh, args=(conn.engine, f, key), name="auth-event-count", daemon=True
+        ).start()
+        return None
+
+    def _refresh(self, bind, f: AuthEventFilter, key: Tuple) -> None:
+        try:
+            with bind.connect() as conn:
+                self.exact(conn, f)
+        except Exception:
+            logger.exception("Background AuthEvent count failed")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _from_partitions(self, conn, f: AuthEventFilter) -> Optional[int]:
+        if conn.dialect.name != "mssql":
+            return None
+        bounds = ["p.object_id = OBJECT_ID('AuthEvent')", "p.index_id IN (0, 1)"]
+        params: Dict[str, Any] = {"pf": PARTITION_FUNCTION}
+        if "from" in f.params or "to" in f.params:
+            if conn.execute(
+                text("SELECT 1 FROM sys.partition_functions WHERE name = :pf"), params
+            ).first() is None:
+                return None
+            if "from" in f.params:
+                bounds.append(f"p.partition_number >= $PARTITION.{PARTITION_FUNCTION}(:from)")
+                params["from"] = f.params["from"]
+            if "to" in f.params:
+                bounds.append(f"p.partition_number <= $PARTITION.{PARTITION_FUNCTION}(:to)")
+                params["to"] = f.params["to"]
+        total = conn.execute(
+            text(f"SELECT SUM(p.rows) FROM sys.partitions p WHERE {' AND '.join(bounds)}"), params
+        ).scalar()
+        return int(total or 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+# Singleton-like instance for app-wide use
+auth_event_counter = AuthEventCounter()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import text
+from app.core.db import engine
+from app.core.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+INSERT_AUTH_EVENT = text(
+    "INSERT INTO AuthEvent (OrganizationID, UserID, Email, EventType, Status, "
+    "ReasonCode, RequestID, IP, UserAgent, CreatedDate) "
+    "VALUES (:org_id, :user_id, :email, :event_type, :status, :reason, "
+    ":req_id, :ip, :ua, :created)"
+)
+
+# What to do when the queue is full
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_INLINE = "inline"  # write synchronously on the caller's thread
+
+
+class AuthEventWriter:
+    """In-process pipeline that batches AuthEvent inserts off the request path.
+
+    Requests append rows to a bounded queue; a background thread flushes them
+    with a single executemany when ``batch_size`` rows are waiting or every
+    ``flush_interval`` seconds, whichever comes first. A failed batch is
+    retried ``max_retries`` times with doubling backoff and then written row
+    by row, so one bad row or a short outage costs no more than the rows that
+    really cannot be written. ``stop()`` drains what is left, and is wired to
+    the FastAPI lifespan shutdown.
+    """
+
+    def __init__(
+        self,
+        bind=engine,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        overflow: str = OVERFLOW_DROP_NEWEST,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ) -> None:
+        self._bind = bind
+        self._max_queue = max_queue
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow = overflow
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._queue: Deque[Dict[str, object]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._counters = {"queued": 0, "dropped": 0, "flushed": 0, "failed": 0, "batches": 0, "retries": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._cond:
+            if self.running:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="auth-event-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher after draining everything queued so far."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, row: Dict[str, object]) -> bool:
+        """Queue one AuthEvent row; returns False if it was dropped."""
+        row.setdefault("created", datetime.now(timezone.utc).replace(tzinfo=None))
+        with self._cond:
+            if len(self._queue) >= self._max_queue:
+                if self._overflow == OVERFLOW_DROP_OLDEST:
+                    self._queue.popleft()
+                    self._counters["dropped"] += 1
+                elif self._overflow == OVERFLOW_INLINE:
+                    pass  # fall through to the synchronous write below
+                else:
+                    self._counters["dropped"] += 1
+                    return False
+            if len(self._queue) < self._max_queue:
+                self._queue.append(row)
+                self._counters["queued"] += 1
+                if len(self._queue) >= self._batch_size:
+                    self._cond.notify()
+                return True
+        # Inline writes happen on a request thread: no backoff sleeps there
+        self._flush([row], retries=0)
+        return True
+
+    def flush(self) -> None:
+        """Write everything currently queued on the caller's thread."""
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            self._flush(batch)
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            return {
+                **self._counters,
+                "queue_depth": len(self._queue),
+                "max_queue": self._max_queue,
+                "overflow": self._overflow,
+                "running": self.running,
+            }
+
+    def _take_batch(self) -> List[Dict[str, object]]:
+        with self._cond:
+            n = min(self._batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(n)]
+
+    def _insert(self, rows: List[Dict[str, object]]) -> None:
+        with self._bind.begin() as conn:
+            # A list of parameter sets makes SQLAlchemy use executemany
+            conn.execute(INSERT_AUTH_EVENT, rows)
+
+    def _flush(self, batch: List[Dict[str, object]], retries: Optional[int] = None) -> None:
+        retries = self._max_retries if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                self._insert(batch)
+            except Exception:
+                if attempt == retries:
+                    logger.exception("AuthEvent batch insert failed (%d rows); writing row by row", len(batch))
+                    break
+                with self._cond:
+                    self._counters["retries"] += 1
+                time.sleep(self._retry_backoff * (2 ** attempt))
+            else:
+                with self._cond:
+                    self._counters["flushed"] += len(batch)
+                    self._counters["batches"] += 1
+                return
+        # Isolate the rows that cannot be written from the ones that can
+        written = 0
+        for row in batch:
+            try:
+                self._insert([row])
+                written += 1
+            except Exception:
+                logger.warning("AuthEvent insert dropped: %s", row.get("event_type"), exc_info=True)
+        with self._cond:
+            self._counters["flushed"] += written
+            self._counters["failed"] += len(batch) - written
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self._flush_interval
+                while (
+                    not self._stopping
+                    and len(self._queue) < self._batch_size
+                    and time.monotonic() < deadline
+                ):
+                    self._cond.wait(max(deadline - time.monotonic(), 0))
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+
+# Singleton-like instance for app-wide use
+auth_event_writer = AuthEventWriter(
+    max_queue=settings.audit_queue_max,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+    overflow=settings.audit_queue_overflow,
+    max_retries=settings.audit_flush_retries,
+    retry_backoff=settings.audit_retry_backoff_seconds,
+)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import logging
+import smtplib
+import threading
+import uuid
+from typing import Dict, Mapping, Optional, Sequence
+
+from sqlalchemy import text
+from app.core.db import engine
+from app.core.schema_catalog import schema_catalog
+from app.core.settings import settings
+from app.services.emailer import (
+    build_message,
+    print_fallback,
+    send_email,
+    smtp_config,
+    smtp_pool,
+)
+from app.services.periodic import PeriodicWorker
+
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+
+_INSERT_OUTBOX = text(
+    "INSERT INTO EmailOutbox (ToAddress, Subject, BodyText, BodyHtml, OrganizationID, "
+    "Status, Attempts, NextAttemptAt, CreatedAt) "
+    "VALUES (:to, :subject, :body, :html, :org_id, 'pending', 0, GETUTCDATE(), GETUTCDATE())"
+)
+
+# Claimed rows are leased, not locked: if a dispatcher dies mid-batch the rows
+# become due again when the lease runs out. READPAST lets several nodes claim
+# disjoint batches concurrently. Each claim stamps a fresh ClaimToken, and every
+# later update is conditional on it, so a dispatcher whose lease expired and was
+# re-claimed elsewhere cannot overwrite the new owner's outcome.
+_CLAIM_BATCH = text(
+    "UPDATE TOP (:n) o SET NextAttemptAt = DATEADD(second, :lease, GETUTCDATE()), "
+    "Attempts = Attempts + 1, ClaimToken = :claim "
+    "OUTPUT INSERTED.OutboxID, INSERTED.ToAddress, INSERTED.Subject, INSERTED.BodyText, "
+    "INSERTED.BodyHtml, INSERTED.Attempts "
+    "FROM EmailOutbox o WITH (READPAST, UPDLOCK, ROWLOCK) "
+    "WHERE o.Status = 'pending' AND o.NextAttemptAt <= GETUTCDATE()"
+)
+
+_OWNED = "WHERE OutboxID = :id AND ClaimToken = :claim AND Status = 'pending'"
+_MARK_SENT = text(
+    "UPDATE EmailOutbox SET Status = 'sent', SentAt = GETUTCDATE(), LastError = NULL " + _OWNED
+)
+_MARK_RETRY = text(
+    "UPDATE EmailOutbox SET NextAttemptAt = DATEADD(second, :delay, GETUTCDATE()), "
+    "LastError = :error " + _OWNED
+)
+_MARK_DEAD = text(
+    "UPDATE EmailOutbox SET Status = 'dead', LastError = :error " + _OWNED
+)
+# Claimed but never tried because the connection went away: not an attempt
+_RELEASE = text(
+    "UPDATE EmailOutbox SET NextAttemptAt = DATEADD(second, :delay, GETUTCDATE()), "
+    "Attempts = Attempts - 1 " + _OWNED
+)
+
+
+def _is_connection_error(exc: Exception) -> bool:
+    """The server or network is gone, so every later send in the batch would fail too.
+
+    SMTP replies are OSError subclasses as well; only socket-level errors and
+    lost or refused connections count.
+    """
+    if isinstance(exc, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+def enqueue_email(
+    conn,
+    to: str,
+    subject: str,
+    body: str,
+    html_body: Optional[str] = None,
+    org_id: Optional[int] = None,
+) -> None:
+    """Queue an email in the caller's transaction; it is sent after commit.
+
+    Databases that have not run the outbox migration yet send inline as before.
+    """
+    if not schema_catalog.snapshot(conn).has_table("EmailOutbox"):
+        send_email(to=to, subject=subject, body=body, html_body=html_body)
+        return
+    conn.execute(
+        _INSERT_OUTBOX,
+        {"to": to, "subject": subject, "body": body, "html": html_body, "org_id": org_id},
+    )
+
+
+def _is_permanent(exc: Exception) -> bool:
+    """5xx replies and refused recipients/senders will not succeed on retry."""
+    if isinstance(exc, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)):
+        return True
+    code = getattr(exc, "smtp_code", None)
+    return isinstance(code, int) and 500 <= code < 600
+
+
+class OutboxDispatcher(PeriodicWorker):
+    """Background thread that drains EmailOutbox, one pooled SMTP session per batch.
+
+    Each row is marked as soon as its send returns, so a crash mid-batch
+    re-sends at most the message in flight. Failed sends are retried with
+    exponential backoff (``backoff_seconds * 2**(attempt - 1)``, capped at
+    ``max_backoff_seconds``); permanent failures and rows that exhaust
+    ``max_attempts`` are dead-lettered. A connection-level error ends the
+    batch early and hands the untried rows back with a delay.
+    """
+
+    thread_name = "email-outbox"
+
+    def __init__(
+        self,
+        bind=engine,
+        batch_size: int = 50,
+        poll_interval: float = 2.0,
+        max_attempts: int = 8,
+        backoff_seconds: float = 30.0,
+        max_backoff_seconds: float = 3600.0,
+        lease_seconds: int = 300,
+    ) -> None:
+        super().__init__(poll_interval)
+        self._bind = bind
+        self._batch_size = batch_size
+        self._max_attempts = max_attempts
+        self._backoff_seconds = backoff_seconds
+        self._max_backoff_seconds = max_backoff_seconds
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._counters = {"sent": 0, "retried": 0, "dead": 0, "batches": 0, "errors": 0, "released": 0, "stale": 0}
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {**self._counters, "running": self.running}
+
+    def backoff(self, attempts: int) -> float:
+        return min(self._backoff_seconds * (2 ** max(attempts - 1, 0)), self._max_backoff_seconds)
+
+    def dispatch_once(self) -> int:
+        """Claim and send one batch; returns how many rows were claimed."""
+        claim = uuid.uuid4().hex
+        with self._bind.begin() as conn:
+            rows = conn.execute(
+                _CLAIM_BATCH, {"n": self._batch_size, "lease": self._lease_seconds, "claim": claim}
+            ).mappings().all()
+        if not rows:
+            return 0
+
+        config = smtp_config()
+        if config is None:
+            for row in rows:
+                # Dev without SMTP: same console fallback as send_email
+                print_fallback(row["ToAddress"], row["Subject"], row["BodyText"], row["BodyHtml"])
+                self._mark(_MARK_SENT, "sent", {"id": row["OutboxID"], "claim": claim})
+        else:
+            remaining = list(rows)
+            try:
+                with smtp_pool.session(config) as session:
+                    while remaining:
+                        row = remaining.pop(0)
+                        try:
+                            session.send(
+                                build_message(
+                                    config.sender, row["ToAddress"], row["Subject"], row["BodyText"], row["BodyHtml"]
+                                )
+                            )
+                        except Exception as exc:
+                            self._failed(row, exc, claim)
+                            if _is_connection_error(exc):
+                                raise
+                        else:
+                            self._mark(_MARK_SENT, "sent", {"id": row["OutboxID"], "claim": claim})
+            except Exception as exc:
+                if not _is_connection_error(exc):
+                    raise
+                logger.warning("SMTP connection lost; returning %d outbox rows", len(remaining), exc_info=True)
+                self._release(remaining, claim)
+        with self._lock:
+            self._counters["batches"] += 1
+        return len(rows)
+
+    def _mark(self, stmt, outcome: str, params: Mapping[str, object]) -> None:
+        with self._bind.begin() as conn:
+            updated = conn.execute(stmt, params).rowcount
+        with self._lock:
+            if updated:
+                self._counters[outcome] += 1
+            else:
+                # Lease ran out and another dispatcher owns the row now
+                self._counters["stale"] += 1
+        if not updated:
+            logger.warning("Email outbox row %s was re-claimed before it could be marked %s", params["id"], outcome)
+
+    def _failed(self, row: Mapping[str, object], exc: Exception, claim: str) -> None:
+        error = f"{type(exc).__name__}: {exc}"[:1000]
+        params = {"id": row["OutboxID"], "claim": claim, "error": error}
+        if _is_permanent(exc) or row["Attempts"] >= self._max_attempts:
+            logger.error("Email outbox row %s dead-lettered: %s", row["OutboxID"], error)
+            self._mark(_MARK_DEAD, "dead", params)
+        else:
+            self._mark(_MARK_RETRY, "retried", {**params, "delay": int(self.backoff(row["Attempts"]))})
+
+    def _release(self, rows: Sequence[Mapping[str, object]], claim: str) -> None:
+        if not rows:
+            return
+        delay = int(self.backoff(1))
+        with self._bind.begin() as conn:
+            # A list of parameter sets makes SQLAlchemy use executemany
+            conn.execute(_RELEASE, [{"id": row["OutboxID"], "claim": claim, "delay": delay} for row in rows])
+        with self._lock:
+            self._counters["released"] += len(rows)
+
+    def tick(self) -> bool:
+        try:
+            claimed = self.dispatch_once()
+        except Exception:
+            logger.exception("Email outbox dispatch failed")
+            with self._lock:
+                self._counters["errors"] += 1
+            return False
+        # A full batch means more may be waiting; otherwise idle until the next poll
+        return claimed >= self._batch_size
+
+
+# Singleton-like instance for app-wide use
+email_dispatcher = OutboxDispatcher(
+    batch_size=settings.email_outbox_batch_size,
+    poll_interval=settings.email_outbox_poll_seconds,
+    max_attempts=settings.email_outbox_max_attempts,
+    backoff_seconds=settings.email_outbox_backoff_seconds,
+)
@@ -1,48 +1,311 @@
 import os
 import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from email.message import EmailMessage
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from app.core.settings import settings
 
-def _try_smtp_send(to: str, subject: str, body: str, html_body: Optional[str] = None) -> tuple[bool, str]:
+
+@dataclass(frozen=True)
+class SmtpConfig:
+    host: str
+    port: int
+    user: Optional[str]
+    password: Optional[str]
+    sender: str
+
+
+@dataclass(frozen=True)
+class OutgoingEmail:
+    to: str
+    subject: str
+    body: str
+    html_body: Optional[str] = None
+
+
+def smtp_config() -> Optional[SmtpConfig]:
+    """SMTP settings from the environment, or None when SMTP is not configured."""
     host = os.getenv("SMTP_HOST")
     port = int(os.getenv("SMTP_PORT", "0") or 0)
     user = os.getenv("SMTP_USER")
     pwd = os.getenv("SMTP_PASS") or os.getenv("SMTP_PASSWORD")
     sender = os.getenv("EMAIL_SENDER") or os.getenv("EMAIL_FROM", user or "no-reply@example.com")
-    
     if not host or not port:
-        return False, f"SMTP configuration missing: host={host}, port={port}"
-    
-    try:
-        msg = EmailMessage()
-        msg["From"] = sender
-        msg["To"] = to
-        msg["Subject"] = subject
-        if html_body:
-            msg.set_content(body)
-            msg.add_alternative(html_body, subtype="html")
-        else:
-            msg.set_content(body)
-        with smtplib.SMTP(host, port) as s:
-            if user and pwd:
-                s.starttls()
-                s.login(user, pwd)
-            s.send_message(msg)
-        return True, "Email sent successfully via SMTP"
-    except Exception as e:
-        return False, f"SMTP send failed: {str(e)}"
+        return None
+    return SmtpConfig(host=host, port=port, user=user, password=pwd, sender=sender)
 
 
-def send_email(to: str, subject: str, body: str, html_body: Optional[str] = None) -> None:
-    # Try SMTP; else print to stdout (dev)
-    success, message = _try_smtp_send(to, subject, body, html_body)
-    if success:
-        print(f"[EMAIL][SUCCESS] {message}")
-        return
-    
-    # SMTP failed - log the error and fallback to console
-    print(f"[EMAIL][ERROR] {message}")
+def build_message(sender: str, to: str, subject: str, body: str, html_body: Optional[str] = None) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = sender
+    msg["To"] = to
+    msg["Subject"] = subject
+    msg.set_content(body)
+    if html_body:
+        msg.add_alternative(html_body, subtype="html")
+    return msg
+
+
+# Replies that concern one message; the connection itself is still usable
+_MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+# Upper bounds in milliseconds; the last bucket catches everything above
+SEND_BUCKETS_MS: tuple[float, ...] = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class EmailMetrics:
+    """Handshake/send counters and a send-latency histogram."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: List[int] = [0] * (len(SEND_BUCKETS_MS) + 1)
+        self._handshakes = 0
+        self._handshake_ms = 0.0
+        self._sent = 0
+        self._failed = 0
+        self._send_ms = 0.0
+
+    def observe_handshake(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self._handshakes += 1
+            self._handshake_ms += elapsed_ms
+
+    def observe_send(self, elapsed_ms: float, ok: bool) -> None:
+        idx = next(
+            (i for i, bound in enumerate(SEND_BUCKETS_MS) if elapsed_ms <= bound),
+            len(SEND_BUCKETS_MS),
+        )
+        with self._lock:
+            self._counts[idx] += 1
+            self._send_ms += elapsed_ms
+            if ok:
+                self._sent += 1
+            else:
+                self._failed += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            labels = [f"le_{int(b)}ms" for b in SEND_BUCKETS_MS] + ["gt_max"]
+            attempts = self._sent + self._failed
+            return {
+                "handshakes": self._handshakes,
+                "handshake_avg_ms": round(self._handshake_ms / self._handshakes, 3) if self._handshakes else 0.0,
+                "sent": self._sent,
+                "failed": self._failed,
+                "messages_per_handshake": round(self._sent / self._handshakes, 2) if self._handshakes else 0.0,
+                "send_avg_ms": round(self._send_ms / attempts, 3) if attempts else 0.0,
+                "send_latency_histogram": dict(zip(labels, self._counts)),
+            }
+
+
+email_metrics = EmailMetrics()
+
+
+class SmtpSession:
+    """One SMTP connection kept open across sends (STARTTLS/login done once).
+
+    Not thread-safe; a session is used by one thread at a time (the pool
+    hands it out exclusively). With ``max_messages`` set, the connection is
+    replaced transparently once it has carried that many messages, so long
+    batches never hit the server's per-connection cap.
+    """
+
+    def __init__(
+        self,
+        config: SmtpConfig,
+        timeout: float = 30.0,
+        metrics: EmailMetrics = email_metrics,
+        max_messages: Optional[int] = None,
+    ) -> None:
+        self.config = config
+        self._timeout = timeout
+        self._metrics = metrics
+        self._max_messages = max_messages
+        self._smtp: Optional[smtplib.SMTP] = None
+        self.messages_sent = 0
+        # Messages on the current connection; reset on every (re)connect
+        self.connection_messages = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def connected(self) -> bool:
+        return self._smtp is not None
+
+    def _connect(self) -> smtplib.SMTP:
+        start = time.perf_counter()
+        smtp = smtplib.SMTP(self.config.host, self.config.port, timeout=self._timeout)
+        try:
+            if self.config.user and self.config.password:
+                smtp.starttls()
+                smtp.login(self.config.user, self.config.password)
+        except Exception:
+            smtp.close()
+            raise
+        self._metrics.observe_handshake((time.perf_counter() - start) * 1000.0)
+        return smtp
+
+    def _send_once(self, msg: EmailMessage) -> None:
+        if self._smtp is not None and self._max_messages and self.connection_messages >= self._max_messages:
+            self.close()
+        if self._smtp is None:
+            self._smtp = self._connect()
+            self.connection_messages = 0
+        self._smtp.send_message(msg)
+
+    def send(self, msg: EmailMessage) -> None:
+        start = time.perf_counter()
+        ok = False
+        try:
+            try:
+                self._send_once(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the idle connection; reconnect once and retry
+                self._drop()
+                self._send_once(msg)
+            ok = True
+        except _MESSAGE_ERRORS:
+            raise
+        except Exception:
+            # Connection state is unknown; the next send starts a fresh one
+            self._drop()
+            raise
+        finally:
+            self.last_used = time.monotonic()
+            self._metrics.observe_send((time.perf_counter() - start) * 1000.0, ok)
+        self.messages_sent += 1
+        self.connection_messages += 1
+
+    def healthy(self) -> bool:
+        """NOOP round-trip; False (and disconnected) if the server went away."""
+        if self._smtp is None:
+            return True
+        try:
+            return self._smtp.noop()[0] == 250
+        except Exception:
+            self._drop()
+            return False
+
+    def _drop(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                smtp.close()
+
+
+class SmtpPool:
+    """Reuses authenticated SMTP sessions across sends and threads.
+
+    Idle sessions are NOOP-checked after ``health_check_after`` seconds and
+    discarded after ``idle_timeout``. A session reconnects by itself after
+    ``max_messages_per_session`` messages on one connection (many servers cap
+    this), and a session returned at the cap is closed rather than kept idle.
+    """
+
+    def __init__(
+        self,
+        max_idle: int = 4,
+        max_messages_per_session: int = 100,
+        idle_timeout: float = 60.0,
+        health_check_after: float = 15.0,
+    ) -> None:
+        self._max_idle = max_idle
+        self._max_messages = max_messages_per_session
+        self._idle_timeout = idle_timeout
+        self._health_check_after = health_check_after
+        self._lock = threading.Lock()
+        self._idle: List[SmtpSession] = []
+
+    def _acquire(self, config: SmtpConfig) -> SmtpSession:
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                return SmtpSession(config, max_messages=self._max_messages)
+            idle_for = time.monotonic() - session.last_used
+            if session.config != config or idle_for > self._idle_timeout:
+                session.close()
+                continue
+            if idle_for > self._health_check_after and not session.healthy():
+                continue
+            return session
+
+    def _release(self, session: SmtpSession) -> None:
+        if not session.connected:
+            return
+        if session.connection_messages >= self._max_messages:
+            session.close()
+            return
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(session)
+                return
+        session.close()
+
+    @contextmanager
+    def session(self, config: SmtpConfig) -> Iterator[SmtpSession]:
+        session = self._acquire(config)
+        try:
+            yield session
+        finally:
+            self._release(session)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            idle = len(self._idle)
+        return {"idle_sessions": idle, **email_metrics.snapshot()}
+
+
+# Singleton-like instance for app-wide use
+smtp_pool = SmtpPool(
+    max_idle=settings.smtp_pool_max_idle,
+    max_messages_per_session=settings.smtp_max_messages_per_session,
+    idle_timeout=settings.smtp_idle_timeout_seconds,
+)
+
+
+def send_many(emails: Iterable[OutgoingEmail]) -> List[Tuple[bool, str]]:
+    """Send several messages over one pooled session; one (ok, message) per email."""
+    emails = list(emails)
+    config = smtp_config()
+    if config is None:
+        reason = f"SMTP configuration missing: host={os.getenv('SMTP_HOST')}, port={os.getenv('SMTP_PORT')}"
+        return [(False, reason)] * len(emails)
+    results: List[Tuple[bool, str]] = []
+    with smtp_pool.session(config) as session:
+        for email in emails:
+            try:
+                session.send(build_message(config.sender, email.to, email.subject, email.body, email.html_body))
+                results.append((True, "Email sent successfully via SMTP"))
+            except Exception as e:
+                results.append((False, f"SMTP send failed: {str(e)}"))
+    return results
+
+
+def _try_smtp_send(to: str, subject: str, body: str, html_body: Optional[str] = None) -> tuple[bool, str]:
+    return send_many([OutgoingEmail(to, subject, body, html_body)])[0]
+
+
+def print_fallback(to: str, subject: str, body: str, html_body: Optional[str] = None) -> None:
     print(f"[EMAIL][FALLBACK] To: {to}")
     print(f"[EMAIL][FALLBACK] Subject: {subject}")
     if html_body:
@@ -51,3 +314,14 @@ def send_email(to: str, subject: str, body: str, html_body: Optional[str] = None
     else:
         print(f"[EMAIL][FALLBACK] Body: {body}")
 
+
+def send_email(to: str, subject: str, body: str, html_body: Optional[str] = None) -> None:
+    # Try SMTP; else print to stdout (dev)
+    success, message = _try_smtp_send(to, subject, body, html_body)
+    if success:
+        print(f"[EMAIL][SUCCESS] {message}")
+        return
+
+    # SMTP failed - log the error and fallback to console
+    print(f"[EMAIL][ERROR] {message}")
+    print_fallback(to, subject, body, html_body)
@@ -0,0 +1,162 @@
+"""Set-based deep copy of an event: event -> forms -> canvas layouts -> objects.
+
+The whole copy is one T-SQL batch. Each level is a single INSERT ... SELECT
+(a never-matching MERGE where the next level needs an old -> new ID map, since
+only MERGE's OUTPUT can see source columns), so a 50-form event is one round
+trip no matter how many rows it touches.
+
+Column lists come from the schema catalog: every catalogued column is copied
+except keys, parents and audit/soft-delete columns, which get fresh values,
+and identity, computed and rowversion columns, which the server fills in.
+Only the latest layout revision of each form (per device type) is copied; it
+becomes revision 1 of the new form.
+"""
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import TextClause, text
+
+from app.core.schema_catalog import SchemaSnapshot
+
+
+# Never copied; a fresh row gets new values or the column's default
+_AUDIT_SKIP = frozenset({"deletedat", "deletedby", "lastupdated", "updatedby"})
+_OBJECT_KEYS = ("objectid", "canvasobjectid")
+
+
+def _copy_columns(
+    columns: FrozenSet[str], overrides: Dict[str, str], skip: FrozenSet[str]
+) -> List[Tuple[str, str]]:
+    """(column, value expression) pairs: overrides win, the rest copy ``s.<col>``."""
+    pairs = []
+    for column in sorted(columns):
+        if column in skip or column in _AUDIT_SKIP:
+            continue
+        pairs.append((column, overrides.get(column, f"s.[{column}]")))
+    return pairs
+
+
+def _fresh_row_overrides(columns: FrozenSet[str]) -> Dict[str, str]:
+    overrides = {"isdeleted": "0", "createddate": "GETUTCDATE()", "createdby": ":by"}
+    return {c: v for c, v in overrides.items() if c in columns}
+
+
+def _live(alias: str, columns: FrozenSet[str]) -> str:
+    return f"({alias}.IsDeleted = 0 OR {alias}.IsDeleted IS NULL)" if "isdeleted" in columns else "1 = 1"
+
+
+def _latest_revision(layout_cols: FrozenSet[str]) -> str:
+    """Extra WHERE keeping only a form's newest live layout (per device type)."""
+    if "revisionnumber" not in layout_cols:
+        return ""
+    same = "y.FormID = x.FormID"
+    if "devicetype" in layout_cols:
+        same += " AND (y.DeviceType = x.DeviceType OR (y.DeviceType IS NULL AND x.DeviceType IS NULL))"
+    return (
+        f" AND NOT EXISTS (SELECT 1 FROM [CanvasLayout] y WHERE {same} AND {_live('y', layout_cols)} "
+        "AND (y.RevisionNumber > x.RevisionNumber OR "
+        "(y.RevisionNumber = x.RevisionNumber AND y.CanvasLayoutID > x.CanvasLayoutID)))"
+    )
+
+
+def _merge_with_map(
+    table: str,
+    key: str,
+    parent: str,
+    pairs: List[Tuple[str, str]],
+    source_where: str,
+    source_join: str,
+    map_var: str,
+) -> str:
+    """MERGE copying the rows selected by ``source_*`` and recording old -> new keys."""
+    source_columns = sorted({key} | {c for c, _ in pairs})
+    select = ", ".join([f"x.[{c}]" for c in source_columns] + [f"{parent} AS clone_parent"])
+    return (
+        f"MERGE INTO [{table}] USING (SELECT {select} FROM [{table}] x {source_join} "
+        f"WHERE {source_where}) AS s ON 1 = 0 "
+        f"WHEN NOT MATCHED THEN INSERT ({', '.join(f'[{c}]' for c, _ in pairs)}) "
+        f"VALUES ({', '.join(v for _, v in pairs)}) "
+        f"OUTPUT s.[{key}], INSERTED.[{key}] INTO {map_var} (OldID, NewID);"
+    )
+
+
+def build_clone_sql(schema: SchemaSnapshot) -> Optional[TextClause]:
+    """One batch cloning event ``:src`` of org ``:org``; ``None`` without an Event table.
+
+    Binds: src, org, name, slug, status, shift_days, by, created_by. The
+    batch ends with a single row: event_id, forms, layouts, objects.
+    """
+    event_cols = schema.columns.get("event", frozenset())
+    if not event_cols:
+        return None
+    cols = schema.event
+
+    overrides = _fresh_row_overrides(event_cols)
+    overrides.update({"name": ":name", "eventname": ":name", "status": ":status", "eventstatus": ":status"})
+    overrides.update({"eventslug": ":slug", "createdbyuserid": ":created_by"})
+    for column in ("startdate", "enddate"):
+        overrides[column] = f"DATEADD(day, :shift_days, s.[{column}])"
+    if cols.created_col:
+        overrides[cols.created_col.lower()] = "GETUTCDATE()"
+    event_pairs = _copy_columns(schema.writable("event"), overrides, frozenset({"eventid"}))
+    parts = [
+        "SET NOCOUNT ON;",
+        "DECLARE @NewEvent TABLE (NewID bigint);",
+        "DECLARE @FormMap TABLE (OldID bigint PRIMARY KEY, NewID bigint);",
+        "DECLARE @LayoutMap TABLE (OldID bigint PRIMARY KEY, NewID bigint);",
+        "DECLARE @NewEventID bigint, @Objects int = 0;",
+        f"INSERT INTO [Event] ({', '.join(f'[{c}]' for c, _ in event_pairs)}) "
+        "OUTPUT INSERTED.EventID INTO @NewEvent (NewID) "
+        f"SELECT {', '.join(v for _, v in event_pairs)} FROM [Event] s "
+        f"WHERE s.EventID = :src AND s.OrganizationID = :org AND {_live('s', event_cols)};",
+        "SELECT @NewEventID = NewID FROM @NewEvent;",
+    ]
+
+    form_cols = schema.columns.get("form", frozenset())
+    layout_cols = schema.columns.get("canvaslayout", frozenset())
+    object_cols = schema.columns.get("canvasobject", frozenset())
+    if form_cols:
+        overrides = _fresh_row_overrides(form_cols)
+        overrides["eventid"] = "@NewEventID"
+        # The suffix is the new event's ID, so copies never collide with the
+        # source and distinct source slugs stay distinct
+        overrides["publicslug"] = (
+            "CASE WHEN s.[publicslug] IS NULL THEN NULL ELSE CONCAT(LEFT(s.[publicslug], "
+            "80 - LEN(CONCAT('-', @NewEventID))), '-', @NewEventID) END"
+        )
+        parts.append(
+            "IF @NewEventID IS NOT NULL "
+            + _merge_with_map(
+                "Form", "formid", "NULL",
+                _copy_columns(schema.writable("form"), overrides, frozenset({"formid"})),
+                f"x.EventID = :src AND {_live('x', form_cols)}", "", "@FormMap",
+            )
+        )
+    if form_cols and "formid" in layout_cols:
+        overrides = _fresh_row_overrides(layout_cols)
+        overrides.update({"formid": "s.clone_parent", "eventid": "@NewEventID", "revisionnumber": "1"})
+        parts.append(
+            _merge_with_map(
+                "CanvasLayout", "canvaslayoutid", "m.NewID",
+                _copy_columns(schema.writable("canvaslayout"), overrides, frozenset({"canvaslayoutid"})),
+                _live("x", layout_cols) + _latest_revision(layout_cols),
+                "JOIN @FormMap m ON m.OldID = x.FormID", "@LayoutMap",
+            )
+        )
+    object_key = next((k for k in _OBJECT_KEYS if k in object_cols), None)
+    if "canvaslayoutid" in layout_cols and object_key and "canvaslayoutid" in object_cols:
+        overrides = _fresh_row_overrides(object_cols)
+        overrides["canvaslayoutid"] = "m.NewID"
+        pairs = _copy_columns(schema.writable("canvasobject"), overrides, frozenset({object_key}))
+        values = ", ".join(v.replace("s.[", "o.[") for _, v in pairs)
+        parts.append(
+            f"INSERT INTO [CanvasObject] ({', '.join(f'[{c}]' for c, _ in pairs)}) "
+            f"SELECT {values} FROM [CanvasObject] o JOIN @LayoutMap m ON m.OldID = o.CanvasLayoutID "
+            f"WHERE {_live('o', object_cols)}; SET @Objects = @@ROWCOUNT;"
+        )
+    parts.append(
+        "SELECT @NewEventID AS event_id, (SELECT COUNT(1) FROM @FormMap) AS forms, "
+        "(SELECT COUNT(1) FROM @LayoutMap) AS layouts, @Objects AS objects;"
+    )
+    return text("\n".join(parts))
@@ -0,0 +1,162 @@
+"""Filters, sparse fields and keyset pages for the org event listing.
+
+Pages are read newest first on ``(CreatedDate, EventID)`` with the same
+cursor format as the audit listing. The weak ETag comes from one aggregate
+over the org's events, so a poll that finds nothing changed is answered
+without selecting or serializing a single row.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import TextClause, text
+
+from app.core.schema_catalog import EventColumns
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+# Public field -> (capability, column); the first available column wins
+_FIELD_COLUMNS = {
+    "name": (("name", "Name"), ("event_name", "EventName")),
+    "status": (("status", "Status"), ("event_status", "EventStatus")),
+    "timezone": (("timezone", "Timezone"),),
+    "type": (("event_type", "EventType"),),
+    "slug": (("event_slug", "EventSlug"),),
+    "start_date": (("start_date", "StartDate"),),
+    "end_date": (("end_date", "EndDate"),),
+}
+# Always selected: they make up the cursor
+KEY_FIELDS = ("id", "created_date")
+DEFAULT_FIELDS = ("name", "status", "timezone")
+
+
+def _column(cols: EventColumns, public: str) -> Optional[str]:
+    return next((c for cap, c in _FIELD_COLUMNS[public] if getattr(cols, cap)), None)
+
+
+def parse_fields(raw: Optional[str]) -> Tuple[str, ...]:
+    """``"name,status"`` -> sorted field tuple; empty means the default set."""
+    if not raw:
+        return DEFAULT_FIELDS
+    wanted = {f.strip() for f in raw.split(",") if f.strip()} - set(KEY_FIELDS)
+    unknown = wanted - set(_FIELD_COLUMNS)
+    if unknown:
+        raise InvalidFields(", ".join(sorted(unknown)))
+    return tuple(sorted(wanted))
+
+
+def select_list(cols: EventColumns, fields: Iterable[str]) -> str:
+    select = ["EventID as id", "CreatedDate as created_date"]
+    for public in fields:
+        column = _column(cols, public)
+        if column:
+            select.append(f"{column} as {public}")
+    return ", ".join(select)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("[", "[[]").replace("%", "[%]").replace("_", "[_]")
+
+
+@dataclass
+class EventFilter:
+    """Org scope plus optional status, start-date range and name prefix."""
+
+    clauses: list = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        cols: EventColumns,
+        org_id: int,
+        status: Optional[str] = None,
+        from_: Optional[datetime] = None,
+        to: Optional[datetime] = None,
+        name_prefix: Optional[str] = None,
+    ) -> "EventFilter":
+        f = cls(["OrganizationID = :org"], {"org": org_id})
+        if cols.is_deleted:
+            f.clauses.append("(IsDeleted = 0 OR IsDeleted IS NULL)")
+        status_col = _column(cols, "status")
+        if status and status_col:
+            f.clauses.append(f"{status_col} = :status")
+            f.params["status"] = status
+        # Range over the event's start when the schema has one
+        date_col = "StartDate" if cols.start_date else "CreatedDate"
+        if from_:
+            f.clauses.append(f"{date_col} >= :from")
+            f.params["from"] = from_
+        if to:
+            f.clauses.append(f"{date_col} <= :to")
+            f.params["to"] = to
+        name_col = _column(cols, "name")
+        if name_prefix and name_col:
+            f.clauses.append(f"{name_col} LIKE :name_prefix")
+            f.params["name_prefix"] = _escape_like(name_prefix) + "%"
+        return f
+
+    @property
+    def where(self) -> str:
+        return " AND ".join(self.clauses)
+
+    @property
+    def variant(self) -> Tuple[str, ...]:
+        # Statement shape depends only on which filters are present
+        return tuple(sorted(self.params))
+
+
+def build_page_sql(
+    cols: EventColumns, f: EventFilter, fields: Tuple[str, ...], keyed: bool, limited: bool = True
+) -> TextClause:
+    """Newest-first SELECT; ``limited`` adds ``TOP (:limit)`` for paged reads."""
+    clauses = [f.where]
+    if keyed:
+        clauses.append(
+            "(CreatedDate < CAST(:c_date AS datetime) "
+            "OR (CreatedDate = CAST(:c_date AS datetime) AND EventID < :c_id))"
+        )
+    top = "TOP (:limit) " if limited else ""
+    return text(
+        f"SELECT {top}{select_list(cols, fields)} FROM [Event] "
+        f"WHERE {' AND '.join(clauses)} ORDER BY CreatedDate DESC, EventID DESC"
+    )
+
+
+def build_version_sql(cols: EventColumns) -> TextClause:
+    """Row count and newest change of the org's live events, in one seek."""
+    where = "OrganizationID = :org"
+    if cols.is_deleted:
+        where += " AND (IsDeleted = 0 OR IsDeleted IS NULL)"
+    if cols.last_updated:
+        changed = "MAX(LastUpdated)"
+    else:
+        # No change timestamp: an in-place edit of a listed column still moves the checksum
+        listed = [c for c in (_column(cols, public) for public in _FIELD_COLUMNS) if c]
+        changed = f"CHECKSUM_AGG(BINARY_CHECKSUM({', '.join(['EventID', 'CreatedDate'] + listed)}))"
+    return text(
+        f"SELECT COUNT(1) AS n, MAX(CreatedDate) AS created, {changed} AS changed, "
+        f"MAX(EventID) AS max_id FROM [Event] WHERE {where}"
+    )
+
+
+def weak_etag(version: Any, query: str) -> str:
+    """``W/"..."`` over the org's event version and the request's query string."""
+    n, created, changed, max_id = version
+    seed = f"{n}|{created}|{changed}|{max_id}|{query}"
+    return f'W/"{hashlib.sha1(seed.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip() for t in if_none_match.split(",")}
+    # Weak comparison: W/ prefixes are ignored on both sides
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return "*" in tags or any((t[2:] if t.startswith("W/") else t) == bare for t in tags)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from app.core.settings import settings
+from app.utils.security import hash_password, verify_and_upgrade, verify_password
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upper bounds in milliseconds; the last bucket catches everything above
+LATENCY_BUCKETS_MS: tuple[float, ...] = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; mapped to a 503 by the app."""
+
+
+class _Latency:
+    """Count/total/max plus a fixed-bucket histogram (caller holds the lock)."""
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        idx = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound),
+            len(LATENCY_BUCKETS_MS),
+        )
+        self.counts[idx] += 1
+        self.n += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def snapshot(self) -> Dict[str, object]:
+        labels = [f"le_{int(b)}ms" for b in LATENCY_BUCKETS_MS] + ["gt_max"]
+        return {
+            "count": self.n,
+            "avg_ms": round(self.total_ms / self.n, 3) if self.n else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "histogram": dict(zip(labels, self.counts)),
+        }
+
+
+class PasswordHasher:
+    """Runs bcrypt hash/verify on a small dedicated pool with admission control.
+
+    bcrypt is deliberately slow (~100 ms+) and releases the GIL, so a capped
+    thread pool bounds how many CPU cores a login storm can take. Callers
+    await the result on the event loop, so no request thread or pooled
+    connection waits behind the queue. At most ``max_workers + max_pending``
+    hashes are admitted at a time; anyone beyond that gets
+    ``PasswordHasherBusy`` immediately.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._queue_wait = _Latency()
+        self._hash_latency = _Latency()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="pwhash"
+                )
+            return self._executor
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= self._max_workers + self._max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._in_flight += 1
+
+    def _release(self, _=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        self._admit()
+        submitted = time.perf_counter()
+
+        def _timed() -> T:
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                done = time.perf_counter()
+                with self._lock:
+                    self._queue_wait.observe((started - submitted) * 1000.0)
+                    self._hash_latency.observe((done - started) * 1000.0)
+
+        try:
+            future = self._get_executor().submit(_timed)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the hash finishes, even if the awaiting request is cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, salt: str, password: str) -> str:
+        return await self._run(hash_password, salt, password)
+
+    async def verify(self, salt: str, stored_hash: str, password: str) -> bool:
+        return await self._run(verify_password, salt, stored_hash, password)
+
+    async def verify_and_upgrade(self, salt: str, stored_hash: str, password: str) -> tuple[bool, Optional[str]]:
+        """Like ``verify`` plus a new hash when the stored one is legacy or under-cost."""
+        return await self._run(verify_and_upgrade, salt, stored_hash, password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "max_pending": self._max_pending,
+                "in_flight": self._in_flight,
+                "queued": max(self._in_flight - self._max_workers, 0),
+                "rejected": self._rejected,
+                "queue_wait": self._queue_wait.snapshot(),
+                "hash_latency": self._hash_latency.snapshot(),
+            }
+
+
+# Singleton-like instance for app-wide use
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
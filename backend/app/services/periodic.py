@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+
+class PeriodicWorker:
+    """Daemon thread that calls ``tick()`` every ``interval_seconds`` until stopped.
+
+    ``wake()`` starts the next tick now, ``stop()`` interrupts the wait and
+    joins the thread, and an interval of zero or less leaves the worker off.
+    Long ticks should check ``self._stopping`` between steps so shutdown is
+    not held up.
+    """
+
+    thread_name = "periodic-worker"
+
+    def __init__(self, interval_seconds: float) -> None:
+        self._interval = interval_seconds
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running or self._interval <= 0:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self) -> None:
+        """Run the next tick now instead of waiting for the interval."""
+        self._wake.set()
+
+    def tick(self) -> bool:
+        """One round of work; return True to go again without waiting."""
+        raise NotImplementedError
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            if self.tick():
+                continue
+            self._wake.wait(self._interval)
+            self._wake.clear()
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Protocol, Tuple
+
+from sqlalchemy import text
+from app.core.db import engine
+from app.core.settings import settings
+from app.services.settings_service import settings_service
+
+try:  # optional: shared store for multi-node deployments
+    import redis  # type: ignore
+except ImportError:  # pragma: no cover - depends on deployment
+    redis = None  # type: ignore
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """At most ``limit`` hits per sliding ``window_seconds``, spaced ``cooldown_seconds`` apart."""
+
+    name: str
+    limit: int
+    window_seconds: int
+    cooldown_seconds: int = 0
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    reason: Optional[str] = None  # "cooldown" | "limit"
+    retry_after: int = 0
+    count: int = 0
+
+
+def _decide(rule: RateLimit, count: int, since_last: Optional[float], window_left: Optional[float] = None) -> Decision:
+    """Verdict for a key that already has ``count`` hits in the window."""
+    if rule.cooldown_seconds and since_last is not None and since_last < rule.cooldown_seconds:
+        return Decision(False, "cooldown", int(rule.cooldown_seconds - since_last) + 1, count)
+    if count >= rule.limit:
+        retry = rule.window_seconds if window_left is None else max(int(window_left), 1)
+        return Decision(False, "limit", retry, count)
+    return Decision(True, count=count)
+
+
+class RateLimitStore(Protocol):
+    def usage(self, rule: RateLimit, key: str, conn=None) -> Tuple[int, Optional[float]]:
+        """(hits within the window, seconds since the last hit or None)."""
+
+    def hit(self, rule: RateLimit, key: str, conn=None) -> Decision:
+        """Check and, when allowed, count one hit as a single atomic step."""
+
+
+class MemoryStore:
+    """Per-process sliding-window log; state is lost on restart."""
+
+    def __init__(self, max_keys: int = 100000) -> None:
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+        # (rule, key) -> (window seconds, hit times)
+        self._hits: Dict[Tuple[str, str], Tuple[int, Deque[float]]] = {}
+
+    @staticmethod
+    def _prune(window: int, hits: Deque[float], now: float) -> None:
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+
+    def usage(self, rule: RateLimit, key: str, conn=None) -> Tuple[int, Optional[float]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._hits.get((rule.name, key))
+            if entry is None:
+                return 0, None
+            self._prune(rule.window_seconds, entry[1], now)
+            hits = entry[1]
+            return len(hits), (now - hits[-1]) if hits else None
+
+    def hit(self, rule: RateLimit, key: str, conn=None) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._hits.setdefault((rule.name, key), (rule.window_seconds, deque()))
+            hits = entry[1]
+            self._prune(rule.window_seconds, hits, now)
+            decision = _decide(
+                rule, len(hits), (now - hits[-1]) if hits else None,
+                (hits[0] + rule.window_seconds - now) if hits else None,
+            )
+            if decision.allowed:
+                hits.append(now)
+            if len(self._hits) > self._max_keys:
+                for k, (window, old) in list(self._hits.items()):
+                    self._prune(window, old, now)
+                    if not old:
+                        del self._hits[k]
+            return decision
+
+
+# Prune, decide and record in one server-side step. Returns
+# {recorded, count before, seconds since last or -1, seconds left in window or -1};
+# floats are sent back as strings because Redis truncates Lua numbers.
+_REDIS_HIT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cooldown = tonumber(ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+local since, left = -1, -1
+local last = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+if last[2] then since = now - tonumber(last[2]) end
+local first = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+if first[2] then left = tonumber(first[2]) + window - now end
+if (cooldown > 0 and since >= 0 and since < cooldown) or count >= limit then
+    return {0, count, tostring(since), tostring(left)}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[5])
+redis.call('EXPIRE', KEYS[1], window)
+return {1, count, tostring(since), tostring(left)}
+"""
+
+
+class RedisStore:
+    """Sliding-window log in a Redis sorted set, shared by every node."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit") -> None:
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package")
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._hit_script = self._client.register_script(_REDIS_HIT)
+
+    def _key(self, rule: RateLimit, key: str) -> str:
+        return f"{self._prefix}:{rule.name}:{key}"
+
+    def usage(self, rule: RateLimit, key: str, conn=None) -> Tuple[int, Optional[float]]:
+        now = time.time()
+        name = self._key(rule, key)
+        pipe = self._client.pipeline()
+        pipe.zremrangebyscore(name, 0, now - rule.window_seconds)
+        pipe.zcard(name)
+        pipe.zrange(name, -1, -1, withscores=True)
+        _, count, last = pipe.execute()
+        return int(count), (now - last[0][1]) if last else None
+
+    def hit(self, rule: RateLimit, key: str, conn=None) -> Decision:
+        now = time.time()
+        recorded, count, since, left = self._hit_script(
+            keys=[self._key(rule, key)],
+            args=[now, rule.window_seconds, rule.limit, rule.cooldown_seconds, f"{now}:{uuid.uuid4().hex[:8]}"],
+        )
+        if recorded:
+            return Decision(True, count=int(count))
+        since_last, window_left = float(since), float(left)
+        return _decide(
+            rule, int(count), since_last if since_last >= 0 else None, window_left if window_left >= 0 else None
+        )
+
+
+# One counter row per (rule, key). The conditional UPDATE takes the row lock,
+# so concurrent hits on a key serialize and none can slip past the limit.
+_SQL_ENSURE = text(
+    "IF NOT EXISTS (SELECT 1 FROM RateLimitCounter WITH (UPDLOCK, HOLDLOCK) "
+    "WHERE RuleName = :rule AND KeyValue = :k) "
+    "INSERT INTO RateLimitCounter (RuleName, KeyValue, WindowStart, Hits) "
+    "VALUES (:rule, :k, GETUTCDATE(), 0)"
+)
+_SQL_HIT = text(
+    "UPDATE RateLimitCounter SET "
+    "Hits = CASE WHEN WindowStart <= DATEADD(second, -:window, GETUTCDATE()) THEN 1 ELSE Hits + 1 END, "
+    "WindowStart = CASE WHEN WindowStart <= DATEADD(second, -:window, GETUTCDATE()) "
+    "THEN GETUTCDATE() ELSE WindowStart END, "
+    "LastHitAt = GETUTCDATE() "
+    "OUTPUT CASE WHEN DELETED.WindowStart <= DATEADD(second, -:window, GETUTCDATE()) THEN 0 ELSE DELETED.Hits END "
+    "WHERE RuleName = :rule AND KeyValue = :k "
+    "AND (LastHitAt IS NULL OR LastHitAt <= DATEADD(second, -:cooldown, GETUTCDATE())) "
+    "AND (Hits < :limit OR WindowStart <= DATEADD(second, -:window, GETUTCDATE()))"
+)
+_SQL_USAGE = text(
+    "SELECT CASE WHEN WindowStart <= DATEADD(second, -:window, GETUTCDATE()) THEN 0 ELSE Hits END, "
+    "DATEDIFF(second, LastHitAt, GETUTCDATE()), "
+    ":window - DATEDIFF(second, WindowStart, GETUTCDATE()) "
+    "FROM RateLimitCounter WHERE RuleName = :rule AND KeyValue = :k"
+)
+
+
+class SqlStore:
+    """Fixed-window counters in RateLimitCounter, updated inside the caller's transaction.
+
+    A hit counted on the request's connection rolls back with it, so a
+    failed request never uses up quota.
+    """
+
+    def _read(self, rule: RateLimit, key: str, conn) -> Tuple[int, Optional[float], Optional[float]]:
+        row = conn.execute(_SQL_USAGE, {"rule": rule.name, "k": key, "window": rule.window_seconds}).first()
+        if not row:
+            return 0, None, None
+        return int(row[0] or 0), (float(row[1]) if row[1] is not None else None), float(row[2])
+
+    def usage(self, rule: RateLimit, key: str, conn=None) -> Tuple[int, Optional[float]]:
+        if conn is None:
+            with engine.connect() as own:
+                return self.usage(rule, key, own)
+        count, since_last, _ = self._read(rule, key, conn)
+        return count, since_last
+
+    def hit(self, rule: RateLimit, key: str, conn=None) -> Decision:
+        if conn is None:
+            with engine.begin() as own:
+                return self.hit(rule, key, own)
+        params = {
+            "rule": rule.name,
+            "k": key,
+            "window": rule.window_seconds,
+            "limit": rule.limit,
+            "cooldown": rule.cooldown_seconds,
+        }
+        conn.execute(_SQL_ENSURE, params)
+        row = conn.execute(_SQL_HIT, params).first()
+        if row is not None:
+            return Decision(True, count=int(row[0] or 0))
+        # Nothing was counted, so this is a denial even if whole-second
+        # DATEDIFF rounding makes the recomputed verdict look allowed
+        count, since_last, window_left = self._read(rule, key, conn)
+        verdict = _decide(rule, count, since_last, window_left)
+        if verdict.allowed:
+            reason = "limit" if count >= rule.limit or not rule.cooldown_seconds else "cooldown"
+            return Decision(False, reason, 1, count)
+        return Decision(False, verdict.reason, max(verdict.retry_after, 1), count)
+
+
+class RateLimiter:
+    """Answers "allowed?" for a rule and key against the configured store."""
+
+    def __init__(self, store: RateLimitStore) -> None:
+        self.store = store
+
+    def check(self, rule: RateLimit, key, conn=None) -> Decision:
+        """Read-only verdict; use ``hit`` to consume quota."""
+        count, since_last = self.store.usage(rule, str(key), conn)
+        return _decide(rule, count, since_last)
+
+    def hit(self, rule: RateLimit, key, conn=None) -> Decision:
+        """Count one hit if it is allowed, atomically with the check."""
+        return self.store.hit(rule, str(key), conn)
+
+
+def _build_store() -> RateLimitStore:
+    backend = settings.rate_limit_backend
+    if backend == "redis":
+        return RedisStore(settings.rate_limit_redis_url)
+    if backend == "sql":
+        return SqlStore()
+    return MemoryStore()
+
+
+# Singleton-like instance for app-wide use
+rate_limiter = RateLimiter(_build_store())
+
+DAY_SECONDS = 86400
+
+
+# Rules are rebuilt per call so GlobalSetting changes apply without a restart
+def resend_rule() -> RateLimit:
+    return RateLimit(
+        name="auth.resend",
+        limit=settings_service.get_resend_max_per_day(),
+        window_seconds=DAY_SECONDS,
+        cooldown_seconds=settings_service.get_resend_cooldown_seconds(),
+    )
+
+
+def reset_rule() -> RateLimit:
+    return RateLimit(
+        name="auth.reset",
+        limit=settings_service.get_reset_max_per_day(),
+        window_seconds=DAY_SECONDS,
+        cooldown_seconds=settings_service.get_reset_cooldown_seconds(),
+    )
+
+
+def invite_rule() -> RateLimit:
+    return RateLimit(
+        name="invitation.org",
+        limit=settings_service.get_invite_daily_limit(),
+        window_seconds=DAY_SECONDS,
+    )
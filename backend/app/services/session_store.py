@@ -0,0 +1,180 @@
+"""Rotating refresh-token sessions.
+
+Login issues a short-lived access JWT plus an opaque refresh token. Each
+refresh token is single-use: ``/auth/refresh`` marks it rotated and issues
+the next one in the same family, so renewing access costs a digest lookup
+and two small writes instead of a bcrypt verify. Presenting a token that was
+already rotated means it was copied, and the whole family is revoked.
+
+Only SHA-256 digests are stored. Active sessions are cached in memory by
+digest to skip the lookup; the conditional rotate UPDATE stays the source of
+truth, so a revocation on another node still wins.
+"""
+from __future__ import annotations
+
+import secrets
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.settings import settings
+from app.services.token_store import token_hash
+
+
+class SessionInvalid(Exception):
+    """Unknown, expired, revoked or reused refresh token."""
+
+
+@dataclass(frozen=True)
+class Session:
+    session_id: int
+    user_id: int
+    family_id: str
+    expires_at: datetime  # naive UTC, as stored
+
+
+_INSERT_SESSION = text(
+    "INSERT INTO AuthSession (UserID, FamilyID, TokenHash, ExpiresAt, CreatedAt, IP, UserAgent) "
+    "OUTPUT INSERTED.SessionID "
+    "VALUES (:uid, :family, :token_hash, :expires, GETUTCDATE(), :ip, :ua)"
+)
+_FIND_SESSION = text(
+    "SELECT SessionID, UserID, FamilyID, ExpiresAt, RotatedAt, RevokedAt "
+    "FROM AuthSession WHERE TokenHash = :token_hash"
+)
+# Single use: only the first rotation of a token can match
+_ROTATE_SESSION = text(
+    "UPDATE AuthSession SET RotatedAt = GETUTCDATE() "
+    "WHERE SessionID = :id AND RotatedAt IS NULL AND RevokedAt IS NULL AND ExpiresAt > GETUTCDATE()"
+)
+_REVOKE_FAMILY = text(
+    "UPDATE AuthSession SET RevokedAt = GETUTCDATE() WHERE FamilyID = :family AND RevokedAt IS NULL"
+)
+_REVOKE_USER = text(
+    "UPDATE AuthSession SET RevokedAt = GETUTCDATE() WHERE UserID = :uid AND RevokedAt IS NULL"
+)
+
+
+class SessionStore:
+    """Issues, rotates and revokes refresh-token sessions."""
+
+    def __init__(self, refresh_ttl_seconds: int = 14 * 86400, max_entries: int = 10000) -> None:
+        self._ttl = timedelta(seconds=refresh_ttl_seconds)
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._active: "OrderedDict[str, Session]" = OrderedDict()
+        self._counters = {
+            "issued": 0, "rotated": 0, "reuse_detected": 0, "revoked": 0, "cache_hits": 0, "cache_misses": 0,
+        }
+
+    def _remember(self, digest: str, session: Session) -> None:
+        with self._lock:
+            self._active[digest] = session
+            while len(self._active) > self._max_entries:
+                self._active.popitem(last=False)
+
+    def _forget_family(self, family_id: str) -> None:
+        with self._lock:
+            for digest in [d for d, s in self._active.items() if s.family_id == family_id]:
+                del self._active[digest]
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+    def _insert(self, conn, user_id: int, family_id: str, ip: Optional[str], ua: Optional[str]) -> Tuple[str, Session]:
+        raw = secrets.token_urlsafe(32)
+        digest = token_hash(raw)
+        expires = datetime.utcnow().replace(microsecond=0) + self._ttl
+        session_id = conn.execute(
+            _INSERT_SESSION,
+            {"uid": user_id, "family": family_id, "token_hash": digest, "expires": expires,
+             "ip": ip, "ua": (ua or "")[:256] or None},
+        ).scalar()
+        session = Session(int(session_id), int(user_id), family_id, expires)
+        self._remember(digest, session)
+        return raw, session
+
+    def create(
+        self, conn, user_id: int, ip: Optional[str] = None, user_agent: Optional[str] = None
+    ) -> Tuple[str, Session]:
+        """Start a new session family; returns (raw refresh token, session)."""
+        raw, session = self._insert(conn, user_id, secrets.token_hex(16), ip, user_agent)
+        self._count("issued")
+        return raw, session
+
+    def _lookup(self, conn, digest: str) -> Session:
+        with self._lock:
+            # Single use either way, so the entry can go now
+            cached = self._active.pop(digest, None)
+        if cached is not None:
+            self._count("cache_hits")
+            return cached
+        self._count("cache_misses")
+        row = conn.execute(_FIND_SESSION, {"token_hash": digest}).mappings().first()
+        if row is None:
+            raise SessionInvalid("unknown")
+        session = Session(int(row["SessionID"]), int(row["UserID"]), row["FamilyID"], row["ExpiresAt"])
+        if row["RevokedAt"] is not None:
+            raise SessionInvalid("revoked")
+        if row["RotatedAt"] is not None:
+            self._reused(conn, session)
+        return session
+
+    def _reused(self, conn, session: Session) -> None:
+        self._count("reuse_detected")
+        self.revoke_family(conn, session.family_id)
+        raise SessionInvalid("reused")
+
+    def rotate(
+        self, conn, raw: str, ip: Optional[str] = None, user_agent: Optional[str] = None
+    ) -> Tuple[str, Session]:
+        """Consume ``raw`` and return the next (raw refresh token, session) of its family."""
+        if not raw:
+            raise SessionInvalid("missing")
+        session = self._lookup(conn, token_hash(raw))
+        if session.expires_at <= datetime.utcnow():
+            raise SessionInvalid("expired")
+        if conn.execute(_ROTATE_SESSION, {"id": session.session_id}).rowcount != 1:
+            # Rotated (or revoked) elsewhere after our cache entry was made
+            self._reused(conn, session)
+        new_raw, new_session = self._insert(conn, session.user_id, session.family_id, ip, user_agent)
+        self._count("rotated")
+        return new_raw, new_session
+
+    def revoke_family(self, conn, family_id: str) -> int:
+        self._forget_family(family_id)
+        revoked = conn.execute(_REVOKE_FAMILY, {"family": family_id}).rowcount
+        with self._lock:
+            self._counters["revoked"] += max(revoked or 0, 0)
+        return revoked
+
+    def revoke_token(self, conn, raw: str) -> int:
+        """Logout: revoke the family ``raw`` belongs to (no-op if unknown)."""
+        row = conn.execute(_FIND_SESSION, {"token_hash": token_hash(raw)}).mappings().first()
+        return self.revoke_family(conn, row["FamilyID"]) if row else 0
+
+    def revoke_user(self, conn, user_id: int) -> int:
+        """Every session of a user, e.g. after a password change."""
+        with self._lock:
+            for digest in [d for d, s in self._active.items() if s.user_id == int(user_id)]:
+                del self._active[digest]
+        revoked = conn.execute(_REVOKE_USER, {"uid": user_id}).rowcount
+        with self._lock:
+            self._counters["revoked"] += max(revoked or 0, 0)
+        return revoked
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {**self._counters, "cached": len(self._active)}
+
+
+# Singleton-like instance for app-wide use
+session_store = SessionStore(
+    refresh_ttl_seconds=settings.refresh_token_ttl_seconds,
+    max_entries=settings.session_cache_size,
+)
@@ -6,6 +6,7 @@ from typing import Optional, Dict, Tuple
 
 from sqlalchemy import text
 from app.core.db import SessionLocal
+from app.core.settings import settings
 
 
 class _SettingsCache:
@@ -94,6 +95,24 @@ class SettingsService:
     def get_invite_daily_limit(self) -> int:
         return int(self.get_int("invite_daily_limit", default=10) or 10)
 
+    def get_resend_cooldown_seconds(self) -> int:
+        default = settings.auth_resend_cooldown_seconds
+        return int(self.get_int("auth_resend_cooldown_seconds", default=default) or default)
+
+    def get_resend_max_per_day(self) -> int:
+        default = settings.auth_resend_max_per_day
+        return int(self.get_int("auth_resend_max_per_day", default=default) or default)
+
+    def get_reset_cooldown_seconds(self) -> int:
+        return int(self.get_int("auth_reset_cooldown_seconds", default=300) or 300)
+
+    def get_reset_max_per_day(self) -> int:
+        return int(self.get_int("auth_reset_max_per_day", default=3) or 3)
+
+    def get_auth_event_retention_months(self) -> int:
+        default = settings.auth_event_retention_months
+        return max(1, int(self.get_int("auth_event_retention_months", default=default) or default))
+
 
 # Singleton-like instance for app-wide use
 settings_service = SettingsService()
@@ -0,0 +1,140 @@
+"""Precompiled email templates.
+
+Templates live in ``app/templates/email`` as ``<name>.subject.txt``,
+``<name>.txt`` and optionally ``<name>.html``, with ``{{ variable }}``
+placeholders. Each file is split once into its static fragments and
+variable slots, so a render is a single join over precomputed strings plus
+the per-recipient values (HTML-escaped in the HTML part).
+"""
+from __future__ import annotations
+
+import html
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+
+class TemplateError(Exception):
+    pass
+
+
+def _as_text(value: object) -> str:
+    return str(value)
+
+
+def _as_html(value: object) -> str:
+    return html.escape(str(value), quote=True)
+
+
+class CompiledTemplate:
+    """One template file: static fragments interleaved with variable slots."""
+
+    __slots__ = ("name", "variables", "_parts", "_slots", "_convert")
+
+    def __init__(self, name: str, source: str, convert: Callable[[object], str] = _as_text) -> None:
+        parts = []
+        slots = []
+        pos = 0
+        for m in _PLACEHOLDER.finditer(source):
+            parts.append(source[pos:m.start()])
+            slots.append(m.group(1))
+            pos = m.end()
+        parts.append(source[pos:])
+        self.name = name
+        self.variables: Tuple[str, ...] = tuple(dict.fromkeys(slots))
+        self._parts: Tuple[str, ...] = tuple(parts)
+        self._slots: Tuple[str, ...] = tuple(slots)
+        self._convert = convert
+
+    def render(self, values: Dict[str, object]) -> str:
+        try:
+            # Convert/escape each variable once even if it appears several times
+            converted = {k: self._convert(values[k]) for k in self.variables}
+        except KeyError as e:
+            raise TemplateError(f"{self.name}: missing variable {e.args[0]!r}") from None
+        out = [self._parts[0]]
+        for slot, static in zip(self._slots, self._parts[1:]):
+            out.append(converted[slot])
+            out.append(static)
+        return "".join(out)
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    body: str
+    html_body: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    name: str
+    subject: CompiledTemplate
+    text: CompiledTemplate
+    html: Optional[CompiledTemplate] = None
+
+    def render(self, **values: object) -> RenderedEmail:
+        return RenderedEmail(
+            subject=self.subject.render(values),
+            body=self.text.render(values),
+            html_body=self.html.render(values) if self.html is not None else None,
+        )
+
+
+def _read(path: Path) -> str:
+    # Editors add a trailing newline; the mail body should not carry it
+    source = path.read_text(encoding="utf-8")
+    return source[:-1] if source.endswith("\n") else source
+
+
+class TemplateRegistry:
+    """Loads and compiles every template in ``directory`` once."""
+
+    def __init__(self, directory: Path = TEMPLATE_DIR) -> None:
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._templates: Optional[Dict[str, EmailTemplate]] = None
+
+    def load(self) -> Dict[str, EmailTemplate]:
+        templates: Dict[str, EmailTemplate] = {}
+        for subject_path in sorted(self._directory.glob("*.subject.txt")):
+            name = subject_path.name[: -len(".subject.txt")]
+            text_path = self._directory / f"{name}.txt"
+            html_path = self._directory / f"{name}.html"
+            if not text_path.exists():
+                raise TemplateError(f"{name}: missing plain-text body {text_path.name}")
+            templates[name] = EmailTemplate(
+                name=name,
+                subject=CompiledTemplate(f"{name}.subject", _read(subject_path).strip()),
+                text=CompiledTemplate(f"{name}.txt", _read(text_path)),
+                html=CompiledTemplate(f"{name}.html", _read(html_path), _as_html) if html_path.exists() else None,
+            )
+        with self._lock:
+            self._templates = templates
+        return templates
+
+    def get(self, name: str) -> EmailTemplate:
+        templates = self._templates
+        if templates is None:
+            templates = self.load()
+        try:
+            return templates[name]
+        except KeyError:
+            raise TemplateError(f"Unknown email template {name!r}") from None
+
+    def render(self, name: str, **values: object) -> RenderedEmail:
+        return self.get(name).render(**values)
+
+    def names(self) -> Tuple[str, ...]:
+        return tuple(sorted(self._templates or ()))
+
+
+# Singleton-like instance for app-wide use
+email_templates = TemplateRegistry()
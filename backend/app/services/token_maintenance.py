@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable
+
+from sqlalchemy import TextClause, text
+from app.core.db import engine
+from app.core.settings import settings
+from app.services import token_store
+from app.services.periodic import PeriodicWorker
+from app.services.token_store import TokenKind
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KINDS = (
+    token_store.EMAIL_VERIFICATION,
+    token_store.PASSWORD_RESET,
+    token_store.INVITATION,
+    token_store.AUTH_SESSION,
+)
+
+
+def _delete_sql(kind: TokenKind) -> TextClause:
+    # Every token expires (consumed ones included), so one range seek on the
+    # ExpiresAt index finds everything that is both dead and past retention.
+    # Rows younger than a day are never touched, which keeps the resend/reset/
+    # invite counts in rate_limiter's SQL store intact.
+    return text(
+        f"DELETE TOP (:n) FROM {kind.table} "
+        f"WHERE ExpiresAt < DATEADD(day, -:days, {kind.now_sql})"
+    )
+
+
+class TokenCompactor(PeriodicWorker):
+    """Deletes expired and consumed auth tokens in short batches.
+
+    Each batch of at most ``batch_size`` rows is its own transaction, so row
+    locks are held briefly and never escalate to a table lock; ``pause_seconds``
+    between batches leaves room for foreground traffic.
+    """
+
+    thread_name = "token-compactor"
+
+    def __init__(
+        self,
+        bind=engine,
+        kinds: Iterable[TokenKind] = TOKEN_KINDS,
+        batch_size: int = 500,
+        retention_days: int = 7,
+        interval_seconds: float = 3600.0,
+        pause_seconds: float = 0.05,
+    ) -> None:
+        super().__init__(interval_seconds)
+        self._bind = bind
+        self._kinds = tuple(kinds)
+        self._batch_size = batch_size
+        self._retention_days = max(1, retention_days)
+        self._pause = pause_seconds
+        self._lock = threading.Lock()
+        self._deleted: Dict[str, int] = {k.table: 0 for k in self._kinds}
+        self._counters = {"runs": 0, "batches": 0, "errors": 0}
+        self._last_run: Dict[str, object] = {}
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._counters,
+                "deleted": dict(self._deleted),
+                "last_run": dict(self._last_run),
+                "retention_days": self._retention_days,
+                "running": self.running,
+            }
+
+    def compact(self, kind: TokenKind) -> int:
+        """Delete one table's dead tokens batch by batch; returns rows removed."""
+        sql = _delete_sql(kind)
+        total = 0
+        while not self._stopping.is_set():
+            with self._bind.begin() as conn:
+                deleted = conn.execute(sql, {"n": self._batch_size, "days": self._retention_days}).rowcount
+            deleted = max(deleted or 0, 0)
+            total += deleted
+            with self._lock:
+                self._counters["batches"] += 1
+                self._deleted[kind.table] += deleted
+            if deleted < self._batch_size:
+                break
+            if self._pause:
+                time.sleep(self._pause)
+        return total
+
+    def run_once(self) -> Dict[str, int]:
+        start = time.perf_counter()
+        result: Dict[str, int] = {}
+        for kind in self._kinds:
+            try:
+                result[kind.table] = self.compact(kind)
+            except Exception:
+                logger.exception("Token compaction failed for %s", kind.table)
+                with self._lock:
+                    self._counters["errors"] += 1
+        elapsed = time.perf_counter() - start
+        removed = sum(result.values())
+        with self._lock:
+            self._counters["runs"] += 1
+            self._last_run = {
+                "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "deleted": removed,
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(removed / elapsed, 1) if elapsed > 0 else 0.0,
+            }
+        if removed:
+            logger.info("Token compaction removed %s rows in %.2fs: %s", removed, elapsed, result)
+        return result
+
+    def tick(self) -> bool:
+        self.run_once()
+        return False
+
+
+# Singleton-like instance for app-wide use
+token_compactor = TokenCompactor(
+    batch_size=settings.token_cleanup_batch_size,
+    retention_days=settings.token_retention_days,
+    interval_seconds=settings.token_cleanup_interval_seconds,
+)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import secrets
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import TextClause, text
+
+
+@dataclass(frozen=True)
+class TokenKind:
+    table: str
+    id_column: str
+    # GETUTCDATE() or GETDATE(), matching how the table's timestamps are read
+    now_sql: str = "GETUTCDATE()"
+
+
+EMAIL_VERIFICATION = TokenKind("emailverificationtoken", "Id")
+PASSWORD_RESET = TokenKind("passwordresettoken", "Id", now_sql="GETDATE()")
+INVITATION = TokenKind("Invitation", "InvitationID")
+AUTH_SESSION = TokenKind("AuthSession", "SessionID")
+
+
+def token_hash(token: str) -> str:
+    """Fixed-width lookup key (64 hex chars) for a raw token."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _insert_sql(kind: TokenKind, columns: Tuple[str, ...]) -> TextClause:
+    cols = ", ".join(columns)
+    binds = ", ".join(f":{c}" for c in columns)
+    return text(
+        f"INSERT INTO {kind.table} ({cols}, Token, TokenHash, ConsumedAt, CreatedAt) "
+        f"OUTPUT INSERTED.{kind.id_column} "
+        f"VALUES ({binds}, :token_hash, :token_hash, NULL, {kind.now_sql})"
+    )
+
+
+@lru_cache(maxsize=None)
+def _find_sql(kind: TokenKind, columns: Tuple[str, ...], with_user_email: bool) -> TextClause:
+    select = [f"t.{kind.id_column} AS TokenID", "t.ExpiresAt", "t.ConsumedAt"]
+    select += [f"t.{c}" for c in columns]
+    joins = ""
+    if with_user_email:
+        select.append("u.Email")
+        joins = " JOIN [User] u ON u.UserID = t.UserID"
+    return text(
+        f"SELECT {', '.join(select)} FROM {kind.table} t{joins} "
+        "WHERE t.TokenHash = :token_hash"
+    )
+
+
+def issue(
+    conn, kind: TokenKind, values: Dict[str, Any], expires_at: datetime
+) -> Tuple[str, Optional[int]]:
+    """Insert a new token row and return (raw token, row id).
+
+    Only the digest is stored (in both Token and TokenHash); the raw token
+    exists solely in the link sent to the user.
+    """
+    raw = secrets.token_urlsafe(32)
+    params = {**values, "ExpiresAt": expires_at, "token_hash": token_hash(raw)}
+    columns = tuple(values) + ("ExpiresAt",)
+    row_id = conn.execute(_insert_sql(kind, columns), params).scalar()
+    return raw, (int(row_id) if row_id is not None else None)
+
+
+def find(
+    conn,
+    kind: TokenKind,
+    token: str,
+    columns: Tuple[str, ...] = (),
+    with_user_email: bool = False,
+) -> Optional[Mapping[str, Any]]:
+    """Single index seek on TokenHash; returns TokenID, ExpiresAt, ConsumedAt plus ``columns``."""
+    if not token:
+        return None
+    return conn.execute(
+        _find_sql(kind, tuple(columns), with_user_email), {"token_hash": token_hash(token)}
+    ).mappings().first()
+
+
+def consume(conn, kind: TokenKind, token_id: int) -> bool:
+    """Mark a token used; False if another request consumed it first."""
+    result = conn.execute(
+        text(
+            f"UPDATE {kind.table} SET ConsumedAt = {kind.now_sql} "
+            f"WHERE {kind.id_column} = :id AND ConsumedAt IS NULL"
+        ),
+        {"id": token_id},
+    )
+    return result.rowcount == 1
+
+
+def expire_outstanding(conn, kind: TokenKind, user_id: int) -> int:
+    """Expire a user's unused tokens of ``kind`` (e.g. after a password change)."""
+    result = conn.execute(
+        text(
+            f"UPDATE {kind.table} SET ExpiresAt = {kind.now_sql} "
+            f"WHERE UserID = :uid AND ConsumedAt IS NULL AND ExpiresAt > {kind.now_sql}"
+        ),
+        {"uid": user_id},
+    )
+    return result.rowcount
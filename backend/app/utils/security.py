@@ -1,13 +1,21 @@
 import hashlib
 import secrets
 from jose import jwt
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from passlib.context import CryptContext
 
+from app.core.settings import settings
+
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def _new_hash(password: str) -> str:
+    # Cost factor (log2 rounds) is read per call so it always matches
+    # needs_rehash; see scripts/bench_bcrypt_cost.py
+    return pwd_context.using(bcrypt__rounds=settings.password_bcrypt_rounds).hash(password)
+
+
 def generate_salt() -> str:
     return secrets.token_hex(16)
 
@@ -18,7 +26,7 @@ def hash_password(salt: str, password: str) -> str:  # noqa: ARG001
     The salt parameter is ignored for new hashes but preserved for API
     compatibility.
     """
-    return pwd_context.hash(password)
+    return _new_hash(password)
 
 
 def verify_password(salt: str, stored_hash: str, password: str) -> bool:
@@ -40,6 +48,36 @@ def verify_password(salt: str, stored_hash: str, password: str) -> bool:
     return stored_hash == legacy
 
 
+def bcrypt_cost(stored_hash: str) -> Optional[int]:
+    """Cost factor encoded in a ``$2b$12$...`` hash, or None if not bcrypt."""
+    parts = (stored_hash or "").split("$")
+    if len(parts) < 4 or not parts[1].startswith("2"):
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """Legacy sha256 hashes and bcrypt hashes below the configured cost.
+
+    Hashes above the configured cost are kept; lowering the setting should
+    not weaken existing passwords.
+    """
+    cost = bcrypt_cost(stored_hash)
+    return cost is None or cost < settings.password_bcrypt_rounds
+
+
+def verify_and_upgrade(salt: str, stored_hash: str, password: str) -> Tuple[bool, Optional[str]]:
+    """Verify, and on success return a replacement hash when the stored one is outdated."""
+    if not verify_password(salt, stored_hash, password):
+        return False, None
+    if needs_rehash(stored_hash):
+        return True, _new_hash(password)
+    return True, None
+
+
 def create_jwt_token(payload: Dict[str, Any], secret: str) -> str:
     return jwt.encode(payload, secret, algorithm="HS256")
 
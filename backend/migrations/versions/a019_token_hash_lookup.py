@@ -0,0 +1,81 @@
+"""Add TokenHash digest columns with unique indexes for token lookups
+
+Revision ID: a019_token_hash_lookup
+Revises: a018_add_organization_billing_fields
+Create Date: 2025-10-02
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a019_token_hash_lookup"
+down_revision: Union[str, Sequence[str], None] = "a018_add_organization_billing_fields"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, primary key column)
+TOKEN_TABLES = (
+    ("EmailVerificationToken", "Id"),
+    ("PasswordResetToken", "Id"),
+    ("Invitation", "InvitationID"),
+)
+
+
+def _backfill_in_python(bind, table: str, pk: str) -> None:
+    rows = bind.execute(
+        sa.text(f"SELECT {pk}, Token FROM {table} WHERE TokenHash IS NULL")
+    ).all()
+    for pk_value, token in rows:
+        bind.execute(
+            sa.text(f"UPDATE {table} SET TokenHash = :h WHERE {pk} = :id"),
+            {"h": hashlib.sha256(str(token).encode("utf-8")).hexdigest(), "id": pk_value},
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    inspector = sa.inspect(bind)
+
+    for table, pk in TOKEN_TABLES:
+        if not inspector.has_table(table):
+            continue
+        columns = {c["name"].lower() for c in inspector.get_columns(table)}
+        if "tokenhash" not in columns:
+            op.add_column(table, sa.Column("TokenHash", sa.String(length=64), nullable=True))
+
+        # Existing rows hold raw tokens; store their SHA-256 (lowercase hex)
+        if dialect == "mssql":
+            op.execute(
+                f"UPDATE {table} SET TokenHash = LOWER(CONVERT(varchar(64), "
+                f"HASHBYTES('SHA2_256', CAST(Token AS varchar(128))), 2)) "
+                "WHERE TokenHash IS NULL"
+            )
+            op.execute(
+                f"CREATE UNIQUE INDEX UX_{table}_TokenHash ON {table}(TokenHash) "
+                "WHERE TokenHash IS NOT NULL"
+            )
+        else:
+            _backfill_in_python(bind, table, pk)
+            op.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS UX_{table}_TokenHash ON {table}(TokenHash)"
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    inspector = sa.inspect(bind)
+
+    for table, _ in reversed(TOKEN_TABLES):
+        if not inspector.has_table(table):
+            continue
+        if dialect == "mssql":
+            op.execute(f"DROP INDEX UX_{table}_TokenHash ON {table}")
+        else:
+            op.execute(f"DROP INDEX IF EXISTS UX_{table}_TokenHash")
+        op.drop_column(table, "TokenHash")
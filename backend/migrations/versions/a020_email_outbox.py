@@ -0,0 +1,52 @@
+"""Create EmailOutbox table for transactional email delivery
+
+Revision ID: a020_email_outbox
+Revises: a019_token_hash_lookup
+Create Date: 2025-10-03
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a020_email_outbox"
+down_revision: Union[str, Sequence[str], None] = "a019_token_hash_lookup"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    inspector = sa.inspect(bind)
+    utc_default = sa.text("CURRENT_TIMESTAMP") if dialect == "sqlite" else sa.text("GETUTCDATE()")
+
+    if inspector.has_table("EmailOutbox"):
+        return
+    op.create_table(
+        "EmailOutbox",
+        sa.Column("OutboxID", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("ToAddress", sa.String(length=320), nullable=False),
+        sa.Column("Subject", sa.Unicode(length=500), nullable=False),
+        sa.Column("BodyText", sa.UnicodeText(), nullable=False),
+        sa.Column("BodyHtml", sa.UnicodeText(), nullable=True),
+        sa.Column("OrganizationID", sa.BigInteger(), nullable=True),
+        # pending -> sent | dead
+        sa.Column("Status", sa.String(length=20), nullable=False, server_default="pending"),
+        sa.Column("Attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("NextAttemptAt", sa.DateTime(), nullable=False, server_default=utc_default),
+        sa.Column("LastError", sa.Unicode(length=1000), nullable=True),
+        sa.Column("CreatedAt", sa.DateTime(), nullable=False, server_default=utc_default),
+        sa.Column("SentAt", sa.DateTime(), nullable=True),
+    )
+    # Dispatcher claim: due pending rows in NextAttemptAt order
+    op.create_index("IX_EmailOutbox_Status_Next", "EmailOutbox", ["Status", "NextAttemptAt"])
+    # Dead-letter listing per organization
+    op.create_index("IX_EmailOutbox_Org_Status", "EmailOutbox", ["OrganizationID", "Status"])
+
+
+def downgrade() -> None:
+    op.drop_index("IX_EmailOutbox_Org_Status", table_name="EmailOutbox")
+    op.drop_index("IX_EmailOutbox_Status_Next", table_name="EmailOutbox")
+    op.drop_table("EmailOutbox")
@@ -0,0 +1,32 @@
+"""Index Invitation.ExpiresAt for batched token cleanup
+
+Revision ID: a021_invitation_expires_index
+Revises: a020_email_outbox
+Create Date: 2025-10-06
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a021_invitation_expires_index"
+down_revision: Union[str, Sequence[str], None] = "a020_email_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("Invitation"):
+        return
+    existing = {ix["name"] for ix in inspector.get_indexes("Invitation")}
+    # The token tables already index ExpiresAt (a008); the cleanup job's
+    # range delete needs the same on Invitation
+    if "IX_Invitation_Expires" not in existing:
+        op.create_index("IX_Invitation_Expires", "Invitation", ["ExpiresAt"])
+
+
+def downgrade() -> None:
+    op.drop_index("IX_Invitation_Expires", table_name="Invitation")
@@ -0,0 +1,136 @@
+"""Partition AuthEvent by month and seed its retention setting
+
+Revision ID: a022_auth_event_partitioning
+Revises: a021_invitation_expires_index
+Create Date: 2025-10-07
+"""
+from datetime import datetime
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a022_auth_event_partitioning"
+down_revision: Union[str, Sequence[str], None] = "a021_invitation_expires_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITION_FUNCTION = "PF_AuthEvent_Month"
+PARTITION_SCHEME = "PS_AuthEvent_Month"
+# Empty partitions created ahead of the current month; the archiver keeps
+# extending this so new rows never land in the open-ended last partition
+MONTHS_AHEAD = 3
+SECONDARY_INDEXES = (
+    ("IX_AuthEvent_Email", "Email"),
+    ("IX_AuthEvent_EventType", "EventType"),
+    ("IX_AuthEvent_Status", "Status"),
+)
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _boundaries(first: datetime, last: datetime) -> List[str]:
+    out = []
+    month = _month_start(first)
+    while month <= last:
+        out.append(f"'{month:%Y-%m-%dT%H:%M:%S}'")
+        month = _add_months(month, 1)
+    return out
+
+
+def _seed_retention() -> None:
+    op.execute(
+        "INSERT INTO GlobalSetting (SettingKey, SettingValue, ValueType, Scope) "
+        "SELECT 'auth_event_retention_months', '12', 'int', 'global' "
+        "WHERE NOT EXISTS (SELECT 1 FROM GlobalSetting "
+        "WHERE COALESCE(SettingKey, [Key]) = 'auth_event_retention_months')"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    inspector = sa.inspect(bind)
+
+    if inspector.has_table("GlobalSetting"):
+        _seed_retention()
+    if dialect != "mssql" or not inspector.has_table("AuthEvent"):
+        # Other databases keep the plain table; the archiver deletes by range
+        return
+    exists = bind.execute(
+        sa.text("SELECT 1 FROM sys.partition_functions WHERE name = :n"), {"n": PARTITION_FUNCTION}
+    ).first()
+    if exists:
+        return
+
+    now = datetime.utcnow()
+    oldest = bind.execute(sa.text("SELECT MIN(CreatedDate) FROM AuthEvent")).scalar() or now
+    values = ", ".join(_boundaries(oldest, _add_months(_month_start(now), MONTHS_AHEAD)))
+    op.execute(
+        f"CREATE PARTITION FUNCTION {PARTITION_FUNCTION} (datetime) AS RANGE RIGHT FOR VALUES ({values})"
+    )
+    op.execute(f"CREATE PARTITION SCHEME {PARTITION_SCHEME} AS PARTITION {PARTITION_FUNCTION} ALL TO ([PRIMARY])")
+
+    # The partition column must be part of the clustered key and of every
+    # unique index, so the identity PK becomes (AuthEventID, CreatedDate)
+    pk = bind.execute(
+        sa.text(
+            "SELECT name FROM sys.key_constraints "
+            "WHERE parent_object_id = OBJECT_ID('AuthEvent') AND type = 'PK'"
+        )
+    ).scalar()
+    if pk:
+        op.execute(f"ALTER TABLE AuthEvent DROP CONSTRAINT [{pk}]")
+    if "IX_AuthEvent_CreatedDate" in {ix["name"] for ix in inspector.get_indexes("AuthEvent")}:
+        op.drop_index("IX_AuthEvent_CreatedDate", table_name="AuthEvent")
+    op.execute("UPDATE AuthEvent SET CreatedDate = GETUTCDATE() WHERE CreatedDate IS NULL")
+    op.execute("ALTER TABLE AuthEvent ALTER COLUMN CreatedDate datetime NOT NULL")
+    op.execute(
+        f"CREATE CLUSTERED INDEX CX_AuthEvent_CreatedDate ON AuthEvent (CreatedDate, AuthEventID) "
+        f"ON {PARTITION_SCHEME}(CreatedDate)"
+    )
+    op.execute(
+        "ALTER TABLE AuthEvent ADD CONSTRAINT PK_AuthEvent PRIMARY KEY NONCLUSTERED (AuthEventID, CreatedDate) "
+        f"ON {PARTITION_SCHEME}(CreatedDate)"
+    )
+    # Aligned secondary indexes let the archiver truncate a single partition
+    for name, column in SECONDARY_INDEXES:
+        op.execute(
+            f"CREATE INDEX {name} ON AuthEvent ({column}) WITH (DROP_EXISTING = ON) "
+            f"ON {PARTITION_SCHEME}(CreatedDate)"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    inspector = sa.inspect(bind)
+
+    if inspector.has_table("GlobalSetting"):
+        op.execute(
+            "DELETE FROM GlobalSetting WHERE COALESCE(SettingKey, [Key]) = 'auth_event_retention_months'"
+        )
+    if dialect != "mssql" or not inspector.has_table("AuthEvent"):
+        return
+    exists = bind.execute(
+        sa.text("SELECT 1 FROM sys.partition_functions WHERE name = :n"), {"n": PARTITION_FUNCTION}
+    ).first()
+    if not exists:
+        return
+
+    op.execute("ALTER TABLE AuthEvent DROP CONSTRAINT PK_AuthEvent")
+    op.execute("DROP INDEX CX_AuthEvent_CreatedDate ON AuthEvent")
+    for name, column in SECONDARY_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON AuthEvent ({column}) WITH (DROP_EXISTING = ON) ON [PRIMARY]")
+    op.execute("ALTER TABLE AuthEvent ADD CONSTRAINT PK_AuthEvent PRIMARY KEY CLUSTERED (AuthEventID)")
+    op.create_index("IX_AuthEvent_CreatedDate", "AuthEvent", ["CreatedDate"])
+    op.execute(f"DROP PARTITION SCHEME {PARTITION_SCHEME}")
+    op.execute(f"DROP PARTITION FUNCTION {PARTITION_FUNCTION}")
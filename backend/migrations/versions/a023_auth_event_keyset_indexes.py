@@ -0,0 +1,81 @@
+"""Keyset indexes for AuthEvent audit filters
+
+Revision ID: a023_auth_event_keyset_indexes
+Revises: a022_auth_event_partitioning
+Create Date: 2025-10-08
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a023_auth_event_keyset_indexes"
+down_revision: Union[str, Sequence[str], None] = "a022_auth_event_partitioning"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITION_SCHEME = "PS_AuthEvent_Month"
+
+# Each supported equality filter followed by the page order, so
+# "WHERE <filter> ORDER BY CreatedDate DESC, AuthEventID DESC" is a seek plus
+# TOP (n) and its COUNT is answered from the index alone. Unfiltered and
+# date-only listings use the clustered (CreatedDate, AuthEventID) key.
+KEYSET_INDEXES = (
+    ("IX_AuthEvent_Org_Created", ["OrganizationID", "CreatedDate", "AuthEventID"]),
+    ("IX_AuthEvent_Email_Created", ["Email", "CreatedDate", "AuthEventID"]),
+    ("IX_AuthEvent_User_Created", ["UserID", "CreatedDate", "AuthEventID"]),
+    ("IX_AuthEvent_Type_Created", ["EventType", "Status", "CreatedDate", "AuthEventID"]),
+)
+# Leading-column prefixes of the new indexes
+SUPERSEDED = (("IX_AuthEvent_Email", ["Email"]), ("IX_AuthEvent_EventType", ["EventType"]))
+
+
+def _partitioned(bind, dialect: str) -> bool:
+    if dialect != "mssql":
+        return False
+    return bind.execute(
+        sa.text("SELECT 1 FROM sys.partition_schemes WHERE name = :n"), {"n": PARTITION_SCHEME}
+    ).first() is not None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("AuthEvent"):
+        return
+    existing = {ix["name"] for ix in inspector.get_indexes("AuthEvent")}
+    partitioned = _partitioned(bind, dialect)
+
+    for name, columns in KEYSET_INDEXES:
+        if name in existing:
+            continue
+        if partitioned:
+            # Stay aligned so the archiver can still truncate single partitions
+            op.execute(
+                f"CREATE INDEX {name} ON AuthEvent ({', '.join(columns)}) "
+                f"ON {PARTITION_SCHEME}(CreatedDate)"
+            )
+        else:
+            op.create_index(name, "AuthEvent", columns)
+    for name, _ in SUPERSEDED:
+        if name in existing:
+            op.drop_index(name, table_name="AuthEvent")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    partitioned = _partitioned(bind, dialect)
+
+    for name, columns in SUPERSEDED:
+        if partitioned:
+            op.execute(
+                f"CREATE INDEX {name} ON AuthEvent ({', '.join(columns)}) "
+                f"ON {PARTITION_SCHEME}(CreatedDate)"
+            )
+        else:
+            op.create_index(name, "AuthEvent", columns)
+    for name, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(name, table_name="AuthEvent")
@@ -0,0 +1,54 @@
+"""Create AuthSession table for rotating refresh tokens
+
+Revision ID: a024_auth_session
+Revises: a023_auth_event_keyset_indexes
+Create Date: 2025-10-09
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a024_auth_session"
+down_revision: Union[str, Sequence[str], None] = "a023_auth_event_keyset_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    inspector = sa.inspect(bind)
+    utc_default = sa.text("CURRENT_TIMESTAMP") if dialect == "sqlite" else sa.text("GETUTCDATE()")
+
+    if inspector.has_table("AuthSession"):
+        return
+    op.create_table(
+        "AuthSession",
+        sa.Column("SessionID", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("UserID", sa.BigInteger(), sa.ForeignKey("[User].UserID"), nullable=False),
+        # All tokens issued from one login share a family; reuse revokes it
+        sa.Column("FamilyID", sa.String(length=32), nullable=False),
+        # SHA-256 hex of the refresh token; the raw token is never stored
+        sa.Column("TokenHash", sa.String(length=64), nullable=False),
+        sa.Column("ExpiresAt", sa.DateTime(), nullable=False),
+        sa.Column("RotatedAt", sa.DateTime(), nullable=True),
+        sa.Column("RevokedAt", sa.DateTime(), nullable=True),
+        sa.Column("IP", sa.String(length=64), nullable=True),
+        sa.Column("UserAgent", sa.String(length=256), nullable=True),
+        sa.Column("CreatedAt", sa.DateTime(), nullable=False, server_default=utc_default),
+    )
+    op.create_index("UX_AuthSession_TokenHash", "AuthSession", ["TokenHash"], unique=True)
+    op.create_index("IX_AuthSession_Family", "AuthSession", ["FamilyID"])
+    op.create_index("IX_AuthSession_User", "AuthSession", ["UserID"])
+    # Token cleanup job deletes by ExpiresAt
+    op.create_index("IX_AuthSession_Expires", "AuthSession", ["ExpiresAt"])
+
+
+def downgrade() -> None:
+    op.drop_index("IX_AuthSession_Expires", table_name="AuthSession")
+    op.drop_index("IX_AuthSession_User", table_name="AuthSession")
+    op.drop_index("IX_AuthSession_Family", table_name="AuthSession")
+    op.drop_index("UX_AuthSession_TokenHash", table_name="AuthSession")
+    op.drop_table("AuthSession")
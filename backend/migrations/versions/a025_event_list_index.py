@@ -0,0 +1,42 @@
+"""Keyset index for the org event listing
+
+Revision ID: a025_event_list_index
+Revises: a024_auth_session
+Create Date: 2025-10-10
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a025_event_list_index"
+down_revision: Union[str, Sequence[str], None] = "a024_auth_session"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "IX_Event_Org_Created"
+KEY = ["OrganizationID", "CreatedDate", "EventID"]
+# Covers the soft-delete predicate and the ETag's MAX(LastUpdated)
+INCLUDE = ["IsDeleted", "LastUpdated"]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name if bind is not None else ""
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("Event"):
+        return
+    if INDEX in {ix["name"] for ix in inspector.get_indexes("Event")}:
+        return
+    columns = {c["name"].lower() for c in inspector.get_columns("Event")}
+    if dialect == "mssql":
+        include = [c for c in INCLUDE if c.lower() in columns]
+        suffix = f" INCLUDE ({', '.join(include)})" if include else ""
+        op.execute(f"CREATE INDEX {INDEX} ON [Event] ({', '.join(KEY)}){suffix}")
+    else:
+        op.create_index(INDEX, "Event", KEY)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name="Event")
@@ -0,0 +1,37 @@
+"""Create RateLimitCounter for the SQL rate-limit backend
+
+Revision ID: a026_rate_limit_counter
+Revises: a025_event_list_index
+Create Date: 2025-10-12
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a026_rate_limit_counter"
+down_revision: Union[str, Sequence[str], None] = "a025_event_list_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if inspector.has_table("RateLimitCounter"):
+        return
+    # One row per (rule, key); hits are counted with a conditional UPDATE ... OUTPUT
+    op.create_table(
+        "RateLimitCounter",
+        sa.Column("RuleName", sa.String(length=64), nullable=False),
+        sa.Column("KeyValue", sa.String(length=128), nullable=False),
+        sa.Column("WindowStart", sa.DateTime(), nullable=False),
+        sa.Column("Hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("LastHitAt", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("RuleName", "KeyValue", name="PK_RateLimitCounter"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("RateLimitCounter")
@@ -0,0 +1,31 @@
+"""Add EmailOutbox.ClaimToken so only the current lease holder can mark a row
+
+Revision ID: a027_outbox_claim_token
+Revises: a026_rate_limit_counter
+Create Date: 2025-10-12
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a027_outbox_claim_token"
+down_revision: Union[str, Sequence[str], None] = "a026_rate_limit_counter"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("EmailOutbox"):
+        return
+    if "claimtoken" in {c["name"].lower() for c in inspector.get_columns("EmailOutbox")}:
+        return
+    # Stamped by each claim; mark statements only touch rows still holding it
+    op.add_column("EmailOutbox", sa.Column("ClaimToken", sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("EmailOutbox", "ClaimToken")
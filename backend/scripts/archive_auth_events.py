@@ -0,0 +1,26 @@
+"""Archive AuthEvent months past retention once and print what was moved.
+
+Same job the app runs in the background (AUTH_EVENT_ARCHIVE_INTERVAL_SECONDS);
+use this from cron when the background job is disabled.
+
+Usage (from backend/):
+    python scripts/archive_auth_events.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.audit_archive import auth_event_archiver  # noqa: E402
+
+
+def main() -> None:
+    result = auth_event_archiver.run_once()
+    for month, rows in result.items():
+        print(f"{month}: {rows} rows archived")
+    stats = auth_event_archiver.stats()
+    print(f"archive dir: {stats['archive_dir']}, errors: {stats['errors']}, {stats['last_run']['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
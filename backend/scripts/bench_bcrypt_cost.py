@@ -0,0 +1,81 @@
+"""bcrypt cost benchmark: hashes/sec per core and verify latency per cost.
+
+For each candidate cost the script times serial verifies on one core
+(p50/p99 latency, hashes/sec) and then runs ``--workers`` threads in
+parallel (bcrypt releases the GIL) to show throughput per worker under
+contention, which is what PASSWORD_HASH_WORKERS caps in production. It ends
+with the highest cost whose p99 stays within ``--p99-ms``.
+
+Usage (from backend/):
+    python scripts/bench_bcrypt_cost.py [--costs 10 11 12 13] [--samples 20]
+                                        [--workers 4] [--p99-ms 250]
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.hash import bcrypt
+
+PASSWORD = "correct horse battery staple"
+
+
+def _percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _timed_verify(stored: str) -> float:
+    start = time.perf_counter()
+    bcrypt.verify(PASSWORD, stored)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def bench(cost: int, samples: int, workers: int) -> dict:
+    stored = bcrypt.using(rounds=cost).hash(PASSWORD)
+    serial = [_timed_verify(stored) for _ in range(samples)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parallel = list(pool.map(_timed_verify, [stored] * samples * workers))
+    wall = time.perf_counter() - start
+
+    return {
+        "cost": cost,
+        "p50_ms": statistics.median(serial),
+        "p99_ms": _percentile(serial, 99),
+        "per_core_hps": 1000.0 / statistics.mean(serial),
+        "parallel_p99_ms": _percentile(parallel, 99),
+        "parallel_hps": len(parallel) / wall,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--costs", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--samples", type=int, default=20, help="verifies per cost on one core")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--p99-ms", type=float, default=250.0, help="login hash budget")
+    args = parser.parse_args()
+
+    print(f"cpus={os.cpu_count()} workers={args.workers} samples={args.samples}")
+    print(f"{'cost':>4} {'p50 ms':>9} {'p99 ms':>9} {'hash/s/core':>12} {'par p99 ms':>11} {'par hash/s':>11}")
+    best = None
+    for cost in sorted(args.costs):
+        r = bench(cost, args.samples, args.workers)
+        print(
+            f"{r['cost']:>4} {r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['per_core_hps']:>12.1f} "
+            f"{r['parallel_p99_ms']:>11.1f} {r['parallel_hps']:>11.1f}"
+        )
+        if r["parallel_p99_ms"] <= args.p99_ms:
+            best = cost
+    if best is None:
+        print(f"no candidate meets p99 <= {args.p99_ms:g} ms under {args.workers} workers")
+    else:
+        print(f"highest cost within p99 <= {args.p99_ms:g} ms: PASSWORD_BCRYPT_ROUNDS={best}")
+
+
+if __name__ == "__main__":
+    main()
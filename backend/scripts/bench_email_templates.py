@@ -0,0 +1,70 @@
+"""Render benchmark for the precompiled email templates.
+
+Compares rendering the invitation mail (subject, plain and HTML parts)
+through the template registry with substituting the variables into the raw
+template text on every call.
+
+Usage (from backend/):
+    python scripts/bench_email_templates.py [iterations]
+"""
+import html
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.templating import TEMPLATE_DIR, TemplateRegistry  # noqa: E402
+
+
+def _values(i: int) -> dict:
+    return {
+        "inviter_name": f"Admin {i}",
+        "inviter_contact": f"Admin {i}",
+        "accept_url": f"http://localhost:3000/invite/accept?token=tok{i:08d}",
+        "ttl_hours": 72,
+    }
+
+
+def _substitute(values: dict, source: str, escape: bool) -> str:
+    # Scans the whole template once per variable on every mail
+    out = source
+    for key, value in values.items():
+        value = html.escape(str(value)) if escape else str(value)
+        out = out.replace("{{ " + key + " }}", value)
+    return out
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    registry = TemplateRegistry()
+
+    start = time.perf_counter()
+    registry.load()
+    load_ms = (time.perf_counter() - start) * 1000.0
+    template = registry.get("invitation")
+    sources = [
+        ((TEMPLATE_DIR / f"invitation{suffix}").read_text(encoding="utf-8"), suffix == ".html")
+        for suffix in (".subject.txt", ".txt", ".html")
+    ]
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        template.render(**_values(i))
+    compiled_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        values = _values(i)
+        for source, escape in sources:
+            _substitute(values, source, escape)
+    naive_s = time.perf_counter() - start
+
+    print(f"templates loaded: {', '.join(registry.names())} in {load_ms:.2f} ms")
+    print(f"iterations: {iterations}")
+    print(f"compiled (subject+text+html): {compiled_s / iterations * 1e6:8.2f} us/mail")
+    print(f"per-call substitution:        {naive_s / iterations * 1e6:8.2f} us/mail")
+
+
+if __name__ == "__main__":
+    main()
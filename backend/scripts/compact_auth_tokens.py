@@ -0,0 +1,26 @@
+"""Delete expired/consumed auth tokens once and print what was removed.
+
+Same job the app runs in the background (TOKEN_CLEANUP_INTERVAL_SECONDS);
+use this from cron when the background job is disabled.
+
+Usage (from backend/):
+    python scripts/compact_auth_tokens.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.token_maintenance import token_compactor  # noqa: E402
+
+
+def main() -> None:
+    result = token_compactor.run_once()
+    for table, deleted in result.items():
+        print(f"{table}: {deleted} rows deleted")
+    last = token_compactor.stats()["last_run"]
+    print(f"total: {last['deleted']} rows in {last['seconds']}s ({last['rows_per_second']} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import gzip
+import json
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.services.audit_archive import AuthEventArchiver, add_months, cold_months
+
+
+class TestAuthEventArchive:
+    """Retention month arithmetic and the NDJSON export."""
+
+    def test_add_months_crosses_years(self):
+        assert add_months(datetime(2025, 11, 1), 3) == datetime(2026, 2, 1)
+        assert add_months(datetime(2025, 1, 1), -1) == datetime(2024, 12, 1)
+
+    def test_cold_months_keep_current_month_inside_retention(self):
+        now = datetime(2025, 10, 15)
+        months = cold_months(datetime(2025, 5, 20), now, retention_months=3)
+        # Retained: Aug, Sep, Oct
+        assert months == [datetime(2025, 5, 1), datetime(2025, 6, 1), datetime(2025, 7, 1)]
+        assert cold_months(None, now, 3) == []
+        assert cold_months(datetime(2025, 9, 1), now, 3) == []
+
+    def test_export_month_writes_gzipped_ndjson(self, tmp_path):
+        bind = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        with bind.begin() as conn:
+            conn.execute(
+                text("CREATE TABLE AuthEvent (AuthEventID INTEGER PRIMARY KEY, EventType TEXT, CreatedDate DATETIME)")
+            )
+            conn.execute(
+                text("INSERT INTO AuthEvent VALUES (:id, 'login_success', :d)"),
+                [{"id": 1, "d": datetime(2025, 1, 3)}, {"id": 2, "d": datetime(2025, 1, 31, 23)},
+                 {"id": 3, "d": datetime(2025, 2, 1)}],
+            )
+        archiver = AuthEventArchiver(bind=bind, archive_dir=str(tmp_path))
+        path, rows, size = archiver.export_month(datetime(2025, 1, 1), datetime(2025, 2, 1))
+        assert rows == 2 and size > 0
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            ids = [json.loads(line)["AuthEventID"] for line in fh]
+        assert ids == [1, 2]
@@ -0,0 +1,38 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.routers.audit import _export_chunks, _gzip_chunks
+from app.services.audit_query import AUTH_EVENT_COLUMNS, AuthEventFilter
+
+
+def _engine():
+    bind = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with bind.begin() as conn:
+        conn.execute(text(f"CREATE TABLE AuthEvent ({', '.join(AUTH_EVENT_COLUMNS)})"))
+        conn.execute(
+            text("INSERT INTO AuthEvent (AuthEventID, OrganizationID, EventType, Status, CreatedDate) "
+                 "VALUES (:id, :org, 'login_success', 'success', :d)"),
+            [{"id": i, "org": 1 + i % 2, "d": datetime(2025, 1, 1, 0, 0, i)} for i in range(1, 7)],
+        )
+    return bind
+
+
+class TestAuditExport:
+    """Streamed CSV/NDJSON bodies for /audit/auth/export."""
+
+    def test_ndjson_respects_filters_in_order(self):
+        body = b"".join(_export_chunks(_engine(), AuthEventFilter.build(org_id=2), "ndjson"))
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        assert [r["AuthEventID"] for r in rows] == [1, 3, 5]
+
+    def test_csv_gzip(self):
+        chunks = _gzip_chunks(_export_chunks(_engine(), AuthEventFilter.build(), "csv"))
+        rows = list(csv.reader(io.StringIO(gzip.decompress(b"".join(chunks)).decode())))
+        assert rows[0] == list(AUTH_EVENT_COLUMNS)
+        assert len(rows) == 7
@@ -0,0 +1,55 @@
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.services.audit_query import (
+    AuthEventCounter,
+    AuthEventFilter,
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    page_query,
+)
+
+
+class TestAuditQuery:
+    """Keyset cursors and filter building for the audit listing."""
+
+    def test_cursor_round_trip(self):
+        created = datetime(2025, 10, 1, 12, 30, 5, 997000)
+        cursor = encode_cursor(created, 4242)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created, 4242)
+
+    def test_bad_cursor_rejected(self):
+        with pytest.raises(InvalidCursor):
+            decode_cursor("not-a-cursor")
+
+    def test_page_query_seeks_past_cursor(self):
+        f = AuthEventFilter.build(org_id=7, from_=datetime(2025, 1, 1))
+        assert not f.date_only
+        sql, params = page_query(f, (datetime(2025, 2, 1), 10), 51)
+        assert "AuthEventID < :c_id" in str(sql)
+        assert "ORDER BY CreatedDate DESC, AuthEventID DESC" in str(sql)
+        assert params["org"] == 7 and params["limit"] == 51 and params["c_id"] == 10
+
+    def test_date_only_filters(self):
+        assert AuthEventFilter.build(to=datetime(2025, 1, 1)).date_only
+        assert AuthEventFilter.build().where == "1=1"
+
+    def test_estimate_miss_counts_in_background(self):
+        bind = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        with bind.begin() as conn:
+            conn.execute(text("CREATE TABLE AuthEvent (AuthEventID INTEGER PRIMARY KEY, Email TEXT)"))
+            conn.execute(text("INSERT INTO AuthEvent (Email) VALUES ('a@example.com'), ('a@example.com'), ('b')"))
+        counter = AuthEventCounter()
+        f = AuthEventFilter.build(email="a@example.com")
+        with bind.connect() as conn:
+            assert counter.estimate(conn, f) is None
+            deadline = time.monotonic() + 2.0
+            while counter.estimate(conn, f) is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert counter.estimate(conn, f) == 2
@@ -0,0 +1,149 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.services.audit_writer import (
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_INLINE,
+    AuthEventWriter,
+)
+
+
+@pytest.fixture
+def bind():
+    bind = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with bind.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE AuthEvent (AuthEventID INTEGER PRIMARY KEY, OrganizationID INT, UserID INT, "
+                "Email TEXT, EventType TEXT NOT NULL, Status TEXT, ReasonCode TEXT, RequestID TEXT, "
+                "IP TEXT, UserAgent TEXT, CreatedDate DATETIME)"
+            )
+        )
+    return bind
+
+
+def _row(event_type="login_success", **extra):
+    row = {
+        "org_id": None, "user_id": None, "email": None, "event_type": event_type, "status": "success",
+        "reason": None, "req_id": None, "ip": None, "ua": None,
+    }
+    row.update(extra)
+    return row
+
+
+def _types(bind):
+    with bind.connect() as conn:
+        return [r[0] for r in conn.execute(text("SELECT EventType FROM AuthEvent ORDER BY AuthEventID"))]
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestAuthEventWriter:
+    """Flush triggers, overflow policies, drain-on-stop and failure handling."""
+
+    def test_flushes_when_batch_size_is_reached(self, bind):
+        writer = AuthEventWriter(bind=bind, batch_size=3, flush_interval=60)
+        writer.start()
+        try:
+            for i in range(3):
+                writer.submit(_row(f"e{i}"))
+            assert _wait_for(lambda: len(_types(bind)) == 3)
+            assert writer.stats()["batches"] == 1
+        finally:
+            writer.stop()
+
+    def test_flushes_on_interval(self, bind):
+        writer = AuthEventWriter(bind=bind, batch_size=100, flush_interval=0.05)
+        writer.start()
+        try:
+            writer.submit(_row())
+            assert _wait_for(lambda: _types(bind) == ["login_success"])
+        finally:
+            writer.stop()
+
+    def test_stop_drains_the_queue(self, bind):
+        writer = AuthEventWriter(bind=bind, batch_size=2, flush_interval=60)
+        for i in range(5):
+            writer.submit(_row(f"e{i}"))
+        writer.start()
+        writer.stop()
+        assert _types(bind) == ["e0", "e1", "e2", "e3", "e4"]
+        assert writer.stats()["queue_depth"] == 0
+
+    def test_drop_newest_rejects_when_full(self, bind):
+        writer = AuthEventWriter(bind=bind, max_queue=2)
+        assert writer.submit(_row("a")) and writer.submit(_row("b"))
+        assert writer.submit(_row("c")) is False
+        writer.flush()
+        assert _types(bind) == ["a", "b"] and writer.stats()["dropped"] == 1
+
+    def test_drop_oldest_evicts_head(self, bind):
+        writer = AuthEventWriter(bind=bind, max_queue=2, overflow=OVERFLOW_DROP_OLDEST)
+        for name in ("a", "b", "c"):
+            assert writer.submit(_row(name))
+        writer.flush()
+        assert _types(bind) == ["b", "c"] and writer.stats()["dropped"] == 1
+
+    def test_inline_writes_on_caller_thread(self, bind):
+        writer = AuthEventWriter(bind=bind, max_queue=1, overflow=OVERFLOW_INLINE)
+        writer.submit(_row("queued"))
+        writer.submit(_row("inline"))
+        assert _types(bind) == ["inline"]
+        writer.flush()
+        assert _types(bind) == ["inline", "queued"]
+
+    def test_failed_batch_is_retried_then_written_row_by_row(self, bind):
+        writer = AuthEventWriter(bind=bind, max_retries=2, retry_backoff=0)
+        writer.submit(_row("a"))
+        writer.submit(_row(None))  # violates NOT NULL, poisoning the batch
+        writer.submit(_row("c"))
+        writer.flush()
+        stats = writer.stats()
+        assert _types(bind) == ["a", "c"]
+        assert stats["retries"] == 2 and stats["flushed"] == 2 and stats["failed"] == 1
+
+    def test_transient_failure_recovers_on_retry(self, bind):
+        writer = AuthEventWriter(bind=bind, max_retries=3, retry_backoff=0)
+        real_insert, calls = writer._insert, []
+
+        def flaky(rows):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise OSError("connection reset")
+            real_insert(rows)
+
+        writer._insert = flaky
+        writer.submit(_row("a"))
+        writer.submit(_row("b"))
+        writer.flush()
+        assert calls == [2, 2] and _types(bind) == ["a", "b"]
+        assert writer.stats()["batches"] == 1
+
+    def test_request_rows_are_queued_only_after_commit(self, bind, monkeypatch):
+        from app.core import db
+        from app.routers import auth
+
+        writer = AuthEventWriter(bind=bind, flush_interval=60)
+        writer.start()
+        monkeypatch.setattr(auth, "auth_event_writer", writer)
+        monkeypatch.setattr(db, "engine", bind)
+        try:
+            with pytest.raises(RuntimeError):
+                with db.unit_of_work() as conn:
+                    auth.write_auth_event(conn, event_type="rolled_back", status="attempt")
+                    raise RuntimeError("boom")
+            with db.unit_of_work() as conn:
+                auth.write_auth_event(conn, event_type="committed", status="success")
+                assert writer.stats()["queue_depth"] == 0
+            assert writer.stats()["queue_depth"] == 1
+        finally:
+            writer.stop()
+        assert _types(bind) == ["committed"]
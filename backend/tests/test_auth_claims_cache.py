@@ -0,0 +1,55 @@
+import time
+
+from app.core.auth import ClaimsCache
+
+
+class TestClaimsCache:
+    """Verified-claims cache keyed by token digest."""
+
+    def test_hit_after_put_and_evict(self):
+        cache = ClaimsCache()
+        assert cache.get("tok") is None
+        cache.put("tok", {"sub": "1", "exp": time.time() + 60})
+        assert cache.get("tok")["sub"] == "1"
+        cache.evict("tok")
+        assert cache.get("tok") is None
+        assert cache.stats()["hits"] == 1
+
+    def test_entry_expires_with_token(self):
+        cache = ClaimsCache(max_ttl_seconds=300)
+        cache.put("tok", {"sub": "1", "exp": time.time() - 1})
+        assert cache.get("tok") is None
+
+    def test_lru_bound(self):
+        cache = ClaimsCache(max_entries=2)
+        for t in ("a", "b", "c"):
+            cache.put(t, {"sub": t})
+        assert cache.get("a") is None
+        assert cache.get("c")["sub"] == "c"
+
+
+class TestRequireRole:
+    """Role gate shared by the admin routes."""
+
+    def _get(self, role=None):
+        from fastapi.testclient import TestClient
+
+        from app.core.settings import settings
+        from app.main import app
+        from app.utils.security import create_jwt_token
+
+        headers = {}
+        if role:
+            token = create_jwt_token({"sub": "1", "role": role, "exp": time.time() + 60}, settings.jwt_secret)
+            headers["Authorization"] = f"Bearer {token}"
+        return TestClient(app).get("/admin/sql-templates/stats", headers=headers)
+
+    def test_missing_token_is_401(self):
+        assert self._get().status_code == 401
+
+    def test_other_role_is_403(self):
+        response = self._get("Admin")
+        assert response.status_code == 403 and response.json()["detail"] == "SystemAdmin required"
+
+    def test_system_admin_passes(self):
+        assert self._get("SystemAdmin").status_code == 200
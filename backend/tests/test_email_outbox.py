@@ -0,0 +1,172 @@
+import smtplib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import email_outbox as eo
+from app.services.email_outbox import OutboxDispatcher
+
+
+class FakeOutbox:
+    """Just enough of EmailOutbox for the claim and the four mark statements."""
+
+    def __init__(self, n):
+        now = datetime.utcnow()
+        self.rows = [
+            {"OutboxID": i, "ToAddress": f"u{i}@example.com", "Subject": "s", "BodyText": "b", "BodyHtml": None,
+             "Status": "pending", "Attempts": 0, "NextAttemptAt": now, "ClaimToken": None, "LastError": None}
+            for i in range(1, n + 1)
+        ]
+        self.log = []
+
+    def row(self, outbox_id):
+        return next(r for r in self.rows if r["OutboxID"] == outbox_id)
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, stmt, params):
+        now = datetime.utcnow()
+        if stmt is eo._CLAIM_BATCH:
+            due = [r for r in self.rows if r["Status"] == "pending" and r["NextAttemptAt"] <= now][: params["n"]]
+            for r in due:
+                r.update(NextAttemptAt=now + timedelta(seconds=params["lease"]), ClaimToken=params["claim"],
+                         Attempts=r["Attempts"] + 1)
+            return _Result([dict(r) for r in due])
+        updated = 0
+        for p in params if isinstance(params, list) else [params]:
+            r = self.row(p["id"])
+            if r["ClaimToken"] != p["claim"] or r["Status"] != "pending":
+                continue
+            updated += 1
+            if stmt is eo._MARK_SENT:
+                r["Status"] = "sent"
+            elif stmt is eo._MARK_DEAD:
+                r.update(Status="dead", LastError=p["error"])
+            elif stmt is eo._MARK_RETRY:
+                r.update(NextAttemptAt=now + timedelta(seconds=p["delay"]), LastError=p["error"])
+            else:  # _RELEASE
+                r.update(NextAttemptAt=now + timedelta(seconds=p["delay"]), Attempts=r["Attempts"] - 1)
+            self.log.append((r["OutboxID"], r["Status"]))
+        return _Result(rowcount=updated)
+
+
+class _Result:
+    def __init__(self, rows=None, rowcount=0):
+        self._rows, self.rowcount = rows or [], rowcount
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, outbox, fail=None):
+        self.outbox, self.fail, self.sent = outbox, fail or {}, []
+
+    def send(self, msg):
+        to = msg["To"]
+        if to in self.fail:
+            raise self.fail[to]
+        # Every earlier row is already marked by the time the next one goes out
+        self.outbox.log.append(("send", to))
+        self.sent.append(to)
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    holder = {}
+
+    class Pool:
+        @contextmanager
+        def session(self, config):
+            yield holder["session"]
+
+    class Config:
+        sender = "noreply@example.com"
+
+    monkeypatch.setattr(eo, "smtp_config", lambda: Config())
+    monkeypatch.setattr(eo, "smtp_pool", Pool())
+    return holder
+
+
+class TestOutboxDispatcher:
+    """Claim tokens, leases and per-row marking."""
+
+    def test_claim_stamps_token_and_lease(self, smtp):
+        outbox = FakeOutbox(2)
+        smtp["session"] = FakeSession(outbox)
+        OutboxDispatcher(bind=outbox, lease_seconds=300).dispatch_once()
+        tokens = {r["ClaimToken"] for r in outbox.rows}
+        assert len(tokens) == 1 and None not in tokens
+        assert all(r["Attempts"] == 1 and r["Status"] == "sent" for r in outbox.rows)
+
+    def test_each_row_marked_right_after_its_send(self, smtp):
+        outbox = FakeOutbox(3)
+        smtp["session"] = FakeSession(outbox)
+        dispatcher = OutboxDispatcher(bind=outbox)
+        assert dispatcher.dispatch_once() == 3
+        assert outbox.log == [
+            ("send", "u1@example.com"), (1, "sent"),
+            ("send", "u2@example.com"), (2, "sent"),
+            ("send", "u3@example.com"), (3, "sent"),
+        ]
+        assert dispatcher.stats()["sent"] == 3
+
+    def test_stale_claim_cannot_mark(self, smtp):
+        outbox = FakeOutbox(1)
+
+        class Reclaimed(FakeSession):
+            def send(self, msg):
+                # Lease ran out mid-send and another node claimed the row
+                outbox.rows[0]["ClaimToken"] = "other-node"
+
+        smtp["session"] = Reclaimed(outbox)
+        dispatcher = OutboxDispatcher(bind=outbox)
+        dispatcher.dispatch_once()
+        assert outbox.rows[0]["Status"] == "pending"
+        assert dispatcher.stats()["stale"] == 1 and dispatcher.stats()["sent"] == 0
+
+    def test_message_errors_retry_or_dead_letter_and_batch_continues(self, smtp):
+        outbox = FakeOutbox(3)
+        smtp["session"] = FakeSession(outbox, fail={
+            "u1@example.com": smtplib.SMTPDataError(451, b"try later"),
+            "u2@example.com": smtplib.SMTPRecipientsRefused({}),
+        })
+        dispatcher = OutboxDispatcher(bind=outbox, backoff_seconds=30)
+        dispatcher.dispatch_once()
+        assert [r["Status"] for r in outbox.rows] == ["pending", "dead", "sent"]
+        assert outbox.rows[0]["NextAttemptAt"] > datetime.utcnow() + timedelta(seconds=25)
+        stats = dispatcher.stats()
+        assert (stats["retried"], stats["dead"], stats["sent"]) == (1, 1, 1)
+
+    def test_connection_error_stops_batch_and_releases_rest(self, smtp):
+        outbox = FakeOutbox(4)
+        smtp["session"] = FakeSession(outbox, fail={"u2@example.com": smtplib.SMTPServerDisconnected("gone")})
+        dispatcher = OutboxDispatcher(bind=outbox, backoff_seconds=30)
+        dispatcher.dispatch_once()
+        assert smtp["session"].sent == ["u1@example.com"]
+        assert [r["Status"] for r in outbox.rows] == ["sent", "pending", "pending", "pending"]
+        # The failed row used an attempt; the untried ones did not
+        assert [r["Attempts"] for r in outbox.rows] == [1, 1, 0, 0]
+        assert all(r["NextAttemptAt"] > datetime.utcnow() for r in outbox.rows[1:])
+        assert dispatcher.stats()["released"] == 2
+
+    def test_connect_failure_releases_whole_batch(self, smtp, monkeypatch):
+        outbox = FakeOutbox(2)
+
+        class Down:
+            @contextmanager
+            def session(self, config):
+                raise ConnectionRefusedError("smtp down")
+                yield
+
+        monkeypatch.setattr(eo, "smtp_pool", Down())
+        dispatcher = OutboxDispatcher(bind=outbox)
+        dispatcher.dispatch_once()
+        assert [r["Attempts"] for r in outbox.rows] == [0, 0]
+        assert dispatcher.stats()["released"] == 2
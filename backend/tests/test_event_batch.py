@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from app.core.schema_catalog import EventColumns
+from app.core.sql_templates import StatementRegistry
+from app.routers import events
+from app.routers.events import BATCH_BUCKETS, _build_batch_insert_sql, _build_batch_update_sql
+
+COLS = EventColumns(
+    event_name=True, status=True, timezone=True, is_deleted=True, last_updated=True, created_col="CreatedDate"
+)
+
+
+class FakeConn:
+    """Answers batch statements the way SQL Server would, padding rows excluded."""
+
+    def execute(self, stmt, params):
+        if "rows" in params:
+            return SimpleNamespace(all=lambda: [(i, 1000 + i) for i in range(params["rows"])])
+        ids = [v for k, v in params.items() if k.startswith("id_") and v is not None]
+        return SimpleNamespace(all=lambda: [(i,) for i in ids])
+
+
+class TestEventBatch:
+    """Statement shapes for the batch create/update endpoints."""
+
+    def test_insert_returns_source_row_numbers(self):
+        sql = str(_build_batch_insert_sql(COLS, False, 3))
+        assert "(2, :event_name_2, :status_2, :tz_2)" in sql
+        assert "OUTPUT src.rn, INSERTED.EventID" in sql
+        assert "WHERE v.rn < :rows" in sql
+        # Shared binds and literals are not repeated per row
+        assert ":org_0" not in sql and "CreatedByUserID" not in sql
+
+    def test_update_sets_only_requested_fields(self):
+        sql = str(_build_batch_update_sql(COLS, False, True, False, 2))
+        assert "e.Status = v.status" in sql and "EventName" not in sql
+        assert "(:id_1, :status_1)" in sql
+        assert "WHERE e.OrganizationID = :org" in sql
+
+    def test_update_without_columns_is_none(self):
+        assert _build_batch_update_sql(EventColumns(), True, True, True, 1) is None
+
+    def test_registry_stays_bounded_across_batch_sizes(self, monkeypatch):
+        registry = StatementRegistry()
+
+        @contextmanager
+        def begin():
+            yield FakeConn()
+
+        monkeypatch.setattr(events, "statement_registry", registry)
+        monkeypatch.setattr(events, "engine", SimpleNamespace(begin=begin))
+        snapshot = SimpleNamespace(fingerprint="fp", event=COLS)
+        monkeypatch.setattr(events, "schema_catalog", SimpleNamespace(snapshot=lambda conn=None: snapshot))
+        for n in (1, 2, 9, 11, 49, 73, 100, 101, 257, 500):
+            created = events.create_events_batch({"items": [{"name": f"e{i}"} for i in range(n)]}, {"sub": "1"}, 7)
+            assert created["created"] == n
+            assert [r["index"] for r in created["results"]] == list(range(n))
+            updated = events.update_events_batch({"items": [{"id": i, "status": "Live"} for i in range(n)]}, {}, 7)
+            assert updated["updated"] == n
+        # One statement per bucket for each operation, whatever the batch sizes
+        assert registry.stats()["entries"] == 2 * len(BATCH_BUCKETS)
@@ -0,0 +1,63 @@
+from app.core.schema_catalog import EventColumns, SchemaSnapshot
+from app.services.event_clone import build_clone_sql
+
+
+def _snapshot(generated=None, **tables):
+    columns = {t: frozenset(c.split()) for t, c in tables.items()}
+    return SchemaSnapshot(
+        revision="r1",
+        columns=columns,
+        event=EventColumns.from_columns(columns.get("event", frozenset())),
+        generated={t: frozenset(c.split()) for t, c in (generated or {}).items()},
+    )
+
+
+SCHEMA = _snapshot(
+    event="eventid organizationid eventname status startdate isdeleted createddate lastupdated",
+    form="formid eventid name status publicslug isdeleted createddate",
+    canvaslayout="canvaslayoutid formid devicetype revisionnumber isdeleted deletedat",
+    canvasobject="objectid canvaslayoutid label positionx",
+)
+
+
+class TestEventClone:
+    """Shape of the set-based clone batch."""
+
+    def test_levels_are_mapped_set_based(self):
+        sql = str(build_clone_sql(SCHEMA))
+        assert "OUTPUT s.[formid], INSERTED.[formid] INTO @FormMap" in sql
+        assert "JOIN @FormMap m ON m.OldID = x.FormID" in sql
+        assert "JOIN @LayoutMap m ON m.OldID = o.CanvasLayoutID" in sql
+        assert sql.rstrip().endswith("@Objects AS objects;")
+
+    def test_fresh_values_replace_copied_ones(self):
+        sql = str(build_clone_sql(SCHEMA))
+        assert "DATEADD(day, :shift_days, s.[startdate])" in sql
+        assert "'-', @NewEventID) END" in sql
+        # Audit columns are left to their defaults and keys are never copied
+        assert "[lastupdated]" not in sql and "[deletedat]" not in sql
+        assert "[objectid]" not in sql
+
+    def test_server_generated_columns_are_not_copied(self):
+        schema = _snapshot(
+            generated={"event": "eventid rowver", "form": "formid fullname"},
+            event="eventid organizationid name rowver",
+            form="formid eventid name fullname",
+        )
+        sql = str(build_clone_sql(schema))
+        assert "[rowver]" not in sql and "[fullname]" not in sql
+        assert "[name]" in sql
+
+    def test_only_latest_layout_revision_is_copied(self):
+        sql = str(build_clone_sql(SCHEMA))
+        assert "y.RevisionNumber > x.RevisionNumber" in sql
+        assert "y.DeviceType = x.DeviceType" in sql
+        without_revisions = _snapshot(
+            event="eventid organizationid name", form="formid eventid name", canvaslayout="canvaslayoutid formid"
+        )
+        assert "NOT EXISTS" not in str(build_clone_sql(without_revisions))
+
+    def test_optional_tables(self):
+        sql = str(build_clone_sql(_snapshot(event="eventid organizationid name")))
+        assert "@FormMap (OldID" not in sql and "CanvasObject" not in sql
+        assert build_clone_sql(_snapshot()) is None
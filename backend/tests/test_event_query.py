@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.schema_catalog import EventColumns
+from app.services.event_query import (
+    EventFilter,
+    InvalidFields,
+    build_page_sql,
+    build_version_sql,
+    etag_matches,
+    parse_fields,
+    weak_etag,
+)
+
+COLS = EventColumns(event_name=True, status=True, start_date=True, is_deleted=True, last_updated=True)
+
+
+class TestEventQuery:
+    """Filters, sparse fields and ETags for the event listing."""
+
+    def test_fields(self):
+        assert parse_fields(None) == ("name", "status", "timezone")
+        assert parse_fields("status, id,name") == ("name", "status")
+        with pytest.raises(InvalidFields):
+            parse_fields("name,password")
+
+    def test_filter_maps_schema_columns(self):
+        f = EventFilter.build(COLS, 7, status="Live", from_=datetime(2025, 1, 1), name_prefix="50%_")
+        assert "EventName LIKE :name_prefix" in f.where
+        assert "StartDate >= :from" in f.where
+        assert f.params["name_prefix"] == "50[%][_]%"
+        sql = str(build_page_sql(COLS, f, ("name",), keyed=True))
+        assert "EventName as name" in sql and "Timezone" not in sql
+        assert "ORDER BY CreatedDate DESC, EventID DESC" in sql
+        assert "TOP (:limit)" in sql
+        assert "TOP" not in str(build_page_sql(COLS, f, ("name",), keyed=False, limited=False))
+
+    def test_version_without_last_updated_checksums_listed_columns(self):
+        assert "MAX(LastUpdated)" in str(build_version_sql(COLS))
+        sql = str(build_version_sql(EventColumns(event_name=True, status=True, is_deleted=True)))
+        assert "CHECKSUM_AGG(BINARY_CHECKSUM(EventID, CreatedDate, EventName, Status))" in sql
+        assert "NULL" not in sql.replace("IS NULL", "")
+
+    def test_etag_changes_with_version_and_query(self):
+        version = (3, datetime(2025, 1, 1), None, 99)
+        tag = weak_etag(version, "7?page_size=10")
+        assert tag.startswith('W/"')
+        assert weak_etag(version, "7?page_size=10") == tag
+        assert weak_etag((4,) + version[1:], "7?page_size=10") != tag
+        assert weak_etag(version, "7?page_size=20") != tag
+        assert etag_matches(f'"x", {tag[2:]}', tag)
+        assert not etag_matches(None, tag)
@@ -0,0 +1,49 @@
+import pytest
+
+from app.core.org_context import OrgContextResolver
+
+
+class _CountingResolver(OrgContextResolver):
+    def __init__(self, org_id, own=True):
+        super().__init__()
+        self.org_id = org_id
+        self.own = own
+        self.lookups = 0
+
+    def _lookup(self, user_id, conn):
+        self.lookups += 1
+        return self.org_id, self.own
+
+
+class TestOrgContextResolver:
+    """Per-user organization cache."""
+
+    def test_token_org_id_wins(self):
+        resolver = _CountingResolver(7)
+        assert resolver.resolve({"sub": "1", "org_id": 3}) == 3
+        assert resolver.lookups == 0
+
+    def test_lookup_cached_until_invalidated(self):
+        resolver = _CountingResolver(7)
+        assert resolver.resolve({"sub": "1"}) == 7
+        assert resolver.resolve({"sub": "1"}) == 7
+        assert resolver.lookups == 1
+        resolver.org_id = 9
+        resolver.invalidate(1)
+        assert resolver.resolve({"sub": "1"}) == 9
+        assert resolver.lookups == 2
+
+    def test_unresolved_org_is_not_cached(self):
+        resolver = _CountingResolver(None, own=False)
+        assert resolver.resolve({"sub": "1"}) is None
+        assert resolver.resolve({"sub": "1"}) is None
+        assert resolver.lookups == 2 and resolver.stats()["entries"] == 0
+
+    def test_missing_org_is_refused(self, monkeypatch):
+        from fastapi import HTTPException
+        from app.core import org_context as module
+
+        monkeypatch.setattr(module, "org_context", _CountingResolver(None, own=False))
+        with pytest.raises(HTTPException) as exc:
+            module.get_org_id({"sub": "1"})
+        assert exc.value.status_code == 400
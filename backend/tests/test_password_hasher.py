@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+class TestPasswordHasher:
+    """Admission control on the bcrypt pool and the 503 it maps to."""
+
+    def test_rejects_beyond_workers_plus_pending(self):
+        hasher = PasswordHasher(max_workers=1, max_pending=1)
+        gate = threading.Event()
+
+        async def scenario():
+            admitted = [asyncio.ensure_future(hasher._run(gate.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            assert hasher.stats()["in_flight"] == 2 and hasher.stats()["queued"] == 1
+            with pytest.raises(PasswordHasherBusy):
+                await hasher._run(gate.wait)
+            gate.set()
+            return await asyncio.gather(*admitted)
+
+        try:
+            assert asyncio.run(scenario()) == [True, True]
+        finally:
+            gate.set()
+            hasher.shutdown()
+        stats = hasher.stats()
+        assert stats["rejected"] == 1 and stats["in_flight"] == 0
+        assert stats["hash_latency"]["count"] == 2
+
+    def test_cancelled_caller_keeps_slot_until_hash_finishes(self):
+        hasher = PasswordHasher(max_workers=1, max_pending=0)
+        gate = threading.Event()
+
+        async def scenario():
+            task = asyncio.ensure_future(hasher._run(gate.wait))
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.sleep(0)
+            # The bcrypt thread is still busy, so a new caller is still shed
+            with pytest.raises(PasswordHasherBusy):
+                await hasher._run(gate.wait)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            gate.set()
+            hasher.shutdown()
+        assert hasher.stats()["in_flight"] == 0
+
+    def test_busy_maps_to_503(self, monkeypatch):
+        from app.main import app
+        from app.routers import auth
+
+        class Saturated:
+            async def verify_and_upgrade(self, *args):
+                raise PasswordHasherBusy("Password hashing queue is full")
+
+        user = {"UserID": 1, "PasswordSalt": "", "PasswordHash": "x", "EmailVerified": 1}
+        monkeypatch.setattr(auth, "_login_candidate", lambda payload, request: user)
+        monkeypatch.setattr(auth, "password_hasher", Saturated())
+        response = TestClient(app).post("/auth/login", json={"email": "a@example.com", "password": "pw"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
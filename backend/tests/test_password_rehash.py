@@ -0,0 +1,29 @@
+import hashlib
+
+from passlib.hash import bcrypt
+
+from app.core.settings import settings
+from app.utils.security import bcrypt_cost, needs_rehash, verify_and_upgrade
+
+
+class TestPasswordRehash:
+    """Legacy and under-cost hashes are replaced on a successful verify."""
+
+    def test_legacy_sha256_upgraded(self):
+        legacy = hashlib.sha256(("salt" + "pw").encode("utf-8")).hexdigest()
+        ok, new_hash = verify_and_upgrade("salt", legacy, "pw")
+        assert ok and new_hash.startswith("$2")
+        assert bcrypt_cost(new_hash) == settings.password_bcrypt_rounds
+
+    def test_under_cost_upgraded_but_higher_kept(self, monkeypatch):
+        monkeypatch.setattr(settings, "password_bcrypt_rounds", 5)
+        low = bcrypt.using(rounds=4).hash("pw")
+        high = bcrypt.using(rounds=6).hash("pw")
+        assert needs_rehash(low) and not needs_rehash(high)
+        assert verify_and_upgrade("", high, "pw") == (True, None)
+        ok, new_hash = verify_and_upgrade("", low, "pw")
+        assert ok and bcrypt_cost(new_hash) == settings.password_bcrypt_rounds
+
+    def test_wrong_password_never_upgrades(self):
+        low = bcrypt.using(rounds=4).hash("pw")
+        assert verify_and_upgrade("", low, "nope") == (False, None)
@@ -0,0 +1,49 @@
+import threading
+
+from app.services.periodic import PeriodicWorker
+
+
+class _Counter(PeriodicWorker):
+    thread_name = "test-worker"
+
+    def __init__(self, interval_seconds, busy_ticks=0):
+        super().__init__(interval_seconds)
+        self.ticks = 0
+        self.busy_ticks = busy_ticks
+        self.ticked = threading.Event()
+
+    def tick(self):
+        self.ticks += 1
+        self.ticked.set()
+        return self.ticks <= self.busy_ticks
+
+
+class TestPeriodicWorker:
+    """Shared start/stop/wake loop of the background workers."""
+
+    def test_wake_runs_next_tick_and_stop_joins(self):
+        worker = _Counter(interval_seconds=60)
+        worker.start()
+        assert worker.ticked.wait(2) and worker.running
+        worker.ticked.clear()
+        worker.wake()
+        assert worker.ticked.wait(2)
+        worker.stop()
+        assert not worker.running and worker.ticks == 2
+
+    def test_busy_tick_goes_again_without_waiting(self):
+        worker = _Counter(interval_seconds=60, busy_ticks=3)
+        worker.start()
+        try:
+            for _ in range(100):
+                if worker.ticks >= 4:
+                    break
+                worker.ticked.wait(0.05)
+            assert worker.ticks == 4
+        finally:
+            worker.stop()
+
+    def test_non_positive_interval_stays_off(self):
+        worker = _Counter(interval_seconds=0)
+        worker.start()
+        assert not worker.running and worker.ticks == 0
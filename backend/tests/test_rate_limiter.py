@@ -0,0 +1,65 @@
+import threading
+
+from app.services.rate_limiter import MemoryStore, RateLimit, RateLimiter, SqlStore
+
+
+class TestRateLimiter:
+    """Sliding-window decisions, mostly against the in-memory store."""
+
+    def test_cooldown_then_limit(self):
+        limiter = RateLimiter(MemoryStore())
+        rule = RateLimit(name="t", limit=2, window_seconds=3600, cooldown_seconds=60)
+        assert limiter.check(rule, 1).allowed
+        assert limiter.hit(rule, 1).allowed
+        decision = limiter.check(rule, 1)
+        assert not decision.allowed and decision.reason == "cooldown"
+        assert 0 < decision.retry_after <= 61
+
+    def test_daily_cap_per_key(self):
+        limiter = RateLimiter(MemoryStore())
+        rule = RateLimit(name="t", limit=2, window_seconds=3600)
+        assert limiter.hit(rule, 1).allowed
+        assert limiter.hit(rule, 1).allowed
+        decision = limiter.check(rule, 1)
+        assert not decision.allowed and decision.reason == "limit"
+        assert limiter.check(rule, 2).allowed
+
+    def test_denied_hit_is_not_counted(self):
+        limiter = RateLimiter(MemoryStore())
+        rule = RateLimit(name="t", limit=1, window_seconds=3600)
+        assert limiter.hit(rule, 1).allowed
+        decision = limiter.hit(rule, 1)
+        assert not decision.allowed and decision.reason == "limit"
+        assert 0 < decision.retry_after <= 3600
+        assert limiter.check(rule, 1).count == 1
+
+    def test_concurrent_hits_never_exceed_limit(self):
+        limiter = RateLimiter(MemoryStore())
+        rule = RateLimit(name="t", limit=5, window_seconds=3600)
+        barrier = threading.Barrier(20)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(limiter.hit(rule, 1).allowed)
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count(True) == 5
+
+    def test_sql_denied_update_never_allows(self, monkeypatch):
+        class Conn:
+            def execute(self, stmt, params):
+                # The guarded UPDATE matched no row
+                return type("Result", (), {"first": lambda self: None})()
+
+        store = SqlStore()
+        # Re-read usage rounds to exactly the cooldown, which _decide would allow
+        monkeypatch.setattr(store, "_read", lambda rule, key, conn: (1, 60.0, 3600.0))
+        rule = RateLimit("t", limit=5, window_seconds=3600, cooldown_seconds=60)
+        decision = RateLimiter(store).hit(rule, "k", Conn())
+        assert not decision.allowed
+        assert decision.reason == "cooldown" and decision.retry_after >= 1 and decision.count == 1
@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine, text
+
+from app.core.role_catalog import RoleCatalog
+
+
+def _conn():
+    conn = create_engine("sqlite://").connect()
+    conn.execute(text("CREATE TABLE Role (RoleID INTEGER, RoleName TEXT)"))
+    conn.execute(text("INSERT INTO Role VALUES (1, 'User'), (2, 'Admin')"))
+    return conn
+
+
+class TestRoleCatalog:
+    """Role lookups served from memory."""
+
+    def test_lookups_both_ways(self):
+        conn = _conn()
+        catalog = RoleCatalog()
+        assert catalog.role_id(conn, "Admin") == 2
+        assert catalog.role_name(conn, 1) == "User"
+        assert catalog.role_id(conn, "Missing") is None
+
+    def test_new_role_visible_after_refresh(self):
+        conn = _conn()
+        catalog = RoleCatalog(miss_reload_seconds=3600)
+        assert catalog.role_id(conn, "Auditor") is None
+        conn.execute(text("INSERT INTO Role VALUES (3, 'Auditor')"))
+        assert catalog.role_id(conn, "Auditor") is None
+        assert catalog.refresh(conn)["Auditor"] == 3
@@ -0,0 +1,49 @@
+from app.core.schema_catalog import EventColumns, SchemaSnapshot
+
+
+def _snapshot(revision="a018", **tables):
+    columns = {name.lower(): frozenset(c.lower() for c in cols) for name, cols in tables.items()}
+    return SchemaSnapshot(
+        revision=revision,
+        columns=columns,
+        event=EventColumns.from_columns(columns.get("event", frozenset())),
+    )
+
+
+class TestEventColumns:
+    """Column capabilities derived from a catalogued [Event] table."""
+
+    def test_legacy_names_detected(self):
+        snap = _snapshot(Event=["EventID", "EventName", "EventStatus", "CreatedOn"])
+        assert snap.event.event_name and not snap.event.name
+        assert snap.event.event_status and not snap.event.status
+        assert snap.event.created_col == "CreatedOn"
+
+    def test_created_column_prefers_created_date(self):
+        snap = _snapshot(Event=["EventID", "Name", "CreatedAt", "CreatedDate"])
+        assert snap.event.created_col == "CreatedDate"
+
+
+class TestSchemaSnapshot:
+    """Lookups and fingerprinting on a snapshot."""
+
+    def test_has_column_is_case_and_bracket_insensitive(self):
+        snap = _snapshot(User=["UserID", "OrganizationID"])
+        assert snap.has_column("[User]", "organizationid")
+        assert not snap.has_column("User", "TenantID")
+        assert not snap.has_column("Missing", "Anything")
+
+    def test_fingerprint_tracks_revision_and_columns(self):
+        base = _snapshot(Event=["EventID", "Name"])
+        assert base.fingerprint == _snapshot(Event=["Name", "EventID"]).fingerprint
+        assert base.fingerprint != _snapshot(revision="a019", Event=["EventID", "Name"]).fingerprint
+        assert base.fingerprint != _snapshot(Event=["EventID", "EventName"]).fingerprint
+
+    def test_writable_excludes_server_generated_columns(self):
+        snap = SchemaSnapshot(
+            revision="a018",
+            columns={"form": frozenset({"formid", "name", "rowver"})},
+            generated={"form": frozenset({"formid", "rowver"})},
+        )
+        assert snap.writable("[Form]") == frozenset({"name"})
+        assert snap.writable("Missing") == frozenset()
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+
+from app.services import session_store as ss
+from app.services.session_store import SessionInvalid, SessionStore
+
+
+class FakeConn:
+    """Just enough of AuthSession for the store's five statements."""
+
+    def __init__(self):
+        self.rows = []
+
+    def execute(self, stmt, params):
+        now = datetime.utcnow()
+        if stmt is ss._INSERT_SESSION:
+            row = {"SessionID": len(self.rows) + 1, "UserID": params["uid"], "FamilyID": params["family"],
+                   "TokenHash": params["token_hash"], "ExpiresAt": params["expires"],
+                   "RotatedAt": None, "RevokedAt": None}
+            self.rows.append(row)
+            return _Result(scalar=row["SessionID"])
+        if stmt is ss._FIND_SESSION:
+            return _Result(first=next((r for r in self.rows if r["TokenHash"] == params["token_hash"]), None))
+        if stmt is ss._ROTATE_SESSION:
+            hit = [r for r in self.rows if r["SessionID"] == params["id"] and r["RotatedAt"] is None
+                   and r["RevokedAt"] is None and r["ExpiresAt"] > now]
+            for r in hit:
+                r["RotatedAt"] = now
+            return _Result(rowcount=len(hit))
+        key, value = ("FamilyID", params["family"]) if stmt is ss._REVOKE_FAMILY else ("UserID", params["uid"])
+        hit = [r for r in self.rows if r[key] == value and r["RevokedAt"] is None]
+        for r in hit:
+            r["RevokedAt"] = now
+        return _Result(rowcount=len(hit))
+
+
+class _Result:
+    def __init__(self, scalar=None, first=None, rowcount=0):
+        self._scalar, self._first, self.rowcount = scalar, first, rowcount
+
+    def scalar(self):
+        return self._scalar
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self._first
+
+
+class TestSessionStore:
+    """Refresh token rotation, reuse detection and revocation."""
+
+    def test_rotate_issues_next_token_in_family(self):
+        conn, store = FakeConn(), SessionStore()
+        raw, first = store.create(conn, 7)
+        new_raw, second = store.rotate(conn, raw)
+        assert new_raw != raw
+        assert second.family_id == first.family_id and second.user_id == 7
+        assert store.stats()["cache_hits"] == 1
+
+    def test_reusing_rotated_token_revokes_family(self):
+        conn, store = FakeConn(), SessionStore()
+        raw, _ = store.create(conn, 7)
+        new_raw, _ = store.rotate(conn, raw)
+        with pytest.raises(SessionInvalid):
+            store.rotate(conn, raw)
+        with pytest.raises(SessionInvalid):
+            store.rotate(conn, new_raw)
+        assert store.stats()["reuse_detected"] == 1
+
+    def test_logout_revokes_across_cache(self):
+        conn, store = FakeConn(), SessionStore()
+        raw, _ = store.create(conn, 7)
+        assert store.revoke_token(conn, raw) == 1
+        with pytest.raises(SessionInvalid):
+            store.rotate(conn, raw)
@@ -0,0 +1,85 @@
+import smtplib
+
+from app.services import emailer
+from app.services.emailer import SmtpConfig, SmtpPool, build_message
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP; counts connections and messages."""
+
+    connections = 0
+
+    def __init__(self, host, port, timeout=None):
+        FakeSMTP.connections += 1
+        self.sent = 0
+        self.drop_next = False
+
+    def send_message(self, msg):
+        if self.drop_next:
+            self.drop_next = False
+            raise smtplib.SMTPServerDisconnected("gone")
+        self.sent += 1
+
+    def noop(self):
+        return (250, b"OK")
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+CONFIG = SmtpConfig(host="localhost", port=25, user=None, password=None, sender="a@example.com")
+
+
+def _msg():
+    return build_message(CONFIG.sender, "b@example.com", "s", "body")
+
+
+class TestSmtpPool:
+    """Session reuse, retirement and reconnect."""
+
+    def setup_method(self):
+        FakeSMTP.connections = 0
+
+    def test_session_reused_across_checkouts(self, monkeypatch):
+        monkeypatch.setattr(emailer.smtplib, "SMTP", FakeSMTP)
+        pool = SmtpPool(max_idle=2)
+        for _ in range(3):
+            with pool.session(CONFIG) as session:
+                session.send(_msg())
+        assert FakeSMTP.connections == 1
+        assert pool.stats()["idle_sessions"] == 1
+
+    def test_session_retired_after_message_limit(self, monkeypatch):
+        monkeypatch.setattr(emailer.smtplib, "SMTP", FakeSMTP)
+        pool = SmtpPool(max_messages_per_session=2)
+        for _ in range(2):
+            with pool.session(CONFIG) as session:
+                session.send(_msg())
+                session.send(_msg())
+        assert FakeSMTP.connections == 2
+        assert pool.stats()["idle_sessions"] == 0
+
+    def test_reconnects_once_when_server_drops(self, monkeypatch):
+        monkeypatch.setattr(emailer.smtplib, "SMTP", FakeSMTP)
+        pool = SmtpPool()
+        with pool.session(CONFIG) as session:
+            session.send(_msg())
+            session._smtp.drop_next = True
+            session.send(_msg())
+            assert session.messages_sent == 2
+        assert FakeSMTP.connections == 2
+
+    def test_reconnects_at_message_limit_within_one_checkout(self, monkeypatch):
+        monkeypatch.setattr(emailer.smtplib, "SMTP", FakeSMTP)
+        pool = SmtpPool(max_messages_per_session=2)
+        with pool.session(CONFIG) as session:
+            for _ in range(5):
+                session.send(_msg())
+                assert session._smtp.sent <= 2
+            assert session.messages_sent == 5 and session.connection_messages == 1
+        assert FakeSMTP.connections == 3
+        # One message on the current connection: still worth keeping idle
+        assert pool.stats()["idle_sessions"] == 1
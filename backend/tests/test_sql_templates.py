@@ -0,0 +1,39 @@
+from sqlalchemy import text
+
+from app.core.sql_templates import StatementRegistry
+
+
+class TestStatementRegistry:
+    """Statements are built once per fingerprint/operation/variant."""
+
+    def test_reuses_built_statement_and_counts(self):
+        registry = StatementRegistry()
+        builds = []
+
+        def build():
+            builds.append(1)
+            return text("SELECT 1")
+
+        first = registry.get("fp1", "event.list", build)
+        second = registry.get("fp1", "event.list", build)
+        assert first is second
+        assert len(builds) == 1
+        stats = registry.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    def test_fingerprint_and_variant_are_part_of_key(self):
+        registry = StatementRegistry()
+        a = registry.get("fp1", "event.update", lambda: text("A"), variant=(True, False))
+        b = registry.get("fp1", "event.update", lambda: text("B"), variant=(False, True))
+        c = registry.get("fp2", "event.update", lambda: text("C"), variant=(True, False))
+        assert len({id(a), id(b), id(c)}) == 3
+
+    def test_evicts_least_recently_used(self):
+        registry = StatementRegistry(max_entries=2)
+        registry.get("fp", "a", lambda: text("A"))
+        registry.get("fp", "b", lambda: text("B"))
+        registry.get("fp", "a", lambda: text("A"))
+        registry.get("fp", "c", lambda: text("C"))
+        assert registry.stats()["entries"] == 2
+        registry.get("fp", "b", lambda: text("B2"))
+        assert registry.stats()["misses"] == 4
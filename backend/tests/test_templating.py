@@ -0,0 +1,38 @@
+import pytest
+
+from app.services.templating import CompiledTemplate, TemplateError, TemplateRegistry
+
+
+class TestTemplating:
+    """Compiled placeholders and the shipped email templates."""
+
+    def test_render_substitutes_every_occurrence(self):
+        t = CompiledTemplate("t", "Hi {{ name }}, bye {{name}}.")
+        assert t.variables == ("name",)
+        assert t.render({"name": "Ann"}) == "Hi Ann, bye Ann."
+
+    def test_missing_variable_raises(self):
+        with pytest.raises(TemplateError):
+            CompiledTemplate("t", "{{ url }}").render({})
+
+    def test_invitation_has_plain_and_escaped_html(self):
+        registry = TemplateRegistry()
+        mail = registry.render(
+            "invitation",
+            inviter_name="<b>Bob</b>",
+            inviter_contact="Bob",
+            accept_url="http://x/accept?token=a&b",
+            ttl_hours=72,
+        )
+        assert mail.subject == "You're invited to Event Leads"
+        assert "<b>Bob</b> invited you" in mail.body
+        assert "&lt;b&gt;Bob&lt;/b&gt;" in mail.html_body
+        assert 'href="http://x/accept?token=a&amp;b"' in mail.html_body
+        assert "72 hours" in mail.body
+
+    def test_auth_templates_are_plain_text(self):
+        registry = TemplateRegistry()
+        mail = registry.render("password_reset", reset_url="http://x/r")
+        assert mail.body == "Click to reset your password: http://x/r"
+        assert mail.html_body is None
+        assert set(registry.names()) >= {"invitation", "password_reset", "verify_email"}
@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+
+from app.services import token_store
+from app.services.token_maintenance import TokenCompactor
+
+
+class FakeBind:
+    """Hands out connections whose DELETE removes up to :n of ``remaining`` rows."""
+
+    def __init__(self, remaining):
+        self.remaining = dict(remaining)
+        self.statements = []
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, sql, params):
+        table = str(sql).split("FROM ")[1].split()[0]
+        self.statements.append((table, params))
+        n = min(params["n"], self.remaining.get(table, 0))
+        self.remaining[table] = self.remaining.get(table, 0) - n
+        return type("Result", (), {"rowcount": n})()
+
+
+class TestTokenCompactor:
+    """Batched deletes and throughput counters."""
+
+    def test_deletes_in_batches_until_short_batch(self):
+        bind = FakeBind({"emailverificationtoken": 250, "passwordresettoken": 0})
+        compactor = TokenCompactor(
+            bind=bind,
+            kinds=(token_store.EMAIL_VERIFICATION, token_store.PASSWORD_RESET),
+            batch_size=100,
+            pause_seconds=0,
+        )
+        assert compactor.run_once() == {"emailverificationtoken": 250, "passwordresettoken": 0}
+        # 100 + 100 + 50 for the first table, one empty batch for the second
+        assert len(bind.statements) == 4
+        stats = compactor.stats()
+        assert stats["deleted"]["emailverificationtoken"] == 250
+        assert stats["last_run"]["deleted"] == 250
+
+    def test_retention_never_below_one_day(self):
+        bind = FakeBind({})
+        TokenCompactor(bind=bind, kinds=(token_store.INVITATION,), retention_days=0).run_once()
+        assert bind.statements[0][1]["days"] == 1
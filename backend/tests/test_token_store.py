@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+from app.services import token_store
+
+
+def _sqlite_insert_sql(kind, columns):
+    # SQLite has no OUTPUT clause; RETURNING gives the same single-row result
+    cols = ", ".join(columns)
+    binds = ", ".join(f":{c}" for c in columns)
+    return text(
+        f"INSERT INTO {kind.table} ({cols}, Token, TokenHash, ConsumedAt, CreatedAt) "
+        f"VALUES ({binds}, :token_hash, :token_hash, NULL, {kind.now_sql}) RETURNING {kind.id_column}"
+    )
+
+
+@pytest.fixture
+def bind(monkeypatch):
+    bind = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    @event.listens_for(bind, "connect")
+    def _sql_server_clock(dbapi_conn, _):
+        now = lambda: datetime.utcnow().isoformat(" ")  # noqa: E731
+        dbapi_conn.create_function("GETUTCDATE", 0, now)
+        dbapi_conn.create_function("GETDATE", 0, now)
+
+    monkeypatch.setattr(token_store, "_insert_sql", _sqlite_insert_sql)
+    with bind.begin() as conn:
+        conn.execute(text("CREATE TABLE [User] (UserID INTEGER PRIMARY KEY, Email TEXT)"))
+        conn.execute(
+            text(
+                "CREATE TABLE Invitation (InvitationID INTEGER PRIMARY KEY, OrganizationID INT, Email TEXT, "
+                "Role TEXT, Token TEXT UNIQUE, TokenHash TEXT, ExpiresAt DATETIME, ConsumedAt DATETIME, "
+                "CreatedBy INT, CreatedAt DATETIME)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE passwordresettoken (Id INTEGER PRIMARY KEY, UserID INT, Token TEXT, "
+                "TokenHash TEXT, ExpiresAt DATETIME, ConsumedAt DATETIME, CreatedAt DATETIME)"
+            )
+        )
+        conn.execute(text("INSERT INTO [User] VALUES (7, 'a@example.com')"))
+    return bind
+
+
+def _later(hours=1):
+    return datetime.utcnow() + timedelta(hours=hours)
+
+
+class TestTokenStore:
+    """Hashed token rows: issue, lookup, single use and bulk expiry."""
+
+    def test_issue_stores_only_the_digest(self, bind):
+        values = {"OrganizationID": 3, "Email": "b@example.com", "Role": "User", "CreatedBy": 7}
+        with bind.begin() as conn:
+            raw, inv_id = token_store.issue(conn, token_store.INVITATION, values, _later())
+        with bind.connect() as conn:
+            stored = conn.execute(text("SELECT Token, TokenHash FROM Invitation")).one()
+        assert inv_id == 1
+        assert stored == (token_store.token_hash(raw), token_store.token_hash(raw))
+        assert raw not in stored
+
+    def test_find_by_raw_token(self, bind):
+        values = {"OrganizationID": 3, "Email": "b@example.com", "Role": "User", "CreatedBy": 7}
+        with bind.begin() as conn:
+            raw, inv_id = token_store.issue(conn, token_store.INVITATION, values, _later())
+            row = token_store.find(conn, token_store.INVITATION, raw, ("OrganizationID", "Email"))
+            assert row["TokenID"] == inv_id and row["Email"] == "b@example.com"
+            assert row["ConsumedAt"] is None
+            assert token_store.find(conn, token_store.INVITATION, raw + "x") is None
+            assert token_store.find(conn, token_store.INVITATION, "") is None
+
+    def test_find_joins_user_email(self, bind):
+        with bind.begin() as conn:
+            raw, _ = token_store.issue(conn, token_store.PASSWORD_RESET, {"UserID": 7}, _later())
+            row = token_store.find(conn, token_store.PASSWORD_RESET, raw, ("UserID",), with_user_email=True)
+        assert row["UserID"] == 7 and row["Email"] == "a@example.com"
+
+    def test_consume_is_single_use(self, bind):
+        with bind.begin() as conn:
+            _, token_id = token_store.issue(conn, token_store.PASSWORD_RESET, {"UserID": 7}, _later())
+            assert token_store.consume(conn, token_store.PASSWORD_RESET, token_id)
+            assert not token_store.consume(conn, token_store.PASSWORD_RESET, token_id)
+
+    def test_expire_outstanding_skips_used_and_expired(self, bind):
+        with bind.begin() as conn:
+            _, used = token_store.issue(conn, token_store.PASSWORD_RESET, {"UserID": 7}, _later())
+            token_store.consume(conn, token_store.PASSWORD_RESET, used)
+            token_store.issue(conn, token_store.PASSWORD_RESET, {"UserID": 7}, _later(-1))
+            token_store.issue(conn, token_store.PASSWORD_RESET, {"UserID": 7}, _later())
+            token_store.issue(conn, token_store.PASSWORD_RESET, {"UserID": 7}, _later(2))
+            assert token_store.expire_outstanding(conn, token_store.PASSWORD_RESET, 7) == 2
+            assert token_store.expire_outstanding(conn, token_store.PASSWORD_RESET, 7) == 0
@@ -0,0 +1,61 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core import db
+
+
+@pytest.fixture
+def sqlite_engine(monkeypatch):
+    bind = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with bind.begin() as conn:
+        conn.execute(text("CREATE TABLE T (id INTEGER PRIMARY KEY)"))
+    monkeypatch.setattr(db, "engine", bind)
+    return bind
+
+
+def _count(bind) -> int:
+    with bind.connect() as conn:
+        return conn.execute(text("SELECT COUNT(1) FROM T")).scalar()
+
+
+class TestUnitOfWork:
+    """Commit/rollback rules and after_commit callbacks."""
+
+    def test_commit_then_callbacks_with_connection_released(self, sqlite_engine):
+        seen = []
+        with db.unit_of_work() as conn:
+            conn.execute(text("INSERT INTO T VALUES (1)"))
+            db.after_commit(conn, lambda: seen.append(_count(sqlite_engine)))
+            assert seen == []
+        assert seen == [1]
+
+    def test_http_error_commits_and_runs_callbacks(self, sqlite_engine):
+        seen = []
+        with pytest.raises(HTTPException):
+            with db.unit_of_work() as conn:
+                conn.execute(text("INSERT INTO T VALUES (1)"))
+                db.after_commit(conn, lambda: seen.append("ran"))
+                raise HTTPException(status_code=400)
+        assert _count(sqlite_engine) == 1 and seen == ["ran"]
+
+    def test_rollback_drops_callbacks(self, sqlite_engine):
+        seen = []
+        with pytest.raises(HTTPException):
+            with db.unit_of_work(commit_on_http_error=False) as conn:
+                conn.execute(text("INSERT INTO T VALUES (1)"))
+                db.after_commit(conn, lambda: seen.append("ran"))
+                raise HTTPException(status_code=400)
+        with pytest.raises(RuntimeError):
+            with db.unit_of_work() as conn:
+                conn.execute(text("INSERT INTO T VALUES (2)"))
+                db.after_commit(conn, lambda: seen.append("ran"))
+                raise RuntimeError("boom")
+        assert _count(sqlite_engine) == 0 and seen == []
+
+    def test_outside_unit_of_work_runs_now(self, sqlite_engine):
+        seen = []
+        with sqlite_engine.connect() as conn:
+            db.after_commit(conn, lambda: seen.append("ran"))
+            assert seen == ["ran"]